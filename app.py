@@ -1,9 +1,101 @@
+import json
+import os
 import streamlit as st
-import pandas as pd
-# Import both calculators
-from calculator import calculate_core_business_case
-from what_if_calculator import analyze_fixed_fee_scenario
+import numpy as np
+# Import both calculators (memoized)
+from calculator import SCENARIO_COLUMNS
+from config_loader import load_config
+from result_cache import SliderGrid, cached_core_business_case, cached_fixed_fee_scenario
+from what_if_calculator import analyze_fixed_fee_surface
 from localization import t
+import profiling
+# result_store, sensitivity, model_graph, report, monte_carlo and jobs are imported where they
+# are first used, so the first page render does not wait for them.
+
+# Opt-in: precompute the whole slider grid once per config (~125 MB, shared by all sessions).
+USE_SLIDER_GRID = os.environ.get("SIM_PRECOMPUTE_GRID") == "1"
+# Opt-in: read results from the shared on-disk store (fill it with `python result_store.py warm`).
+USE_RESULT_STORE = os.environ.get("SIM_RESULT_STORE") == "1"
+# Heavy analyses run as background jobs on a pool shared by all sessions of this server.
+JOB_WORKERS = int(os.environ.get("SIM_JOB_WORKERS", "2"))
+JOB_POLL_SECONDS = 0.5
+MC_DRAW_OPTIONS = (100_000, 1_000_000, 5_000_000)
+MC_CHUNK_SIZE = 50_000  # one progress update and partial result per chunk
+
+
+@st.cache_resource(max_entries=2)
+def get_slider_grid(config_hash):
+    return SliderGrid(load_config())
+
+
+@st.cache_resource(max_entries=2)
+def get_result_store(config_hash):
+    from result_store import ResultStore
+    return ResultStore(config=load_config())
+
+
+@st.cache_resource
+def get_job_manager():
+    from jobs import JobManager
+    return JobManager(max_workers=JOB_WORKERS)
+
+
+def submit_uncertainty(inputs, n_draws):
+    """Starts (or joins) the Monte Carlo job for `inputs`, superseding this session's previous one."""
+    from monte_carlo import run_monte_carlo
+    manager = get_job_manager()
+    previous = manager.get(st.session_state.get('uncertainty_job') or '')
+    # The draws run in the job's worker thread (max_workers=1): the job pool bounds the CPU used.
+    job = manager.supersede(
+        previous, run_monte_carlo, *inputs, n_draws=n_draws, chunk_size=MC_CHUNK_SIZE,
+        max_workers=1, config=load_config(), name='monte_carlo',
+    )
+    st.session_state.uncertainty_job = job.id
+    st.session_state.uncertainty_cancelled = False
+    return previous is not None and previous is not job and not previous.finished
+
+
+PNL_ROWS = (
+    # (label key, P&L key, shown as a deduction, css row class, indented)
+    ('pnl_revenue', 'revenue', False, 'row', False),
+    ('pnl_cost_of_revenue', 'cost_of_revenue', True, 'row', False),
+    ('pnl_gross_profit', 'gross_profit', False, 'row total', False),
+    ('pnl_sg_and_a', 'sg_and_a', True, 'row', True),
+    ('pnl_d_and_a', 'd_and_a', True, 'row', True),
+    ('pnl_rd_amortization', 'rd_amortization', True, 'row', True),
+    ('pnl_operating_profit', 'operating_profit', False, 'row total', False),
+)
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def render_pnl_html(pnl_items, lang):
+    """P&L table HTML, cached by the P&L values and language."""
+    pnl = dict(pnl_items)
+    rows = []
+    for label_key, key, deduction, css_class, indented in PNL_ROWS:
+        style = ' style="padding-left: 1rem;"' if indented else ''
+        value = f"(${pnl[key]:,.0f})" if deduction else f"${pnl[key]:,.0f}"
+        rows.append(f'<div class="{css_class}"><div class="label"{style}>{t(label_key, lang)}</div><div class="value">{value}</div></div>')
+    return '<div class="pnl-table">' + ''.join(rows) + '</div>'
+
+
+def _format_change_value(value):
+    if hasattr(value, 'config_hash'):  # the config input: its content hash, not the whole repr
+        return value.config_hash[:12]
+    if isinstance(value, float):
+        return f"{value:,.2f}"
+    return str(value)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def strategy_report(inputs, lang, config_hash):
+    from report import scenario_report
+    return scenario_report(*inputs, lang=lang, config=load_config())
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def fee_surface(core_results, standard_axis, premium_axis, target_payback_years):
+    return analyze_fixed_fee_surface(core_results, standard_axis, premium_axis, target_payback_years)
 
 # --- 1. Page Configuration ---
 st.set_page_config(page_title="AI Datacenter Business Simulator", page_icon="💡", layout="wide")
@@ -59,11 +151,6 @@ with st.sidebar:
     st.markdown("---")
     market_price_per_m_tokens = st.slider(t("market_price", st.session_state.lang), 0.5, 5.0, 1.5, 0.1)
 
-    st.markdown("---")
-    st.subheader(t("sidebar_pricing_title", st.session_state.lang))
-    standard_fee = st.number_input(t("pricing_standard_fee", st.session_state.lang), min_value=0.0, value=20.0, step=1.0)
-    premium_fee = st.number_input(t("pricing_premium_fee", st.session_state.lang), min_value=0.0, value=100.0, step=5.0)
-
 
 lang = st.session_state.lang
 
@@ -73,105 +160,263 @@ st.markdown(f"<p style='font-size: 1.15rem; color: #4b5563;'>{t('app_subtitle',
 st.markdown(f"<div class='clarification-box'>{t('model_clarification', lang)}</div>", unsafe_allow_html=True)
 
 if st.button(t("run_button", lang), use_container_width=True, type="primary"):
+    from model_graph import ModelGraph
+    from sensitivity import calculate_sensitivities
     with st.spinner('Analyzing...'):
-        core_results = calculate_core_business_case(
+        config = load_config()
+        inputs = (
             dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio,
             utilization_rate, market_price_per_m_tokens
         )
+        # The per-session model graph recomputes only what the changed inputs feed, and
+        # explains what changed since the previous run.
+        named_inputs = dict(zip(SCENARIO_COLUMNS, inputs))
+        graph = st.session_state.get('model_graph')
+        if graph is None:
+            graph = st.session_state.model_graph = ModelGraph(config, **named_inputs)
+            changes = []
+        else:
+            changes = graph.update(config=config, **named_inputs)
+        if USE_SLIDER_GRID or USE_RESULT_STORE:
+            grid = get_slider_grid(config.config_hash) if USE_SLIDER_GRID else None
+            store = get_result_store(config.config_hash) if USE_RESULT_STORE else None
+            core_results = cached_core_business_case(*inputs, config=config, grid=grid, store=store)
+        else:
+            core_results = graph.results()
         
-        what_if_narratives, pnl_what_if = analyze_fixed_fee_scenario(
-            core_results,
-            standard_fee,
-            premium_fee
-        )
-        
-        core_results['what_if_narratives'] = what_if_narratives
-        core_results['pnl_what_if'] = pnl_what_if
-        st.session_state.results = core_results
+        # Cached results are shared, so the session gets its own top-level dict.
+        st.session_state.results = {
+            **core_results,
+            'inputs': inputs,
+            'changes': changes,
+            'sensitivity': calculate_sensitivities(*inputs, config=config),
+        }
+
+        # A session that runs the uncertainty analysis keeps it in step with the inputs.
+        if st.session_state.get('uncertainty_job'):
+            st.session_state.uncertainty_superseded = submit_uncertainty(inputs, st.session_state.get('uncertainty_draws', MC_DRAW_OPTIONS[1]))
+
+
+@st.fragment
+def payback_section(res, lang):
+    st.header(t("section_2_title", lang))
+    pnl_core = res['pnl_annual']
+    st.markdown(f'<div class="recommendation-block">', unsafe_allow_html=True)
+    st.write(t('payback_analysis_intro', lang))
+    # Payback period is ALWAYS based on the core potential (usage-based)
+    cash_flow = pnl_core.get('annual_cash_flow', 0)
+    payback_period = res['total_investment'] / cash_flow if cash_flow > 0 else 0
+    p_cols = st.columns(2)
+    p_cols[0].metric(label=t('annual_cash_flow', lang), value=f"${cash_flow:,.0f}")
+    p_cols[1].metric(label=t('calculated_payback_period', lang), value=f"{payback_period:.2f}" if payback_period > 0 else "N/A")
+    st.markdown("---")
+    st.write(f"**{t('recommendation_title', lang)}**")
+    reco = res['recommendation']
+    if reco['is_achievable']:
+        st.write(t('recommendation_intro', lang))
+        r_cols = st.columns(2)
+        r_cols[0].metric(label=t('recommended_standard_fee', lang), value=f"${reco['standard_fee']:.2f}")
+        r_cols[1].metric(label=t('recommended_premium_fee', lang), value=f"${reco['premium_fee']:.2f}")
+    else:
+        st.warning(t('recommendation_unachievable', lang))
+    st.markdown(f'</div>', unsafe_allow_html=True)
+
+    # The output selector reruns only this fragment.
+    SENSITIVITY_SWING = 10
+    st.subheader(t('sensitivity_title', lang))
+    output_labels = {
+        'operating_profit': t('pnl_operating_profit', lang),
+        'annual_cash_flow': t('annual_cash_flow', lang),
+        'payback_period': t('calculated_payback_period', lang),
+        'standard_fee': t('recommended_standard_fee', lang),
+        'premium_fee': t('recommended_premium_fee', lang),
+    }
+    input_labels = {
+        'dc_size_mw': t('dc_capacity', lang),
+        'high_perf_gpu_ratio': t('high_perf_gpu_ratio', lang),
+        'utilization_rate': t('utilization_rate', lang),
+        'market_price_per_m_tokens': t('market_price', lang),
+    }
+    from sensitivity import tornado_data
+    sens_output = st.selectbox(t('sensitivity_output', lang), list(output_labels), format_func=output_labels.get)
+    bars = [bar for bar in tornado_data(res['sensitivity'], sens_output, swing=SENSITIVITY_SWING / 100) if bar[2] != 0][:10]
+    labels = [input_labels.get(name, name) for name, _, _ in bars][::-1]
+    import plotly.graph_objects as go  # on first chart, not at startup
+    fig = go.Figure([
+        go.Bar(y=labels, x=[low for _, low, _ in bars][::-1], orientation='h', name=t('sensitivity_low', lang, swing=SENSITIVITY_SWING), marker_color='#ef4444'),
+        go.Bar(y=labels, x=[high for _, _, high in bars][::-1], orientation='h', name=t('sensitivity_high', lang, swing=SENSITIVITY_SWING), marker_color='#22c55e'),
+    ])
+    fig.update_layout(barmode='overlay', height=60 + 32 * len(bars), margin=dict(l=10, r=10, t=10, b=10), legend=dict(orientation='h'))
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(t('sensitivity_caption', lang, swing=SENSITIVITY_SWING))
+
+
+@st.fragment
+def what_if_section(res, lang):
+    # Fee edits rerun only this fragment; the core results are reused as they are.
+    st.header(t("section_3_title", lang))
+    st.subheader(t("what_if_fees_title", lang))
+    fee_cols = st.columns(2)
+    standard_fee = fee_cols[0].number_input(t("pricing_standard_fee", lang), min_value=0.0, value=20.0, step=1.0, key="standard_fee")
+    premium_fee = fee_cols[1].number_input(t("pricing_premium_fee", lang), min_value=0.0, value=100.0, step=5.0, key="premium_fee")
+    what_if_narratives, pnl_what_if = cached_fixed_fee_scenario(res['inputs'], res, standard_fee, premium_fee, config=load_config())
+
+    for segment in what_if_narratives:
+        if segment['tier_name_key'] in ['tier_standard', 'tier_premium']:
+            with st.container():
+                st.markdown(f"<h3>{t(segment['tier_name_key'], lang)}</h3>", unsafe_allow_html=True)
+
+                with st.container(border=True):
+                    st.markdown(f"**{t('what_if_subtitle_potential', lang)}**")
+                    st.markdown(f"- {t('what_if_potential_revenue', lang)}: `${segment['revenue_per_user']:,.2f}`")
+                    st.markdown(f"- {t('what_if_potential_cost', lang)}: `${segment['cost_per_user']:,.2f}`")
+                    st.markdown(f"- {t('what_if_potential_profit', lang)}: `${segment['profit_per_user']:,.2f}`")
+
+                with st.container(border=True):
+                    st.markdown(f"**{t('what_if_subtitle_scenario', lang)}**")
+                    st.markdown(f"- {t('what_if_set_fee', lang)}: `${segment['fixed_fee']:,.2f}`")
+                    profit_color = "red" if segment['final_profit_per_user'] < 0 else "green"
+                    st.markdown(f'- <span style="font-weight: bold; color:{profit_color};">{t("what_if_final_profit", lang)}: ${segment["final_profit_per_user"]:,.2f}</span>', unsafe_allow_html=True)
+
+                with st.container(border=True):
+                    st.markdown(f"**{t('what_if_subtitle_implication', lang)}**")
+                    st.markdown(f"- {t('what_if_opportunity_cost', lang)}: `${segment['opportunity_cost']:,.2f}`")
+                    st.caption(t('what_if_interpretation', lang, opportunity_cost=abs(segment['opportunity_cost'])))
+
+    st.subheader(t('what_if_pnl_title', lang))
+    st.html(render_pnl_html(tuple(pnl_what_if.items()), lang))
+
+    # --- Fee surface: the whole Standard x Premium grid in one broadcast evaluation ---
+    FEE_SURFACE_POINTS = 400  # per axis; the browser, not the calculation, is the limit
+    TARGET_PAYBACK_YEARS = 5
+    reco = res['recommendation']
+    standard_axis = np.linspace(0, max(2 * standard_fee, 2 * reco['standard_fee'], 10), FEE_SURFACE_POINTS)
+    premium_axis = np.linspace(0, max(2 * premium_fee, 2 * reco['premium_fee'], 50), FEE_SURFACE_POINTS)
+    core = {key: res[key] for key in ('pnl_annual', 'segment_narratives', 'total_investment')}
+    surface = fee_surface(core, standard_axis, premium_axis, TARGET_PAYBACK_YEARS)
+
+    st.subheader(t('fee_surface_title', lang))
+    import plotly.graph_objects as go
+    fig = go.Figure(go.Heatmap(
+        x=standard_axis, y=premium_axis, z=surface['operating_profit'].T,
+        colorscale='RdYlGn', zmid=0, colorbar=dict(tickformat='$,.2s'),
+        hovertemplate='$%{x:.2f} / $%{y:.2f}<br>$%{z:,.0f}<extra></extra>',
+    ))
+    fig.add_trace(go.Scatter(x=standard_axis, y=surface['zero_profit_premium_fee'], mode='lines', line=dict(color='black', dash='dash'), name=t('fee_surface_zero_profit', lang)))
+    fig.add_trace(go.Scatter(x=standard_axis, y=surface['target_payback_premium_fee'], mode='lines', line=dict(color='black', dash='dot'), name=t('fee_surface_target_payback', lang, target=TARGET_PAYBACK_YEARS)))
+    fig.add_trace(go.Scatter(x=[standard_fee], y=[premium_fee], mode='markers', marker=dict(size=12, color='#2563eb', symbol='x'), name=t('fee_surface_current', lang)))
+    fig.update_layout(
+        xaxis=dict(title=t('pricing_standard_fee', lang), range=[standard_axis[0], standard_axis[-1]]),
+        yaxis=dict(title=t('pricing_premium_fee', lang), range=[premium_axis[0], premium_axis[-1]]),
+        height=480, margin=dict(l=10, r=10, t=10, b=10), legend=dict(orientation='h', y=-0.2),
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(t('fee_surface_caption', lang, target=TARGET_PAYBACK_YEARS))
+
+
+def uncertainty_section(res, lang):
+    # Polls the session's background job while it runs; the rest of the page stays live.
+    manager = get_job_manager()
+    job = manager.get(st.session_state.get('uncertainty_job') or '')
+    st.header(t('uncertainty_title', lang))
+    cols = st.columns([2, 1, 1], vertical_alignment='bottom')
+    draws = cols[0].selectbox(t('uncertainty_draws', lang), MC_DRAW_OPTIONS, index=1, format_func='{:,}'.format, key='uncertainty_draws')
+    if cols[1].button(t('uncertainty_run', lang), use_container_width=True):
+        st.session_state.uncertainty_superseded = False
+        submit_uncertainty(res['inputs'], draws)
+        st.rerun()
+    if job is not None and not job.finished and cols[2].button(t('uncertainty_cancel', lang), use_container_width=True):
+        manager.release(job)
+        st.session_state.uncertainty_job = None
+        st.session_state.uncertainty_cancelled = True
+        st.rerun()
+
+    if job is None:
+        if st.session_state.get('uncertainty_cancelled'):
+            st.info(t('uncertainty_cancelled', lang))
+        st.caption(t('uncertainty_caption', lang))
+        return
+    snapshot = job.snapshot()
+    if snapshot['state'] in ('queued', 'running'):
+        if st.session_state.get('uncertainty_superseded'):
+            st.info(t('uncertainty_superseded', lang))
+        if snapshot['total']:
+            st.progress(job.progress, text=t('uncertainty_progress', lang, done=snapshot['done'], total=snapshot['total'], elapsed=snapshot['elapsed']))
+        else:
+            st.progress(0, text=t('uncertainty_queued', lang))
+        summary = snapshot['partial']
+        caption = t('uncertainty_partial', lang)
+    elif snapshot['state'] == 'done':
+        summary = job.result()
+        caption = t('uncertainty_done', lang, total=summary['n_draws'], elapsed=snapshot['elapsed'])
+    elif snapshot['state'] == 'cancelled':
+        st.info(t('uncertainty_cancelled', lang))
+        summary, caption = None, None
+    else:
+        st.error(t('uncertainty_failed', lang, error=snapshot['error']))
+        summary, caption = None, None
+
+    if summary is not None and summary['n_draws']:
+        metric_labels = {
+            'operating_profit': t('pnl_operating_profit', lang),
+            'annual_cash_flow': t('annual_cash_flow', lang),
+            'payback_period': t('calculated_payback_period', lang),
+            'standard_fee': t('recommended_standard_fee', lang),
+            'premium_fee': t('recommended_premium_fee', lang),
+        }
+        st.dataframe([
+            {
+                t('uncertainty_metric', lang): label,
+                t('uncertainty_mean', lang): f"{summary[metric]['mean']:,.2f}",
+                **{f"P{q * 100:.0f}": f"{value:,.2f}" for q, value in summary[metric]['quantiles'].items()},
+            }
+            for metric, label in metric_labels.items()
+        ], hide_index=True, use_container_width=True)
+    if caption:
+        st.caption(caption)
+    # Once the job ends, one full rerun switches this section from polling back to static.
+    if job.finished and st.session_state.get('uncertainty_polling'):
+        st.session_state.uncertainty_polling = False
+        st.rerun()
+
 
 if st.session_state.results:
     res = st.session_state.results
-    pnl_core = res['pnl_annual'] # This is ALWAYS the usage-based P&L
-    
+
     # --- [SECTION 1] ---
     st.header(t("section_1_title", lang))
     st.subheader(t("assumptions_title", lang))
     # ... (Assumption metrics are unchanged)
-    
-    st.html(f"""
-        <div class="pnl-table">
-            <div class="row"><div class="label">{t('pnl_revenue', lang)}</div><div class="value">${pnl_core['revenue']:,.0f}</div></div>
-            <div class="row"><div class="label">{t('pnl_cost_of_revenue', lang)}</div><div class="value">(${pnl_core['cost_of_revenue']:,.0f})</div></div>
-            <div class="row total"><div class="label">{t('pnl_gross_profit', lang)}</div><div class="value">${pnl_core['gross_profit']:,.0f}</div></div>
-            <div class="row"><div class="label" style="padding-left: 1rem;">{t('pnl_sg_and_a', lang)}</div><div class="value">(${pnl_core['sg_and_a']:,.0f})</div></div>
-            <div class="row"><div class="label" style="padding-left: 1rem;">{t('pnl_d_and_a', lang)}</div><div class="value">(${pnl_core['d_and_a']:,.0f})</div></div>
-            <div class="row"><div class="label" style="padding-left: 1rem;">{t('pnl_rd_amortization', lang)}</div><div class="value">(${pnl_core['rd_amortization']:,.0f})</div></div>
-            <div class="row total"><div class="label">{t('pnl_operating_profit', lang)}</div><div class="value">${pnl_core['operating_profit']:,.0f}</div></div>
-        </div>
-    """)
-    
+    st.html(render_pnl_html(tuple(res['pnl_annual'].items()), lang))
+
+    if res.get('changes'):
+        with st.expander(t("changes_title", lang)):
+            st.dataframe([
+                {
+                    t("changes_quantity", lang): change['quantity'],
+                    t("changes_before", lang): _format_change_value(change['before']),
+                    t("changes_after", lang): _format_change_value(change['after']),
+                    t("changes_delta", lang): change['change'],
+                    t("changes_because", lang): ", ".join(change['because']),
+                }
+                for change in res['changes'] if not isinstance(change['after'], tuple)
+            ], hide_index=True, use_container_width=True)
+            st.caption(t("changes_caption", lang))
+
     # --- [SECTION 2] ---
-    st.header(t("section_2_title", lang))
-    if 'recommendation' in res:
-        st.markdown(f'<div class="recommendation-block">', unsafe_allow_html=True)
-        st.write(t('payback_analysis_intro', lang))
-        # Payback period is ALWAYS based on the core potential (usage-based)
-        cash_flow = pnl_core.get('annual_cash_flow', 0)
-        payback_period = res['total_investment'] / cash_flow if cash_flow > 0 else 0
-        p_cols = st.columns(2)
-        p_cols[0].metric(label=t('annual_cash_flow', lang), value=f"${cash_flow:,.0f}")
-        p_cols[1].metric(label=t('calculated_payback_period', lang), value=f"{payback_period:.2f}" if payback_period > 0 else "N/A")
-        st.markdown("---")
-        st.write(f"**{t('recommendation_title', lang)}**")
-        reco = res['recommendation']
-        if reco['is_achievable']:
-            st.write(t('recommendation_intro', lang))
-            r_cols = st.columns(2)
-            r_cols[0].metric(label=t('recommended_standard_fee', lang), value=f"${reco['standard_fee']:.2f}")
-            r_cols[1].metric(label=t('recommended_premium_fee', lang), value=f"${reco['premium_fee']:.2f}")
-        else:
-            st.warning(t('recommendation_unachievable', lang))
-        st.markdown(f'</div>', unsafe_allow_html=True)
+    payback_section(res, lang)
 
     # --- [SECTION 3] ---
-    st.header(t("section_3_title", lang))
-    if 'what_if_narratives' in res:
-        for segment in res['what_if_narratives']:
-            if segment['tier_name_key'] in ['tier_standard', 'tier_premium']:
-                with st.container():
-                    st.markdown(f"<h3>{t(segment['tier_name_key'], lang)}</h3>", unsafe_allow_html=True)
-                    
-                    with st.container(border=True):
-                        st.markdown(f"**{t('what_if_subtitle_potential', lang)}**")
-                        st.markdown(f"- {t('what_if_potential_revenue', lang)}: `${segment['revenue_per_user']:,.2f}`")
-                        st.markdown(f"- {t('what_if_potential_cost', lang)}: `${segment['cost_per_user']:,.2f}`")
-                        st.markdown(f"- {t('what_if_potential_profit', lang)}: `${segment['profit_per_user']:,.2f}`")
-
-                    with st.container(border=True):
-                        st.markdown(f"**{t('what_if_subtitle_scenario', lang)}**")
-                        st.markdown(f"- {t('what_if_set_fee', lang)}: `${segment['fixed_fee']:,.2f}`")
-                        profit_color = "red" if segment['final_profit_per_user'] < 0 else "green"
-                        st.markdown(f'- <span style="font-weight: bold; color:{profit_color};">{t("what_if_final_profit", lang)}: ${segment["final_profit_per_user"]:,.2f}</span>', unsafe_allow_html=True)
-
-                    with st.container(border=True):
-                        st.markdown(f"**{t('what_if_subtitle_implication', lang)}**")
-                        st.markdown(f"- {t('what_if_opportunity_cost', lang)}: `${segment['opportunity_cost']:,.2f}`")
-                        st.caption(t('what_if_interpretation', lang, opportunity_cost=abs(segment['opportunity_cost'])))
-        
-        if 'pnl_what_if' in res:
-            pnl_wi = res['pnl_what_if']
-            st.subheader(t('what_if_pnl_title', lang))
-            st.html(f"""
-                <div class="pnl-table">
-                    <div class="row"><div class="label">{t('pnl_revenue', lang)}</div><div class="value">${pnl_wi['revenue']:,.0f}</div></div>
-                    <div class="row"><div class="label">{t('pnl_cost_of_revenue', lang)}</div><div class="value">(${pnl_wi['cost_of_revenue']:,.0f})</div></div>
-                    <div class="row total"><div class="label">{t('pnl_gross_profit', lang)}</div><div class="value">${pnl_wi['gross_profit']:,.0f}</div></div>
-                    <div class="row"><div class="label" style="padding-left: 1rem;">{t('pnl_sg_and_a', lang)}</div><div class="value">(${pnl_wi['sg_and_a']:,.0f})</div></div>
-                    <div class="row"><div class="label" style="padding-left: 1rem;">{t('pnl_d_and_a', lang)}</div><div class="value">(${pnl_wi['d_and_a']:,.0f})</div></div>
-                    <div class="row"><div class="label" style="padding-left: 1rem;">{t('pnl_rd_amortization', lang)}</div><div class="value">(${pnl_wi['rd_amortization']:,.0f})</div></div>
-                    <div class="row total"><div class="label">{t('pnl_operating_profit', lang)}</div><div class="value">${pnl_wi['operating_profit']:,.0f}</div></div>
-                </div>
-            """)
+    what_if_section(res, lang)
+
+    job = get_job_manager().get(st.session_state.get('uncertainty_job') or '')
+    st.session_state.uncertainty_polling = job is not None and not job.finished
+    (st.fragment(run_every=JOB_POLL_SECONDS) if st.session_state.uncertainty_polling else st.fragment)(uncertainty_section)(res, lang)
+
+    with st.expander(t("report_title", lang)):
+        report_md = strategy_report(res['inputs'], lang, load_config().config_hash)
+        st.markdown(report_md)
+        st.download_button(t("report_download_md", lang), report_md, file_name="strategy_report.md", mime="text/markdown")
 
     st.markdown(f"""
     <div class="explanation-box">
@@ -183,5 +428,11 @@ if st.session_state.results:
 else:
     st.info(t("initial_prompt", lang))
 
+# Stage timings for this server process (SIM_PROFILE=1).
+if profiling.is_enabled():
+    with st.expander(t("profile_title", lang)):
+        st.dataframe(profiling.summary(), hide_index=True, use_container_width=True)
+        st.download_button(t("profile_download", lang), json.dumps(profiling.chrome_trace()), file_name="simulator_trace.json", mime="application/json")
+
 st.markdown('<div style="height: 5rem;"></div>', unsafe_allow_html=True)
 st.markdown(f'<div class="footer"><p>{t("copyright_text", lang)} | {t("contact_text", lang)}</p></div>', unsafe_allow_html=True)
@@ -0,0 +1,209 @@
+# batch_result.py (v1.0 - Columnar Results)
+# Column-oriented container for batch results: one contiguous array per output, with the
+# per-tier metrics as scenarios x tiers matrices. Single scenarios are read through zero-copy
+# views that behave like the scalar calculator's (read-only) results dict.
+from collections.abc import Mapping
+
+import numpy as np
+
+SECTIONS = ('pnl_annual', 'segment_narratives', 'total_investment', 'assumptions', 'recommendation')
+SEGMENT_METRICS = ('num_users', 'revenue_per_user', 'cost_per_user', 'profit_per_user', 'recommended_fee')
+
+
+class BatchResult(Mapping):
+    """
+    Results of `calculate_core_business_case_batch`.
+
+    Indexing by section name (`result['pnl_annual']['revenue']`) returns the underlying
+    column dicts, so code written against the batch dict layout keeps working. `row(i)`
+    returns a ScenarioView in the scalar layout; nothing is copied until a value is read.
+    """
+
+    __slots__ = SECTIONS
+
+    def __init__(self, pnl_annual, segment_narratives, total_investment, assumptions, recommendation):
+        self.pnl_annual = pnl_annual
+        self.segment_narratives = segment_narratives
+        self.total_investment = total_investment
+        self.assumptions = assumptions
+        self.recommendation = recommendation
+
+    @classmethod
+    def from_dict(cls, results):
+        return cls(**{section: results[section] for section in SECTIONS})
+
+    @classmethod
+    def from_columns(cls, columns, tier_name_keys):
+        """Inverse of columns(): rebuilds the sections from flat columns."""
+        tier_name_keys = list(tier_name_keys)
+        tier_columns = {f"{tier_key}_{metric}" for tier_key in tier_name_keys for metric in SEGMENT_METRICS}
+        pnl_annual, assumptions, recommendation = {}, {}, {}
+        for name, column in columns.items():
+            if name == 'total_investment' or name in tier_columns:
+                continue
+            if name.startswith('pnl_'):
+                pnl_annual[name[len('pnl_'):]] = column
+            elif name.startswith('recommended_'):
+                recommendation[name[len('recommended_'):]] = column
+            else:
+                assumptions[name] = column
+        segment_narratives = {'tier_name_key': tier_name_keys}
+        for metric in SEGMENT_METRICS:
+            segment_narratives[metric] = np.stack([columns[f"{tier_key}_{metric}"] for tier_key in tier_name_keys], axis=1)
+        return cls(pnl_annual, segment_narratives, columns['total_investment'], assumptions, recommendation)
+
+    # --- Mapping protocol over the sections ---
+    def __getitem__(self, section):
+        if section not in SECTIONS:
+            raise KeyError(section)
+        return getattr(self, section)
+
+    def __iter__(self):
+        return iter(SECTIONS)
+
+    def __len__(self):
+        return len(SECTIONS)
+
+    @property
+    def size(self):
+        """Number of scenarios."""
+        return len(self.total_investment)
+
+    @property
+    def tier_name_keys(self):
+        return self.segment_narratives['tier_name_key']
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self.columns().values())
+
+    # --- Single scenarios ---
+    def row(self, i):
+        if not -self.size <= i < self.size:
+            raise IndexError(f"scenario {i} out of range for {self.size} scenarios")
+        return ScenarioView(self, i % self.size)
+
+    def rows(self):
+        return (ScenarioView(self, i) for i in range(self.size))
+
+    # --- Export ---
+    def columns(self):
+        """Flat {column name: 1-D array}; tier metrics are named '<tier_name_key>_<metric>'."""
+        columns = {"total_investment": self.total_investment}
+        for key, value in self.pnl_annual.items():
+            columns[f"pnl_{key}"] = value
+        for key, value in self.assumptions.items():
+            columns[key] = value
+        for key, value in self.recommendation.items():
+            columns[f"recommended_{key}"] = value
+        for j, tier_key in enumerate(self.tier_name_keys):
+            for metric in SEGMENT_METRICS:
+                columns[f"{tier_key}_{metric}"] = self.segment_narratives[metric][:, j]
+        return columns
+
+    def to_pandas(self):
+        import pandas as pd
+        return pd.DataFrame(self.columns(), copy=False)
+
+    def to_arrow(self):
+        import pyarrow as pa
+        return pa.table(self.columns())
+
+
+class _ColumnRow(Mapping):
+    """One scenario of a {name: column} dict, read as {name: Python scalar}."""
+
+    __slots__ = ('_columns', '_i')
+
+    def __init__(self, columns, i):
+        self._columns = columns
+        self._i = i
+
+    def __getitem__(self, key):
+        return self._columns[key][self._i].item()
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self):
+        return len(self._columns)
+
+
+class _AssumptionsRow(_ColumnRow):
+    """Adds the scalar layout's `gpu_mix_string`, formatted only when it is read."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key == 'gpu_mix_string':
+            return f"H:{int(self._columns['num_high_perf_gpus'][self._i])} / S:{int(self._columns['num_standard_gpus'][self._i])}"
+        return super().__getitem__(key)
+
+    def __iter__(self):
+        yield 'gpu_mix_string'
+        yield from self._columns
+
+    def __len__(self):
+        return len(self._columns) + 1
+
+
+class _SegmentRow(Mapping):
+    __slots__ = ('_segments', '_i', '_j')
+
+    def __init__(self, segments, i, j):
+        self._segments = segments
+        self._i = i
+        self._j = j
+
+    def __getitem__(self, key):
+        if key == 'tier_name_key':
+            return self._segments['tier_name_key'][self._j]
+        if key not in SEGMENT_METRICS:
+            raise KeyError(key)
+        return self._segments[key][self._i, self._j].item()
+
+    def __iter__(self):
+        return iter(('tier_name_key', *SEGMENT_METRICS))
+
+    def __len__(self):
+        return 1 + len(SEGMENT_METRICS)
+
+
+class ScenarioView(Mapping):
+    """One scenario of a BatchResult in the scalar `calculate_core_business_case` layout."""
+
+    __slots__ = ('_result', '_i')
+
+    def __init__(self, result, i):
+        self._result = result
+        self._i = i
+
+    def __getitem__(self, section):
+        result, i = self._result, self._i
+        if section == 'pnl_annual':
+            return _ColumnRow(result.pnl_annual, i)
+        if section == 'segment_narratives':
+            return tuple(_SegmentRow(result.segment_narratives, i, j) for j in range(len(result.tier_name_keys)))
+        if section == 'total_investment':
+            return result.total_investment[i].item()
+        if section == 'assumptions':
+            return _AssumptionsRow(result.assumptions, i)
+        if section == 'recommendation':
+            return _ColumnRow(result.recommendation, i)
+        raise KeyError(section)
+
+    def __iter__(self):
+        return iter(SECTIONS)
+
+    def __len__(self):
+        return len(SECTIONS)
+
+    def to_dict(self):
+        """A plain, independent copy (e.g. for JSON or st.session_state)."""
+        return {
+            section: (
+                [dict(segment) for segment in value] if section == 'segment_narratives'
+                else dict(value) if isinstance(value, Mapping) else value
+            )
+            for section, value in self.items()
+        }
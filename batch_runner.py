@@ -0,0 +1,213 @@
+# batch_runner.py (v1.0 - Headless Batch Runner)
+# Streams scenarios from CSV/Parquet in chunks through worker processes and writes flattened
+# core + what-if results to a directory of Parquet part files. Interrupted runs resume from
+# the last completed chunk.
+#
+#   python batch_runner.py scenarios.csv results/ [--chunk-size 100000] [--workers 4]
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+import profiling
+from calculator import SCENARIO_COLUMNS, calculate_core_business_case_batch
+from config_loader import load_config
+from result_store import ResultStore
+from what_if_calculator import analyze_fixed_fee_batch
+
+MANIFEST_NAME = "_manifest.json"
+DEFAULT_STANDARD_FEE = 20.0
+DEFAULT_PREMIUM_FEE = 100.0
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise SystemExit("batch_runner needs pyarrow for Parquet output: pip install pyarrow") from None
+    return pyarrow
+
+
+def iter_scenario_chunks(path, chunk_size):
+    """Yields (row_offset, {column: array}) chunks from a CSV or Parquet scenarios file."""
+    if path.endswith(".parquet"):
+        pa = _require_pyarrow()
+        offset = 0
+        for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            columns = {name: batch.column(name).to_numpy(zero_copy_only=False) for name in batch.schema.names}
+            yield offset, columns
+            offset += batch.num_rows
+    else:
+        import pandas as pd
+        offset = 0
+        for frame in pd.read_csv(path, chunksize=chunk_size):
+            yield offset, {name: frame[name].to_numpy() for name in frame.columns}
+            offset += len(frame)
+
+
+def flatten_results(batch_results, what_if):
+    """Flattens batch core + what-if results into {column name: 1-D array}."""
+    columns = batch_results.columns()
+    for j, tier_key in enumerate(batch_results.tier_name_keys):
+        for metric in ("fixed_fee", "final_profit_per_user", "opportunity_cost"):
+            columns[f"{tier_key}_what_if_{metric}"] = what_if["segments"][metric][:, j]
+    for key, value in what_if["pnl_what_if"].items():
+        columns[f"what_if_pnl_{key}"] = value
+    return columns
+
+
+def _part_path(out_dir, chunk_index):
+    return os.path.join(out_dir, f"part-{chunk_index:06d}.parquet")
+
+
+def _process_chunk(task):
+    """Worker entry point: evaluate one chunk and write its Parquet part atomically."""
+    chunk_index, offset, scenarios, out_dir, config_path, standard_fee, premium_fee, profile, store_dir = task
+    pa = _require_pyarrow()
+    if profile:
+        profiling.enable()
+    config = load_config(config_path)
+
+    missing = [name for name in SCENARIO_COLUMNS if name not in scenarios]
+    if missing:
+        raise ValueError(f"chunk {chunk_index}: missing scenario column(s) {missing}")
+    n = len(scenarios[SCENARIO_COLUMNS[0]])
+    if store_dir is not None:
+        core = ResultStore(store_dir, config).get_or_compute(*(scenarios[name] for name in SCENARIO_COLUMNS))
+    else:
+        core = calculate_core_business_case_batch(*(scenarios[name] for name in SCENARIO_COLUMNS), config=config)
+    standard_fees = scenarios.get("standard_fee", np.full(n, standard_fee))
+    premium_fees = scenarios.get("premium_fee", np.full(n, premium_fee))
+    what_if = analyze_fixed_fee_batch(core, standard_fees, premium_fees)
+
+    columns = {"scenario_index": np.arange(offset, offset + n)}
+    columns.update(scenarios)
+    columns.update(flatten_results(core, what_if))
+    table = pa.table(columns)
+
+    path = _part_path(out_dir, chunk_index)
+    tmp_path = path + ".tmp"
+    pa.parquet.write_table(table, tmp_path)
+    os.replace(tmp_path, path)  # a part file exists only once it is complete
+    return chunk_index, n, profiling.drain() if profile else []
+
+
+def _input_digest(path, block_size=1 << 20):
+    """SHA-256 of the scenarios file, so a resume notices edits that keep its size."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _check_manifest(out_dir, manifest):
+    """Writes the run manifest, or verifies that an existing one describes the same run."""
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if os.path.exists(path):
+        with open(path) as f:
+            existing = json.load(f)
+        if existing != manifest:
+            raise SystemExit(
+                f"{out_dir} holds results of a different run (input, chunk size, fees or config changed); "
+                "use a new output directory or --overwrite"
+            )
+        return
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def run_batch(input_path, out_dir, chunk_size=100_000, workers=None, config_path=None,
+              standard_fee=DEFAULT_STANDARD_FEE, premium_fee=DEFAULT_PREMIUM_FEE,
+              overwrite=False, progress=None, profile=False, store_dir=None):
+    """
+    Runs every scenario in `input_path` and writes part files to `out_dir`.
+
+    At most 2 x workers chunks are held in memory at once. Chunks whose part file already
+    exists are skipped, so rerunning the same command resumes an interrupted run. With
+    `profile`, the workers' stage timings are collected into this process's profiler. With
+    `store_dir`, results are read from and added to that shared ResultStore.
+
+    Returns:
+        dict: {'chunks': total, 'skipped': already done, 'rows': rows computed now}.
+    """
+    _require_pyarrow()
+    config = load_config(config_path)
+    os.makedirs(out_dir, exist_ok=True)
+    if overwrite:
+        for name in os.listdir(out_dir):
+            if name.startswith("part-") or name == MANIFEST_NAME:
+                os.remove(os.path.join(out_dir, name))
+    _check_manifest(out_dir, {
+        "input": os.path.abspath(input_path),
+        "input_size": os.path.getsize(input_path),
+        "input_sha256": _input_digest(input_path),
+        "chunk_size": chunk_size,
+        "standard_fee": standard_fee,
+        "premium_fee": premium_fee,
+        "config_hash": config.config_hash,
+    })
+
+    workers = workers or os.cpu_count() or 1
+    stats = {"chunks": 0, "skipped": 0, "rows": 0}
+
+    def collect(futures):
+        for future in futures:
+            _, rows, events = future.result()
+            stats["rows"] += rows
+            profiling.merge(events)
+            if progress is not None:
+                progress(stats)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+        for chunk_index, (offset, scenarios) in enumerate(iter_scenario_chunks(input_path, chunk_size)):
+            stats["chunks"] += 1
+            if os.path.exists(_part_path(out_dir, chunk_index)):
+                stats["skipped"] += 1
+                continue
+            task = (chunk_index, offset, scenarios, out_dir, config.path, standard_fee, premium_fee, profile, store_dir)
+            in_flight.add(pool.submit(_process_chunk, task))
+            if len(in_flight) >= 2 * workers:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(in_flight)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run simulator scenarios from CSV/Parquet into Parquet part files.")
+    parser.add_argument("input", help="scenarios file (.csv or .parquet) with columns: " + ", ".join(SCENARIO_COLUMNS))
+    parser.add_argument("output", help="output directory for part-NNNNNN.parquet files")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--config", default=None, help="config.yml path (default: the one next to this script)")
+    parser.add_argument("--standard-fee", type=float, default=DEFAULT_STANDARD_FEE, help="used when the input has no standard_fee column")
+    parser.add_argument("--premium-fee", type=float, default=DEFAULT_PREMIUM_FEE, help="used when the input has no premium_fee column")
+    parser.add_argument("--overwrite", action="store_true", help="discard existing results in the output directory")
+    parser.add_argument("--profile", metavar="TRACE_JSON", default=None, help="record stage timings and write a Chrome trace")
+    parser.add_argument("--store", metavar="DIR", default=None, help="serve and keep results in a shared result store")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    stats = run_batch(
+        args.input, args.output, chunk_size=args.chunk_size, workers=args.workers,
+        config_path=args.config, standard_fee=args.standard_fee, premium_fee=args.premium_fee,
+        overwrite=args.overwrite, profile=args.profile is not None, store_dir=args.store,
+        progress=lambda s: print(f"\r{s['rows']:,} rows written", end="", file=sys.stderr),
+    )
+    print(f"\n{stats['chunks']} chunks ({stats['skipped']} already done), {stats['rows']:,} rows in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    if args.profile:
+        profiling.write_chrome_trace(args.profile)
+        print(profiling.format_summary(), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,444 @@
+# benchmark.py (v1.0 - Performance Benchmarks)
+# Measures the simulator's hot paths and records throughput, p50/p99 latency and peak memory
+# into a JSON history file; `compare` fails when a path regresses past a threshold.
+#
+# `run` also times a cold import of each entry point in a fresh interpreter (python -X
+# importtime) and fails when one exceeds its startup budget or pulls in a heavy package that
+# only optional features need.
+#
+#   python benchmark.py run [--quick] [--only NAME ...]
+#   python benchmark.py imports [--top 8] [--budget-scale 1.0]   # per-package import report
+#   python benchmark.py compare [--threshold 0.25] [--baseline-runs 3]
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_HISTORY = os.path.join(ROOT, "benchmark_history.json")
+
+
+def _random_scenarios(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return (
+        rng.integers(10, 301, n).astype(float),
+        rng.random(n) < 0.5,
+        rng.random(n) < 0.5,
+        (rng.integers(0, 21, n) * 5).astype(float),
+        (rng.integers(8, 21, n) * 5).astype(float),
+        rng.integers(5, 51, n) / 10.0,
+    )
+
+
+# --- Benchmark definitions: name -> (setup() -> (fn, items per call[, teardown]), calls, quick calls) ---
+def _scalar_core():
+    from calculator import calculate_core_business_case
+    return (lambda: calculate_core_business_case(100, 'Conventional', False, 50, 60, 1.5)), 1
+
+
+def _scalar_what_if():
+    from calculator import calculate_core_business_case
+    from what_if_calculator import analyze_fixed_fee_scenario
+    core = calculate_core_business_case(100, 'Conventional', False, 50, 60, 1.5)
+    return (lambda: analyze_fixed_fee_scenario(core, 20.0, 100.0)), 1
+
+
+def _localization():
+    from localization import loc_strings, t
+    # Templated strings need arguments; the plain lookups are the per-label hot path.
+    keys = [key for key, text in loc_strings['en'].items() if '{' not in text]
+
+    def run():
+        for key in keys:
+            t(key, 'en')
+    return run, len(keys)
+
+
+def _batch(n):
+    def setup():
+        from calculator import calculate_core_business_case_batch
+        scenarios = _random_scenarios(n)
+        return (lambda: calculate_core_business_case_batch(*scenarios)), n
+    return setup
+
+
+def _portfolio_variants(sites, variants):
+    def setup():
+        from portfolio import Portfolio, load_sites
+        rng = np.random.default_rng(0)
+        dc, renewable, mirrormind, ratio, util, _ = _random_scenarios(sites)
+        portfolio = Portfolio(load_sites({
+            "dc_size_mw": dc, "use_clean_power": renewable, "apply_mirrormind": mirrormind,
+            "high_perf_gpu_ratio": ratio, "utilization_rate": util,
+            "commissioning_year": rng.integers(2025, 2035, sites),
+        }))
+        weights = (rng.random((variants, sites)) < 0.2).astype(float)
+        return (lambda: portfolio.evaluate(weights)), variants
+    return setup
+
+
+def _fleet_optimizer(skus):
+    def setup():
+        import yaml
+        from config_loader import DEFAULT_CONFIG_PATH, parse_config
+        from fleet_optimizer import FleetOptimizer
+        rng = np.random.default_rng(0)
+        with open(DEFAULT_CONFIG_PATH) as f:
+            raw = yaml.safe_load(f)
+        raw["hardware"]["skus"] = {
+            f"sku_{i}": {"cost": float(cost), "m_tokens_per_hour": float(rate), "power_kw": float(power)}
+            for i, (cost, rate, power) in enumerate(zip(rng.uniform(5_000, 40_000, skus), rng.uniform(0.5, 6.0, skus), rng.uniform(0.2, 1.5, skus)))
+        }
+        optimizer = FleetOptimizer(config=parse_config(raw, DEFAULT_CONFIG_PATH))
+        return (lambda: (optimizer.optimize("profit", method="heuristic"), optimizer.frontier(50, method="heuristic"))), 1
+    return setup
+
+
+def _hourly_energy_batch(n, years):
+    def setup():
+        import tempfile
+        import yaml
+        from calculator import calculate_core_business_case_batch
+        from config_loader import DEFAULT_CONFIG_PATH, parse_config
+        rng = np.random.default_rng(0)
+        hours = np.arange(years * 8760)
+        folder = tempfile.TemporaryDirectory(prefix="energy_bench_")
+        series = {
+            "prices.npy": 0.11 + 0.03 * np.sin(2 * np.pi * hours / 24) + rng.normal(0, 0.01, hours.size),
+            "load.npy": 1 + 0.15 * np.sin(2 * np.pi * (hours - 9) / 24) + rng.normal(0, 0.03, hours.size),
+            "ambient.npy": 15 + 10 * np.cos(2 * np.pi * hours / 8760) + rng.normal(0, 2, hours.size),
+        }
+        for name, values in series.items():
+            np.save(os.path.join(folder.name, name), values)
+        with open(DEFAULT_CONFIG_PATH) as f:
+            raw = yaml.safe_load(f)
+        raw["operating_expenses"]["energy"] = {
+            "hourly_prices": "prices.npy", "load_profile": "load.npy", "ambient_temperature": "ambient.npy",
+            "pue_curve": {"fixed_overhead": 0.08, "cooling_overhead": 0.3, "ambient_coefficient": 0.03},
+            "tariffs": {"renewable": {"type": "ppa", "rate": 0.16, "coverage": 0.8}},
+        }
+        config = parse_config(raw, os.path.join(folder.name, "config.yml"))
+        scenarios = _random_scenarios(n)
+        return (lambda: calculate_core_business_case_batch(*scenarios, config=config)), n, folder.cleanup
+    return setup
+
+
+def _inverse_solver(n):
+    def setup():
+        from inverse_solver import solve
+        scenarios = _random_scenarios(n)
+        return (lambda: solve("price", "irr", 0.12, *scenarios[:5])), n
+    return setup
+
+
+def _reports(n):
+    def setup():
+        import io
+        from portfolio import load_sites
+        from report import iter_reports, write_reports
+        dc, renewable, mirrormind, ratio, util, _ = _random_scenarios(n)
+        sites = load_sites({
+            "dc_size_mw": dc, "use_clean_power": renewable, "apply_mirrormind": mirrormind,
+            "high_perf_gpu_ratio": ratio, "utilization_rate": util,
+        })
+        return (lambda: write_reports(iter_reports(sites, "en"), io.BytesIO(), "html")), n
+    return setup
+
+
+def _config_load_cold():
+    from config_loader import clear_config_cache, load_config
+
+    def run():
+        clear_config_cache()
+        load_config()
+    return run, 1
+
+
+def _config_load_warm():
+    from config_loader import load_config
+    load_config()
+    return load_config, 1
+
+
+def _app_rerun():
+    from streamlit.testing.v1 import AppTest
+
+    def run():
+        app = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60).run()
+        app.button[0].click().run()
+        if app.exception:
+            raise RuntimeError(app.exception)
+    return run, 1
+
+
+BENCHMARKS = {
+    "scalar_core": (_scalar_core, 2000, 200),
+    "scalar_what_if": (_scalar_what_if, 5000, 500),
+    "localization_t": (_localization, 500, 50),
+    "batch_1e3": (_batch(1_000), 200, 20),
+    "batch_1e5": (_batch(100_000), 20, 3),
+    "batch_1e6": (_batch(1_000_000), 5, 1),
+    "batch_1e6_energy_5y": (_hourly_energy_batch(1_000_000, 5), 5, 1),
+    "portfolio_1e3x100": (_portfolio_variants(1_000, 100), 50, 5),
+    "fleet_optimizer_40sku": (_fleet_optimizer(40), 20, 3),
+    "inverse_price_irr_1e5": (_inverse_solver(100_000), 10, 2),
+    "reports_1e3_html_zip": (_reports(1_000), 20, 3),
+    "config_load_cold": (_config_load_cold, 200, 20),
+    "config_load_warm": (_config_load_warm, 5000, 500),
+    "app_rerun": (_app_rerun, 5, 1),
+}
+
+
+# --- Startup budgets: module -> (cold import budget ms, packages it must not import) ---
+# Budgets are for a warm disk cache (bytecode compiled); the package lists are what keeps the
+# core engine lean: pandas, pyarrow, plotly and scipy load lazily in the features using them.
+OPTIONAL_PACKAGES = ("pandas", "pyarrow", "plotly", "scipy", "streamlit")
+IMPORT_BUDGETS = {
+    "calculator": (250, OPTIONAL_PACKAGES),
+    "inverse_solver": (250, OPTIONAL_PACKAGES),
+    "batch_runner": (300, OPTIONAL_PACKAGES),
+    "service": (350, OPTIONAL_PACKAGES),
+    "app": (1500, ("pandas", "pyarrow", "scipy")),  # streamlit itself loads plotly
+}
+IMPORT_RUNS = 3
+_IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _import_once(module):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, env={**os.environ, "SIM_PROFILE": "0"},
+    )
+    if proc.returncode != 0:
+        raise ImportError(proc.stderr.strip().splitlines()[-1], name=module)
+    total_us, modules = 0, {}
+    for line in proc.stderr.splitlines():
+        match = _IMPORT_TIME.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = int(match[1]), int(match[2]), match[3], match[4]
+        modules[name] = self_us
+        if name == module and len(indent) == 1:
+            total_us = cumulative_us
+    return total_us, modules
+
+
+def import_report(module, runs=IMPORT_RUNS):
+    """
+    Cold import of `module` in a fresh interpreter, best of `runs`: total ms, self ms per
+    top-level package (slowest first) and the names of every module it imported.
+    """
+    total_us, modules = min((_import_once(module) for _ in range(runs)), key=lambda result: result[0])
+    packages = {}
+    for name, self_us in modules.items():
+        top = name.split(".")[0]
+        packages[top] = packages.get(top, 0.0) + self_us / 1e3
+    return {
+        "total_ms": total_us / 1e3,
+        "packages_ms": dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)),
+        "modules": sorted(modules),
+    }
+
+
+def check_imports(reports, budget_scale=1.0):
+    """Budget and optional-package violations of `import_report` results, as messages."""
+    violations = []
+    for module, report in reports.items():
+        budget_ms, forbidden = IMPORT_BUDGETS[module]
+        if report["total_ms"] > budget_ms * budget_scale:
+            violations.append(f"{module}: imports in {report['total_ms']:.0f} ms, budget {budget_ms * budget_scale:.0f} ms")
+        pulled = sorted({package for package in forbidden for name in report["modules"] if name == package or name.startswith(package + ".")})
+        if pulled:
+            violations.append(f"{module}: imports {', '.join(pulled)} at startup")
+    return violations
+
+
+def format_imports(reports, top=5, budget_scale=1.0):
+    lines = [f"{'import':<20}{'total ms':>10}{'budget ms':>11}  slowest packages (self ms)"]
+    for module, report in reports.items():
+        slowest = ", ".join(f"{name} {ms:.1f}" for name, ms in list(report["packages_ms"].items())[:top])
+        lines.append(f"{module:<20}{report['total_ms']:>10.1f}{IMPORT_BUDGETS[module][0] * budget_scale:>11.0f}  {slowest}")
+    return "\n".join(lines)
+
+
+def run_imports(modules=None):
+    reports = {}
+    for module in modules or IMPORT_BUDGETS:
+        try:
+            reports[module] = import_report(module)
+        except ImportError as exc:
+            print(f"{module}: skipped ({exc})", file=sys.stderr)
+    return reports
+
+
+def run_benchmark(name, quick=False):
+    setup, calls, quick_calls = BENCHMARKS[name]
+    fn, items_per_call, *teardown = setup()
+    calls = quick_calls if quick else calls
+    try:
+        return _measure(fn, items_per_call, calls)
+    finally:
+        for cleanup in teardown:
+            cleanup()
+
+
+def _measure(fn, items_per_call, calls):
+    fn()  # warm-up
+    gc.collect()
+    latencies = np.empty(calls)
+    for i in range(calls):
+        start = time.perf_counter()
+        fn()
+        latencies[i] = time.perf_counter() - start
+
+    # Peak memory comes from one separate traced call, so tracing does not skew the timings.
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "calls": calls,
+        "items_per_call": items_per_call,
+        "throughput_per_s": items_per_call * calls / latencies.sum(),
+        "p50_ms": float(np.percentile(latencies, 50) * 1e3),
+        "p99_ms": float(np.percentile(latencies, 99) * 1e3),
+        "peak_mb": peak / 1e6,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_history(path, history):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(history, f, indent=2)
+    os.replace(tmp, path)
+
+
+def format_table(results):
+    lines = [f"{'benchmark':<20}{'throughput/s':>16}{'p50 ms':>12}{'p99 ms':>12}{'peak MB':>10}"]
+    for name, r in results.items():
+        if "error" in r:
+            lines.append(f"{name:<20}  skipped: {r['error']}")
+            continue
+        lines.append(f"{name:<20}{r['throughput_per_s']:>16,.0f}{r['p50_ms']:>12.3f}{r['p99_ms']:>12.3f}{r['peak_mb']:>10.2f}")
+    return "\n".join(lines)
+
+
+def compare(history, threshold, baseline_runs):
+    """
+    Compares the latest record against the median of the `baseline_runs` earlier records
+    made in the same mode (quick or full). Returns a list of regression messages (empty
+    when everything is within `threshold`).
+    """
+    if not history:
+        return []
+    latest = history[-1]["results"]
+    same_mode = [record for record in history[:-1] if record.get("quick") == history[-1].get("quick")]
+    baseline = same_mode[-baseline_runs:]
+    regressions = []
+    for name, current in latest.items():
+        previous = [record["results"][name] for record in baseline if "error" not in record["results"].get(name, {"error": 1})]
+        if "error" in current or not previous:
+            continue
+        checks = (
+            ("p50_ms", +1), ("p99_ms", +1), ("peak_mb", +1), ("throughput_per_s", -1),
+        )
+        for metric, direction in checks:
+            reference = float(np.median([p[metric] for p in previous]))
+            if reference <= 0:
+                continue
+            change = (current[metric] - reference) / reference * direction
+            if change > threshold:
+                regressions.append(f"{name}.{metric}: {reference:.4g} -> {current[metric]:.4g} ({change:+.0%} worse)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulator performance benchmarks")
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run", help="run benchmarks and append them to the history")
+    run_parser.add_argument("--quick", action="store_true", help="fewer repetitions")
+    run_parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="these benchmarks only (no import check)")
+    run_parser.add_argument("--budget-scale", type=float, default=1.0, help="multiplier on the import budgets (slow machines)")
+    imports_parser = sub.add_parser("imports", help="per-package cold import report; fail on budget violations")
+    imports_parser.add_argument("--only", nargs="+", choices=sorted(IMPORT_BUDGETS))
+    imports_parser.add_argument("--top", type=int, default=8, help="packages listed per module")
+    imports_parser.add_argument("--budget-scale", type=float, default=1.0, help="multiplier on the import budgets")
+    compare_parser = sub.add_parser("compare", help="fail if the latest run regressed")
+    compare_parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown (0.25 = 25%%)")
+    compare_parser.add_argument("--baseline-runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.command == "imports":
+        reports = run_imports(args.only)
+        print(format_imports(reports, args.top, args.budget_scale))
+        violations = check_imports(reports, args.budget_scale)
+        if violations:
+            print("Startup budget exceeded:\n  " + "\n  ".join(violations))
+            return 1
+        return 0
+
+    history = load_history(args.history)
+    if args.command == "run":
+        results = {}
+        for name in args.only or BENCHMARKS:
+            try:
+                results[name] = run_benchmark(name, quick=args.quick)
+            except ImportError as exc:
+                results[name] = {"error": f"missing dependency ({exc.name})"}
+        reports = {} if args.only else run_imports()
+        history.append({
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "quick": args.quick,
+            "results": results,
+            "imports_ms": {module: report["total_ms"] for module, report in reports.items()},
+        })
+        save_history(args.history, history)
+        print(format_table(results))
+        if reports:
+            print()
+            print(format_imports(reports, budget_scale=args.budget_scale))
+            violations = check_imports(reports, args.budget_scale)
+            if violations:
+                print("Startup budget exceeded:\n  " + "\n  ".join(violations))
+                return 1
+        return 0
+
+    regressions = compare(history, args.threshold, args.baseline_runs)
+    if regressions:
+        print("Performance regressions:\n  " + "\n  ".join(regressions))
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%} ({len(history)} runs in history).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
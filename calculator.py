@@ -1,7 +1,10 @@
 # calculator.py (v20.0 - Core Engine)
 # This module is the core engine, calculating the usage-based business potential.
-import yaml
-import pandas as pd
+import numpy as np
+import profiling
+from batch_result import BatchResult
+from config_loader import resolve_config
+from energy import energy_model
 
 def calculate_core_business_case(
     dc_size_mw,
@@ -9,101 +12,58 @@ def calculate_core_business_case(
     apply_mirrormind,
     high_perf_gpu_ratio,
     utilization_rate,
-    market_price_per_m_tokens
+    market_price_per_m_tokens,
+    config=None
 ):
-    with open("config.yml", "r") as f:
-        config = yaml.safe_load(f)
-
-    inv_conf = config['investment']
-    hw_conf = config['hardware']
-    op_conf = config['operating_expenses']
-    rd_conf = config['research_and_development']
-    model_conf = config['model_and_market']
-    tiers_conf = model_conf['tiers']
-
-    HOURS_PER_YEAR = 8760
-    PAYBACK_YEARS_TARGET = 5
+    config = resolve_config(config)
+    inv_conf = config.investment
+    hw_conf = config.hardware
+    op_conf = config.operating_expenses
+    model_conf = config.model_and_market
+
     high_perf_gpu_ratio /= 100.0
+    timer = profiling.stages('core')
 
     # --- 1. CAPEX & GPU ---
-    dc_construction_cost = inv_conf['dc_capex_per_mw'] * dc_size_mw
-    it_hw_budget = inv_conf['it_budget_per_mw'] * dc_size_mw
+    dc_construction_cost, it_hw_budget = _capex(inv_conf, dc_size_mw)
     total_investment = dc_construction_cost + it_hw_budget
-    num_high_perf_gpus = (it_hw_budget * high_perf_gpu_ratio) // hw_conf['high_perf_gpu']['cost'] if hw_conf['high_perf_gpu']['cost'] > 0 else 0
-    num_standard_gpus = (it_hw_budget * (1 - high_perf_gpu_ratio)) // hw_conf['standard_gpu']['cost'] if hw_conf['standard_gpu']['cost'] > 0 else 0
+    num_high_perf_gpus, num_standard_gpus = _gpu_counts(hw_conf, it_hw_budget, high_perf_gpu_ratio)
+    timer.lap('capex_gpu')
 
     # --- 2. Capacity ---
-    arch_efficiency = model_conf['intelligent_arch_efficiency'] if apply_mirrormind else 1.0
-    tokens_from_high_perf = num_high_perf_gpus * hw_conf['high_perf_gpu']['m_tokens_per_hour'] * 1e6 * HOURS_PER_YEAR
-    tokens_from_standard = num_standard_gpus * hw_conf['standard_gpu']['m_tokens_per_hour'] * 1e6 * HOURS_PER_YEAR
-    total_token_capacity = (tokens_from_high_perf + tokens_from_standard) * arch_efficiency
+    arch_efficiency = _arch_efficiency(model_conf, apply_mirrormind)
+    total_token_capacity = _token_capacity(hw_conf, num_high_perf_gpus, num_standard_gpus, arch_efficiency)
     serviced_tokens = total_token_capacity * (utilization_rate / 100.0)
+    timer.lap('capacity')
 
     # --- 3. Calculate TRUE P&L and Cost based on USAGE potential ---
-    total_paid_token_usage_ratio = sum(tier_info['ratio'] for tier_name, tier_info in tiers_conf.items() if tier_name != 'free')
-    usage_based_revenue = (serviced_tokens / 1e6) * market_price_per_m_tokens * total_paid_token_usage_ratio
+    usage_based_revenue = _usage_revenue(config, serviced_tokens, market_price_per_m_tokens)
 
-    it_power_consumption_mw = dc_size_mw * (utilization_rate / 100.0)
-    total_power_consumption_mw = it_power_consumption_mw * op_conf['pue']
-    power_cost_kwh_rate = 0.18 if use_clean_power == 'Renewable' else 0.12
-    power_cost = total_power_consumption_mw * HOURS_PER_YEAR * 1000 * power_cost_kwh_rate
-    maintenance_cost = op_conf['maintenance_and_cooling_per_mw'] * dc_size_mw
-    personnel_cost = op_conf['personnel_and_other_per_mw'] * dc_size_mw
-    cost_of_revenue = power_cost + maintenance_cost + personnel_cost
+    power_cost = _power_cost(config, dc_size_mw, utilization_rate, use_clean_power)
+    cost_of_revenue = _cost_of_revenue(op_conf, dc_size_mw, power_cost)
     
-    sgna_rate = op_conf['sgna_as_percent_of_revenue'] / 100.0
+    sgna_rate = op_conf.sgna_as_percent_of_revenue / 100.0
     sg_and_a_usage_based = usage_based_revenue * sgna_rate
     
-    dc_depreciation = dc_construction_cost / inv_conf['amortization_years']['datacenter']
-    it_depreciation = it_hw_budget / inv_conf['amortization_years']['it_hardware']
-    rd_amortization = (rd_conf['total_model_development_cost'] / rd_conf['global_datacenter_count_for_cost_allocation']) / inv_conf['amortization_years']['research_and_development']
-    d_and_a = dc_depreciation + it_depreciation
+    d_and_a, it_depreciation = _depreciation(inv_conf, dc_construction_cost, it_hw_budget)
+    rd_amortization = config.rd_amortization
     
     true_total_operating_cost = cost_of_revenue + sg_and_a_usage_based + d_and_a + rd_amortization
     true_operating_profit = usage_based_revenue - true_total_operating_cost
     true_annual_cash_flow = true_operating_profit + d_and_a
-    
-    # --- 4. Per-User Monthly Metrics Calculation ---
-    total_users = model_conf['total_users_for_100mw'] * (dc_size_mw / 100.0)
-    total_token_demand_ratio = sum(t['ratio'] * t['monthly_token_usage_m'] for t in tiers_conf.values())
-    
-    segment_narrative_data = []
-    for tier_name, tier_info in tiers_conf.items():
-        num_users_in_tier = total_users * tier_info['ratio']
-        if num_users_in_tier == 0: continue
-
-        token_usage_ratio = (tier_info['ratio'] * tier_info['monthly_token_usage_m']) / total_token_demand_ratio if total_token_demand_ratio > 0 else 0
-        
-        tier_revenue_annual_usage_based = (serviced_tokens * token_usage_ratio / 1e6) * market_price_per_m_tokens if tier_name != 'free' else 0
-        revenue_per_user_annual = tier_revenue_annual_usage_based / num_users_in_tier if num_users_in_tier > 0 else 0
-        
-        tier_cost_annual_usage_based = true_total_operating_cost * token_usage_ratio
-        cost_per_user_annual_usage_based = tier_cost_annual_usage_based / num_users_in_tier if num_users_in_tier > 0 else 0
-
-        segment_narrative_data.append({
-            "tier_name_key": f"tier_{tier_name}",
-            "num_users": num_users_in_tier,
-            "revenue_per_user": revenue_per_user_annual / 12.0,
-            "cost_per_user": cost_per_user_annual_usage_based / 12.0,
-            "profit_per_user": (revenue_per_user_annual - cost_per_user_annual_usage_based) / 12.0,
-        })
+    timer.lap('pnl')
 
-    # --- 5. Recommended Pricing Calculation ---
-    base_operating_cost = cost_of_revenue + d_and_a + rd_amortization
-    target_annual_op_profit = total_investment / PAYBACK_YEARS_TARGET
-    required_annual_revenue = (target_annual_op_profit + base_operating_cost) / (1 - sgna_rate)
-    
-    total_potential_revenue = sum(s['revenue_per_user'] * 12 * s['num_users'] for s in segment_narrative_data if s['tier_name_key'] != 'tier_free')
-    price_ratio = required_annual_revenue / total_potential_revenue if total_potential_revenue > 0 else 1
+    # --- 4. Recommended Pricing Calculation ---
+    tiers = config.tier_table
+    required_annual_revenue = _required_annual_revenue(total_investment, cost_of_revenue, d_and_a, rd_amortization, sgna_rate)
+    price_ratio = _price_ratio(tiers, required_annual_revenue, serviced_tokens, market_price_per_m_tokens)
+    timer.lap('pricing')
 
-    recommended_standard_fee = segment_narrative_data[1]['revenue_per_user'] * price_ratio
-    recommended_premium_fee = segment_narrative_data[2]['revenue_per_user'] * price_ratio
-    
-    recommendation = {
-        "standard_fee": recommended_standard_fee,
-        "premium_fee": recommended_premium_fee,
-        "is_achievable": recommended_premium_fee < 500 and recommended_standard_fee < 100
-    }
+    # --- 5. Per-User Monthly Metrics ---
+    total_users = _total_users(model_conf, dc_size_mw)
+    segment_narrative_data = _segment_dicts(tiers, total_users, serviced_tokens, market_price_per_m_tokens, true_total_operating_cost, price_ratio)
+    recommendation = _recommendation(tiers, [segment['recommended_fee'] for segment in segment_narrative_data], model_conf.achievable_fee_limits)
+    timer.lap('per_user')
 
     # --- 6. Final P&L for Display ---
     pnl_annual = {
@@ -129,4 +89,375 @@ def calculate_core_business_case(
         },
         "recommendation": recommendation,
     }
+    timer.lap('final_pnl')
     return results
+
+
+# --- Single-scenario formulas ---
+# calculate_core_business_case and model_graph's quantities are both built from these, so the
+# two cannot drift apart. Plain arithmetic only, so the sensitivity module's Dual numbers pass.
+HOURS_PER_YEAR = 8760
+PAYBACK_YEARS_TARGET = 5
+
+
+def _capex(inv_conf, dc_size_mw):
+    """(datacenter construction cost, IT hardware budget)."""
+    return inv_conf.dc_capex_per_mw * dc_size_mw, inv_conf.it_budget_per_mw * dc_size_mw
+
+
+def _gpu_counts(hw_conf, it_hw_budget, high_perf_share):
+    """Whole GPUs the IT budget buys, split by `high_perf_share` (0-1); none of a SKU without a cost."""
+    high_perf_cost, standard_cost = hw_conf.high_perf_gpu.cost, hw_conf.standard_gpu.cost
+    num_high_perf_gpus = (it_hw_budget * high_perf_share) // high_perf_cost if high_perf_cost > 0 else 0
+    num_standard_gpus = (it_hw_budget * (1 - high_perf_share)) // standard_cost if standard_cost > 0 else 0
+    return num_high_perf_gpus, num_standard_gpus
+
+
+def _arch_efficiency(model_conf, apply_mirrormind):
+    return model_conf.intelligent_arch_efficiency if apply_mirrormind else 1.0
+
+
+def _token_capacity(hw_conf, num_high_perf_gpus, num_standard_gpus, arch_efficiency):
+    """Tokens per year the fleet can serve at full utilization."""
+    tokens_from_high_perf = num_high_perf_gpus * hw_conf.high_perf_gpu.m_tokens_per_hour * 1e6 * HOURS_PER_YEAR
+    tokens_from_standard = num_standard_gpus * hw_conf.standard_gpu.m_tokens_per_hour * 1e6 * HOURS_PER_YEAR
+    return (tokens_from_high_perf + tokens_from_standard) * arch_efficiency
+
+
+def _usage_revenue(config, serviced_tokens, market_price_per_m_tokens):
+    return (serviced_tokens / 1e6) * market_price_per_m_tokens * config.total_paid_token_usage_ratio
+
+
+def _power_cost(config, dc_size_mw, utilization_rate, use_clean_power):
+    """Annual power cost of one scenario: the hourly energy model if configured, else the flat PUE formula."""
+    energy = energy_model(config)
+    if energy is not None:
+        return energy.annual_cost(dc_size_mw, utilization_rate / 100.0, use_clean_power == 'Renewable')
+    op_conf = config.operating_expenses
+    total_power_consumption_mw = dc_size_mw * (utilization_rate / 100.0) * op_conf.pue
+    power_cost_kwh_rate = op_conf.power_cost_per_kwh.renewable if use_clean_power == 'Renewable' else op_conf.power_cost_per_kwh.conventional
+    return total_power_consumption_mw * HOURS_PER_YEAR * 1000 * power_cost_kwh_rate
+
+
+def _cost_of_revenue(op_conf, dc_size_mw, power_cost):
+    maintenance_cost = op_conf.maintenance_and_cooling_per_mw * dc_size_mw
+    personnel_cost = op_conf.personnel_and_other_per_mw * dc_size_mw
+    return power_cost + maintenance_cost + personnel_cost
+
+
+def _depreciation(inv_conf, dc_construction_cost, it_hw_budget):
+    """(total D&A, IT hardware depreciation), both straight-line."""
+    it_depreciation = it_hw_budget / inv_conf.amortization_years.it_hardware
+    return dc_construction_cost / inv_conf.amortization_years.datacenter + it_depreciation, it_depreciation
+
+
+def _required_annual_revenue(total_investment, cost_of_revenue, d_and_a, rd_amortization, sgna_rate):
+    """Revenue that pays back `total_investment` in PAYBACK_YEARS_TARGET years after SG&A."""
+    base_operating_cost = cost_of_revenue + d_and_a + rd_amortization
+    target_annual_op_profit = total_investment / PAYBACK_YEARS_TARGET
+    return (target_annual_op_profit + base_operating_cost) / (1 - sgna_rate)
+
+
+def _total_users(model_conf, dc_size_mw):
+    return model_conf.total_users_for_100mw * (dc_size_mw / 100.0)
+
+
+# ===============================================
+# Batch Engine (vectorized over scenario arrays)
+# ===============================================
+SCENARIO_COLUMNS = (
+    "dc_size_mw",
+    "use_clean_power",
+    "apply_mirrormind",
+    "high_perf_gpu_ratio",
+    "utilization_rate",
+    "market_price_per_m_tokens",
+)
+
+
+# Config values the batch engine reads per scenario, and may therefore be overridden per scenario.
+OVERRIDABLE_PARAMS = (
+    "investment.dc_capex_per_mw",
+    "investment.it_budget_per_mw",
+    "hardware.high_perf_gpu.cost",
+    "hardware.high_perf_gpu.m_tokens_per_hour",
+    "hardware.standard_gpu.cost",
+    "hardware.standard_gpu.m_tokens_per_hour",
+    "operating_expenses.maintenance_and_cooling_per_mw",
+    "operating_expenses.personnel_and_other_per_mw",
+    "operating_expenses.sgna_as_percent_of_revenue",
+    "operating_expenses.pue",
+    "operating_expenses.power_cost_per_kwh.conventional",
+    "operating_expenses.power_cost_per_kwh.renewable",
+    "model_and_market.intelligent_arch_efficiency",
+)
+
+
+def _scenario_arrays(dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio, utilization_rate, market_price_per_m_tokens):
+    """Broadcasts the six scenario inputs to 1-D arrays of a common length."""
+    if hasattr(dc_size_mw, "columns"):
+        frame = dc_size_mw
+        dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio, utilization_rate, market_price_per_m_tokens = (
+            frame[name].to_numpy() for name in SCENARIO_COLUMNS
+        )
+
+    use_clean_power = np.asarray(use_clean_power)
+    # Accept either the app's 'Renewable'/'Conventional' labels or booleans.
+    if use_clean_power.dtype.kind not in "bi":
+        use_clean_power = use_clean_power == "Renewable"
+
+    arrays = np.broadcast_arrays(
+        np.asarray(dc_size_mw, dtype=float),
+        use_clean_power.astype(bool),
+        np.asarray(apply_mirrormind, dtype=bool),
+        np.asarray(high_perf_gpu_ratio, dtype=float),
+        np.asarray(utilization_rate, dtype=float),
+        np.asarray(market_price_per_m_tokens, dtype=float),
+    )
+    return [np.atleast_1d(a) for a in arrays]
+
+
+def _safe_floor_divide(numerator, denominator):
+    """Elementwise numerator // denominator, returning 0 where denominator <= 0."""
+    positive = denominator > 0
+    return np.where(positive, numerator // np.where(positive, denominator, 1.0), 0.0)
+
+
+def _safe_divide(numerator, denominator, fill=0.0):
+    """Elementwise numerator / denominator, returning `fill` where denominator <= 0."""
+    if isinstance(denominator, float):  # scalar path
+        return numerator / denominator if denominator > 0 else fill
+    positive = denominator > 0
+    return np.where(positive, numerator / np.where(positive, denominator, 1.0), fill)
+
+
+# --- Tier metrics ---
+# (scenarios x 1) input columns against the TierTable's per-tier vectors give scenarios x tiers
+# matrices; only arithmetic and np.where are applied (see _evaluate_batch). _segment_dicts is
+# the same arithmetic for one scenario.
+RECOMMENDED_TIERS = ('standard', 'premium')  # tiers whose fee the recommendation reports
+
+
+def _tier_metrics(tiers, total_users, serviced_tokens, market_price_per_m_tokens, total_operating_cost):
+    """Users and monthly revenue, cost and profit per user of every tier in `tiers` (a TierTable)."""
+    # A tier's users are total_users * ratio, so dividing by them is a per-tier constant
+    # (TierTable.usage_per_user) times 1 / total_users.
+    per_user_month = _safe_divide(1.0, total_users) / 12.0
+    revenue_per_user = (serviced_tokens / 1e6 * market_price_per_m_tokens * per_user_month) * tiers.paid_usage_per_user
+    cost_per_user = (total_operating_cost * per_user_month) * tiers.usage_per_user
+    return {
+        "num_users": total_users * tiers.ratio,
+        "revenue_per_user": revenue_per_user,
+        "cost_per_user": cost_per_user,
+        "profit_per_user": revenue_per_user - cost_per_user,
+    }
+
+
+def _segment_dicts(tiers, total_users, serviced_tokens, market_price_per_m_tokens, total_operating_cost, price_ratio):
+    """_tier_metrics for one scenario, as the scalar layout's list of per-tier dicts."""
+    # One dict per tier is built regardless, so plain floats beat tiny-array NumPy here.
+    per_user_month = _safe_divide(1.0, total_users) / 12.0
+    revenue_scale = serviced_tokens / 1e6 * market_price_per_m_tokens * per_user_month
+    cost_scale = total_operating_cost * per_user_month
+    segments = []
+    for tier_name_key, ratio, usage_per_user, paid_usage_per_user in tiers.rows:
+        revenue_per_user = revenue_scale * paid_usage_per_user
+        cost_per_user = cost_scale * usage_per_user
+        segments.append({
+            "tier_name_key": tier_name_key,
+            "num_users": total_users * ratio,
+            "revenue_per_user": revenue_per_user,
+            "cost_per_user": cost_per_user,
+            "profit_per_user": revenue_per_user - cost_per_user,
+            "recommended_fee": revenue_per_user * price_ratio,
+        })
+    return segments
+
+
+def _price_ratio(tiers, required_annual_revenue, serviced_tokens, market_price_per_m_tokens):
+    """Factor that scales the paid tiers' usage-based revenue up to the required revenue."""
+    total_potential_revenue = (serviced_tokens / 1e6) * market_price_per_m_tokens * tiers.paid_usage_ratio
+    return _safe_divide(required_annual_revenue, total_potential_revenue, fill=1.0)
+
+
+def _recommendation(tiers, recommended_fee, fee_limits):
+    """
+    The Standard/Premium recommendation (NaN for a tier the config does not define). It is
+    achievable when every tier in `fee_limits` (model_and_market.achievable_fee_limits)
+    stays below its limit.
+    """
+    batch = getattr(recommended_fee, 'ndim', 1) == 2  # a list of floats for one scenario
+    recommendation = {}
+    for name in RECOMMENDED_TIERS:
+        j = tiers.index(name)
+        if j is None:
+            recommendation[f"{name}_fee"] = np.full(recommended_fee.shape[0], np.nan) if batch else float('nan')
+        else:
+            recommendation[f"{name}_fee"] = recommended_fee[:, j] if batch else recommended_fee[j]
+    is_achievable = True
+    for name, limit in fee_limits:
+        j = tiers.index(name)
+        if j is not None:
+            is_achievable = is_achievable & ((recommended_fee[:, j] if batch else recommended_fee[j]) < limit)
+    if batch and is_achievable is True:
+        is_achievable = np.ones(recommended_fee.shape[0], dtype=bool)
+    recommendation["is_achievable"] = is_achievable
+    return recommendation
+
+
+def calculate_core_business_case_batch(
+    dc_size_mw,
+    use_clean_power=None,
+    apply_mirrormind=None,
+    high_perf_gpu_ratio=None,
+    utilization_rate=None,
+    market_price_per_m_tokens=None,
+    config=None,
+    overrides=None
+):
+    """
+    Vectorized counterpart of `calculate_core_business_case`.
+
+    Every input may be a scalar or an array; they are broadcast against each other.
+    Alternatively, pass a single DataFrame whose columns are named as in SCENARIO_COLUMNS.
+    `overrides` maps config paths from OVERRIDABLE_PARAMS (e.g. 'operating_expenses.pue')
+    to per-scenario arrays, which is how the Monte Carlo engine injects its draws.
+
+    Returns:
+        BatchResult: Same layout as the scalar results, with each value replaced by a column
+            (or a scenarios x tiers matrix for the segment metrics); `.row(i)` reads one
+            scenario in the scalar layout.
+    """
+    config = resolve_config(config)
+    overrides = overrides or {}
+    unknown = set(overrides) - set(OVERRIDABLE_PARAMS)
+    if unknown:
+        raise ValueError(f"Unsupported override(s): {sorted(unknown)}")
+
+    return BatchResult.from_dict(_evaluate_batch(
+        *_scenario_arrays(
+            dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio,
+            utilization_rate, market_price_per_m_tokens
+        ),
+        config=config,
+        overrides=overrides,
+    ))
+
+
+def _evaluate_batch(
+    dc_size_mw,
+    use_clean_power,
+    apply_mirrormind,
+    high_perf_gpu_ratio,
+    utilization_rate,
+    market_price_per_m_tokens,
+    config,
+    overrides
+):
+    """
+    The batch model proper, on already-broadcast 1-D inputs.
+
+    Only arithmetic operators and np.where/np.full_like are used on the numeric inputs, so
+    array-like number types (e.g. the dual numbers in sensitivity.py) pass straight through.
+    """
+    def param(path):
+        return overrides[path] if path in overrides else config.get(path)
+
+    high_perf_gpu_ratio = high_perf_gpu_ratio / 100.0
+    timer = profiling.stages('batch', scenarios=len(dc_size_mw))
+
+    # --- 1. CAPEX & GPU ---
+    dc_construction_cost = param('investment.dc_capex_per_mw') * dc_size_mw
+    it_hw_budget = param('investment.it_budget_per_mw') * dc_size_mw
+    total_investment = dc_construction_cost + it_hw_budget
+    num_high_perf_gpus = _safe_floor_divide(it_hw_budget * high_perf_gpu_ratio, param('hardware.high_perf_gpu.cost'))
+    num_standard_gpus = _safe_floor_divide(it_hw_budget * (1 - high_perf_gpu_ratio), param('hardware.standard_gpu.cost'))
+    timer.lap('capex_gpu')
+
+    # --- 2. Capacity ---
+    arch_efficiency = np.where(apply_mirrormind, param('model_and_market.intelligent_arch_efficiency'), 1.0)
+    tokens_from_high_perf = num_high_perf_gpus * param('hardware.high_perf_gpu.m_tokens_per_hour') * 1e6 * HOURS_PER_YEAR
+    tokens_from_standard = num_standard_gpus * param('hardware.standard_gpu.m_tokens_per_hour') * 1e6 * HOURS_PER_YEAR
+    total_token_capacity = (tokens_from_high_perf + tokens_from_standard) * arch_efficiency
+    serviced_tokens = total_token_capacity * (utilization_rate / 100.0)
+    timer.lap('capacity')
+
+    # --- 3. P&L based on USAGE potential ---
+    total_paid_token_usage_ratio = config.total_paid_token_usage_ratio
+    usage_based_revenue = (serviced_tokens / 1e6) * market_price_per_m_tokens * total_paid_token_usage_ratio
+
+    energy = energy_model(config)
+    if energy is None:
+        it_power_consumption_mw = dc_size_mw * (utilization_rate / 100.0)
+        total_power_consumption_mw = it_power_consumption_mw * param('operating_expenses.pue')
+        power_cost_kwh_rate = np.where(use_clean_power, param('operating_expenses.power_cost_per_kwh.renewable'), param('operating_expenses.power_cost_per_kwh.conventional'))
+        power_cost = total_power_consumption_mw * HOURS_PER_YEAR * 1000 * power_cost_kwh_rate
+    else:
+        # Overridden PUE / rates scale the hourly model relative to the config's values.
+        power_cost = energy.power_cost(
+            dc_size_mw, utilization_rate / 100.0, use_clean_power,
+            pue=overrides.get('operating_expenses.pue'),
+            conventional=overrides.get('operating_expenses.power_cost_per_kwh.conventional'),
+            renewable=overrides.get('operating_expenses.power_cost_per_kwh.renewable'),
+        )
+    maintenance_cost = param('operating_expenses.maintenance_and_cooling_per_mw') * dc_size_mw
+    personnel_cost = param('operating_expenses.personnel_and_other_per_mw') * dc_size_mw
+    cost_of_revenue = power_cost + maintenance_cost + personnel_cost
+
+    sgna_rate = param('operating_expenses.sgna_as_percent_of_revenue') / 100.0
+    sg_and_a_usage_based = usage_based_revenue * sgna_rate
+
+    dc_depreciation = dc_construction_cost / config.investment.amortization_years.datacenter
+    it_depreciation = it_hw_budget / config.investment.amortization_years.it_hardware
+    rd_amortization = np.full_like(dc_size_mw, config.rd_amortization)
+    d_and_a = dc_depreciation + it_depreciation
+
+    true_total_operating_cost = cost_of_revenue + sg_and_a_usage_based + d_and_a + rd_amortization
+    true_operating_profit = usage_based_revenue - true_total_operating_cost
+    true_annual_cash_flow = true_operating_profit + d_and_a
+    timer.lap('pnl')
+
+    # --- 4. Per-User Monthly Metrics (scenarios x tiers) ---
+    tiers = config.tier_table
+    total_users = config.model_and_market.total_users_for_100mw * (dc_size_mw / 100.0)
+    segment_narratives = {"tier_name_key": list(tiers.keys)}
+    segment_narratives.update(_tier_metrics(
+        tiers, total_users[:, None], serviced_tokens[:, None], market_price_per_m_tokens[:, None], true_total_operating_cost[:, None],
+    ))
+    timer.lap('per_user')
+
+    # --- 5. Recommended Pricing ---
+    base_operating_cost = cost_of_revenue + d_and_a + rd_amortization
+    target_annual_op_profit = total_investment / PAYBACK_YEARS_TARGET
+    required_annual_revenue = (target_annual_op_profit + base_operating_cost) / (1 - sgna_rate)
+    price_ratio = _price_ratio(tiers, required_annual_revenue, serviced_tokens, market_price_per_m_tokens)
+    segment_narratives['recommended_fee'] = segment_narratives['revenue_per_user'] * price_ratio[:, None]
+    recommendation = _recommendation(tiers, segment_narratives['recommended_fee'], config.model_and_market.achievable_fee_limits)
+    timer.lap('pricing')
+
+    # --- 6. Final P&L columns ---
+    pnl_annual = {
+        'revenue': usage_based_revenue,
+        'cost_of_revenue': cost_of_revenue,
+        'gross_profit': usage_based_revenue - cost_of_revenue,
+        'sg_and_a': sg_and_a_usage_based,
+        'd_and_a': d_and_a,
+        'it_depreciation': it_depreciation,
+        'rd_amortization': rd_amortization,
+        'operating_profit': true_operating_profit,
+        'annual_cash_flow': true_annual_cash_flow,
+    }
+    timer.lap('final_pnl')
+
+    return {
+        "pnl_annual": pnl_annual,
+        "segment_narratives": segment_narratives,
+        "total_investment": total_investment,
+        "assumptions": {
+            "num_high_perf_gpus": num_high_perf_gpus,
+            "num_standard_gpus": num_standard_gpus,
+            "utilization_rate": utilization_rate,
+            "serviced_tokens_t": serviced_tokens / 1e12,
+        },
+        "recommendation": recommendation,
+    }
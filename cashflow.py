@@ -0,0 +1,210 @@
+# cashflow.py (v1.0 - Multi-year Engine)
+# Builds yearly cash-flow matrices (scenarios x years) on top of the batch engine and
+# derives NPV, IRR and (discounted) payback for every scenario at once.
+import csv
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from calculator import calculate_core_business_case_batch, _scenario_arrays
+from config_loader import resolve_config
+
+
+@lru_cache(maxsize=8)
+def _read_demand_profile(path, mtime_ns):
+    with open(path, newline="") as f:
+        rows = sorted(csv.DictReader(f), key=lambda row: int(row['year']))
+    return (
+        np.array([int(row['year']) for row in rows]),
+        np.array([float(row['demand_mwh']) for row in rows]),
+        np.array([float(row['peak_demand_mw']) for row in rows]),
+    )
+
+
+def load_demand_profile(path):
+    """Returns (years, demand_mwh, peak_demand_mw) arrays from a demand_profile.csv file."""
+    return _read_demand_profile(path, os.stat(path).st_mtime_ns)
+
+
+def utilization_ramp(horizon_years, demand_profile=None):
+    """
+    Yearly utilization multipliers (length `horizon_years`).
+
+    Each profile year's demand_mwh is taken relative to the profile's peak year, so the
+    scenario's utilization_rate is reached once demand has fully ramped up. Years beyond
+    the profile hold the last value. Without a profile the ramp is flat at 1.0.
+    """
+    if not demand_profile:
+        return np.ones(horizon_years)
+    _, demand_mwh, _ = load_demand_profile(demand_profile)
+    ramp = demand_mwh / demand_mwh.max() if demand_mwh.max() > 0 else np.ones_like(demand_mwh)
+    if ramp.size >= horizon_years:
+        return ramp[:horizon_years]
+    return np.concatenate([ramp, np.full(horizon_years - ramp.size, ramp[-1])])
+
+
+def it_refresh(age, life):
+    """
+    True for the operating years (age 1, 2, ...) at whose end IT hardware is bought again:
+    the years in which another full IT life has elapsed, so a non-integer life (e.g. 4.5)
+    refreshes in years 5, 9, 14, ...
+    """
+    return np.floor(age / life) > np.floor((age - 1) / life)
+
+
+def it_age(age, life):
+    """Years since the IT hardware in service during operating year `age` was bought."""
+    return age - np.ceil(np.floor((age - 1) / life) * life)
+
+
+# --- Vectorized financial metrics (rows = scenarios, columns = years 0..H) ---
+def npv(rate, cash_flows):
+    """Net present value of each row; `rate` may be a scalar or one rate per row."""
+    cash_flows = np.atleast_2d(cash_flows)
+    periods = np.arange(cash_flows.shape[1])
+    discount = (1.0 + np.asarray(rate, dtype=float)[..., None]) ** -periods
+    return (cash_flows * discount).sum(axis=1)
+
+
+def irr(cash_flows, low=-0.99, high=10.0, tol=1e-10, max_iter=200):
+    """
+    Internal rate of return of each row by batched bisection.
+
+    Rows whose NPV does not change sign over [low, high] (e.g. never profitable) get NaN.
+    """
+    cash_flows = np.atleast_2d(cash_flows)
+    n = cash_flows.shape[0]
+    low = np.full(n, low)
+    high = np.full(n, high)
+    npv_low = npv(low, cash_flows)
+    npv_high = npv(high, cash_flows)
+    valid = np.sign(npv_low) * np.sign(npv_high) < 0
+    for _ in range(max_iter):
+        mid = 0.5 * (low + high)
+        npv_mid = npv(mid, cash_flows)
+        same_side = np.sign(npv_mid) == np.sign(npv_low)
+        low = np.where(same_side, mid, low)
+        npv_low = np.where(same_side, npv_mid, npv_low)
+        high = np.where(same_side, high, mid)
+        if np.all(high - low < tol):
+            break
+    return np.where(valid, 0.5 * (low + high), np.nan)
+
+
+def payback_period(cash_flows, rate=0.0):
+    """
+    Years until cumulative (discounted at `rate`) cash flow turns non-negative, interpolated
+    within the crossing year. Rows that never recover get +inf.
+    """
+    cash_flows = np.atleast_2d(cash_flows)
+    periods = np.arange(cash_flows.shape[1])
+    discounted = cash_flows * (1.0 + np.asarray(rate, dtype=float)[..., None]) ** -periods
+    cumulative = np.cumsum(discounted, axis=1)
+    recovered = cumulative >= 0
+    # The first column is the initial investment, so a crossing at t means recovery during year t.
+    crossing = np.where(recovered.any(axis=1), recovered.argmax(axis=1), -1)
+    rows = np.arange(cash_flows.shape[0])
+    t = np.maximum(crossing, 1)
+    before = cumulative[rows, t - 1]
+    in_year = discounted[rows, t]
+    fraction = np.divide(-before, in_year, out=np.zeros_like(before), where=in_year > 0)
+    result = (t - 1) + fraction
+    result = np.where(crossing == 0, 0.0, result)
+    return np.where(crossing < 0, np.inf, result)
+
+
+def calculate_cash_flows(
+    dc_size_mw,
+    use_clean_power=None,
+    apply_mirrormind=None,
+    high_perf_gpu_ratio=None,
+    utilization_rate=None,
+    market_price_per_m_tokens=None,
+    config=None,
+    overrides=None,
+    discount_rate=None,
+    horizon_years=None,
+    demand_profile=None,
+    include_salvage=True,
+):
+    """
+    Multi-year cash flows for a batch of scenarios.
+
+    Utilization ramps along the demand profile (finance.demand_profile by default). The
+    datacenter is depreciated over its own life, IT hardware is depreciated over its life
+    and bought again at every refresh, and R&D is charged only during its amortization
+    years. Year 0 holds the initial CAPEX; if `include_salvage`, the remaining book value
+    of the assets is returned in the final year.
+
+    Returns:
+        dict: 'years' (calendar years, length H) plus (scenarios x H) matrices for
+            'utilization_rate', 'revenue', 'operating_profit', 'operating_cash_flow' and
+            'capex', the (scenarios x H+1) 'net_cash_flow' matrix, and per-scenario
+            'npv', 'irr', 'payback_period' and 'discounted_payback_period'.
+    """
+    config = resolve_config(config)
+    fin = config.finance
+    years_conf = config.investment.amortization_years
+    rate = fin.discount_rate if discount_rate is None else discount_rate
+    horizon = fin.horizon_years if horizon_years is None else int(horizon_years)
+    profile = fin.demand_profile if demand_profile is None else demand_profile
+
+    (dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio,
+     utilization_rate, market_price_per_m_tokens) = _scenario_arrays(
+        dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio,
+        utilization_rate, market_price_per_m_tokens
+    )
+    n = dc_size_mw.size
+    ramp = utilization_ramp(horizon, profile)
+    start_year = int(load_demand_profile(profile)[0][0]) if profile else 1
+
+    # --- 1. Yearly operating results: one batch evaluation over scenarios x years ---
+    yearly_utilization = utilization_rate[:, None] * ramp[None, :]
+    overrides = {path: np.repeat(np.broadcast_to(value, (n,)), horizon) for path, value in (overrides or {}).items()}
+    yearly = calculate_core_business_case_batch(
+        np.repeat(dc_size_mw, horizon),
+        np.repeat(use_clean_power, horizon),
+        np.repeat(apply_mirrormind, horizon),
+        np.repeat(high_perf_gpu_ratio, horizon),
+        yearly_utilization.ravel(),
+        np.repeat(market_price_per_m_tokens, horizon),
+        config=config,
+        overrides=overrides,
+    )
+    pnl = {key: value.reshape(n, horizon) for key, value in yearly['pnl_annual'].items()}
+
+    # --- 2. Depreciation & amortization schedules ---
+    year_index = np.arange(1, horizon + 1)
+    it_budget = pnl['it_depreciation'][:, :1] * years_conf.it_hardware
+    dc_capex = yearly['total_investment'].reshape(n, horizon)[:, :1] - it_budget
+    dc_depreciation = np.where(year_index <= years_conf.datacenter, dc_capex / years_conf.datacenter, 0.0)
+    it_depreciation = np.broadcast_to(it_budget / years_conf.it_hardware, (n, horizon))
+    rd_amortization = np.where(year_index <= years_conf.research_and_development, pnl['rd_amortization'], 0.0)
+    d_and_a = dc_depreciation + it_depreciation
+
+    operating_profit = pnl['gross_profit'] - pnl['sg_and_a'] - d_and_a - rd_amortization
+    operating_cash_flow = operating_profit + d_and_a
+
+    # --- 3. CAPEX: initial build plus IT hardware refresh at the end of every IT life ---
+    refresh = it_refresh(year_index, years_conf.it_hardware) & (year_index < horizon)
+    capex = np.where(refresh, it_budget, 0.0)
+    net_cash_flow = np.concatenate([-(dc_capex + it_budget), operating_cash_flow - capex], axis=1)
+    if include_salvage:
+        dc_book = dc_capex * max(0.0, 1.0 - horizon / years_conf.datacenter)
+        it_book = it_budget * max(0.0, 1.0 - it_age(horizon, years_conf.it_hardware) / years_conf.it_hardware)
+        net_cash_flow[:, -1:] += dc_book + it_book
+
+    return {
+        "years": start_year + np.arange(horizon),
+        "utilization_rate": yearly_utilization,
+        "revenue": pnl['revenue'],
+        "operating_profit": operating_profit,
+        "operating_cash_flow": operating_cash_flow,
+        "capex": capex,
+        "net_cash_flow": net_cash_flow,
+        "npv": npv(rate, net_cash_flow),
+        "irr": irr(net_cash_flow),
+        "payback_period": payback_period(net_cash_flow),
+        "discounted_payback_period": payback_period(net_cash_flow, rate),
+    }
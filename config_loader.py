@@ -0,0 +1,701 @@
+# config_loader.py (v1.0 - Cached Config)
+# Parses config.yml once into an immutable, validated SimulatorConfig and caches it per path.
+# The cache is refreshed only when the file's mtime/size changes AND its content hash differs
+# (the hash also covers the tier/cohort CSV named by model_and_market.tiers_file and the
+# hourly series named by operating_expenses.energy).
+import csv
+import hashlib
+import io
+import os
+import threading
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+import yaml
+
+import profiling
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.yml")
+
+
+class ConfigError(ValueError):
+    """Raised when config.yml is missing a required value or holds an invalid one."""
+
+
+@dataclass(frozen=True)
+class AmortizationYears:
+    datacenter: float
+    it_hardware: float
+    research_and_development: float
+
+
+@dataclass(frozen=True)
+class InvestmentConfig:
+    dc_capex_per_mw: float
+    it_budget_per_mw: float
+    amortization_years: AmortizationYears
+
+
+@dataclass(frozen=True)
+class GpuSpec:
+    cost: float
+    m_tokens_per_hour: float
+    power_kw: float = 0.0  # IT draw per GPU incl. its server share; 0 = not modelled
+
+
+@dataclass(frozen=True)
+class HardwareConfig:
+    high_perf_gpu: GpuSpec
+    standard_gpu: GpuSpec
+    skus: tuple = ()  # ((name, GpuSpec), ...) from hardware.skus, for the fleet optimizer
+
+    def catalog(self):
+        """The SKUs a fleet can be built from: hardware.skus, else the two slider GPUs."""
+        return self.skus or (('high_perf_gpu', self.high_perf_gpu), ('standard_gpu', self.standard_gpu))
+
+
+@dataclass(frozen=True)
+class PowerPriceConfig:
+    conventional: float
+    renewable: float
+
+
+@dataclass(frozen=True)
+class TariffSpec:
+    type: str  # one of TARIFF_TYPES
+    params: tuple  # sorted (name, value) pairs
+    residual: 'TariffSpec' = None  # ppa: the tariff the uncovered share of each hour pays
+
+    def param(self, name, default=None):
+        return dict(self.params).get(name, default)
+
+
+@dataclass(frozen=True)
+class PueCurveSpec:
+    fixed_overhead: float  # facility draw at zero IT load, as a fraction of IT capacity
+    cooling_overhead: float  # overhead per unit of IT load at the reference temperature
+    ambient_coefficient: float  # relative increase of cooling_overhead per degC above it
+    reference_temp_c: float
+
+
+@dataclass(frozen=True)
+class EnergyConfig:
+    hourly_prices: str  # absolute paths, or '' when the series is not given
+    load_profile: str
+    ambient_temperature: str
+    start_weekday: int  # weekday of the first hour, 0 = Monday
+    pue_curve: PueCurveSpec  # None: the constant operating_expenses.pue
+    tariffs: tuple  # (('conventional', TariffSpec), ('renewable', TariffSpec))
+
+    def files(self):
+        return [path for path in (self.hourly_prices, self.load_profile, self.ambient_temperature) if path]
+
+
+@dataclass(frozen=True)
+class OperatingExpensesConfig:
+    maintenance_and_cooling_per_mw: float
+    personnel_and_other_per_mw: float
+    sgna_as_percent_of_revenue: float
+    pue: float
+    power_cost_per_kwh: PowerPriceConfig
+    energy: EnergyConfig = None  # operating_expenses.energy; None = flat rate x constant PUE
+
+
+@dataclass(frozen=True)
+class ResearchConfig:
+    total_model_development_cost: float
+    global_datacenter_count_for_cost_allocation: float
+
+
+@dataclass(frozen=True)
+class FinanceConfig:
+    discount_rate: float
+    horizon_years: int
+    demand_profile: str  # absolute path, or '' when no profile is configured
+
+
+@dataclass(frozen=True)
+class TierSpec:
+    name: str
+    ratio: float
+    monthly_token_usage_m: float
+    paid: bool = None  # None: every tier except 'free' is paid
+
+    @property
+    def is_paid(self):
+        return self.name != 'free' if self.paid is None else self.paid
+
+
+class TierTable:
+    """
+    The tiers (or customer cohorts) with a non-zero user share, as aligned vectors, so that
+    per-tier metrics are array operations over any number of tiers.
+    """
+
+    def __init__(self, tiers, token_usage_ratios):
+        active = [(tier, usage) for tier, usage in zip(tiers, token_usage_ratios) if tier.ratio > 0]
+        self.names = tuple(tier.name for tier, _ in active)
+        self.keys = [f"tier_{name}" for name in self.names]
+        self.ratio = np.array([tier.ratio for tier, _ in active])
+        self.token_usage_ratio = np.array([usage for _, usage in active])
+        self.is_paid = np.array([tier.is_paid for tier, _ in active], dtype=bool)
+        # Share of tokens per unit of user share: per-user metrics are these times a scalar.
+        self.usage_per_user = self.token_usage_ratio / self.ratio
+        self.paid_usage_per_user = np.where(self.is_paid, self.usage_per_user, 0.0)
+        self.paid_usage_ratio = float(self.token_usage_ratio[self.is_paid].sum())
+        # The same per tier as plain floats, for the single-scenario path.
+        self.rows = tuple(zip(self.keys, self.ratio.tolist(), self.usage_per_user.tolist(), self.paid_usage_per_user.tolist()))
+        self._positions = {name: j for j, name in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.names)
+
+    def index(self, name):
+        """Position of tier `name`, or None when there is no such (active) tier."""
+        return self._positions.get(name)
+
+
+@dataclass(frozen=True)
+class ModelMarketConfig:
+    intelligent_arch_efficiency: float
+    market_price_per_million_tokens: float
+    total_users_for_100mw: float
+    tiers: tuple
+    tiers_file: str = ''  # absolute path of the cohort CSV the tiers were read from, if any
+    # ((tier name, monthly fee limit), ...): a recommendation is achievable when every listed
+    # tier's recommended fee stays below its limit.
+    achievable_fee_limits: tuple = (('standard', 100.0), ('premium', 500.0))
+
+
+@dataclass(frozen=True)
+class UncertaintySpec:
+    """A distribution declared as `<key>_uncertainty` next to a numeric config value."""
+    path: str
+    distribution: str
+    value: float
+    params: tuple
+
+    def sample(self, rng, size):
+        p = dict(self.params)
+        if self.distribution == 'triangular':
+            return rng.triangular(p['low'], p.get('mode', self.value), p['high'], size)
+        if self.distribution == 'uniform':
+            return rng.uniform(p['low'], p['high'], size)
+        if self.distribution == 'normal':
+            return rng.normal(p.get('mean', self.value), p['std'], size)
+        # lognormal: median at the declared value
+        return self.value * rng.lognormal(0.0, p['sigma'], size)
+
+
+@dataclass(frozen=True)
+class SimulatorConfig:
+    investment: InvestmentConfig
+    hardware: HardwareConfig
+    operating_expenses: OperatingExpensesConfig
+    research_and_development: ResearchConfig
+    finance: FinanceConfig
+    model_and_market: ModelMarketConfig
+    uncertainty: tuple
+    path: str
+    config_hash: str
+    # --- Derived constants (computed once at load time) ---
+    total_paid_token_usage_ratio: float
+    total_token_demand_ratio: float
+    token_usage_ratios: tuple
+    rd_amortization: float
+
+    @property
+    def tiers(self):
+        return self.model_and_market.tiers
+
+    @cached_property
+    def tier_table(self):
+        return TierTable(self.model_and_market.tiers, self.token_usage_ratios)
+
+    def tier(self, name):
+        for tier in self.model_and_market.tiers:
+            if tier.name == name:
+                return tier
+        raise KeyError(name)
+
+    def get(self, dotted_path):
+        """Returns a value by its config.yml path, e.g. 'hardware.high_perf_gpu.cost'."""
+        value = self
+        for part in dotted_path.split('.'):
+            try:
+                value = getattr(value, part)
+            except AttributeError:
+                raise KeyError(dotted_path) from None
+        return value
+
+
+# --- Parsing & validation helpers ---
+def _section(raw, key, where):
+    value = raw.get(key) if isinstance(raw, dict) else None
+    if not isinstance(value, dict):
+        raise ConfigError(f"'{where}{key}' must be a mapping")
+    return value
+
+
+def _number(raw, key, where, minimum=None, positive=False):
+    value = raw.get(key)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ConfigError(f"'{where}{key}' must be a number, got {value!r}")
+    if positive and value <= 0:
+        raise ConfigError(f"'{where}{key}' must be > 0, got {value!r}")
+    if minimum is not None and value < minimum:
+        raise ConfigError(f"'{where}{key}' must be >= {minimum}, got {value!r}")
+    return float(value)
+
+
+def _gpu_spec(gpu, where, sku=False):
+    return GpuSpec(
+        cost=_number(gpu, 'cost', where, positive=sku, minimum=0),
+        m_tokens_per_hour=_number(gpu, 'm_tokens_per_hour', where, minimum=0),
+        # The slider GPUs predate power figures; catalog SKUs must state theirs.
+        power_kw=_number(gpu, 'power_kw', where, minimum=0) if sku or 'power_kw' in gpu else 0.0,
+    )
+
+
+def _power_prices(op):
+    # Configs predating the power price section keep the historical flat rates.
+    prices = op.get('power_cost_per_kwh')
+    if prices is None:
+        return PowerPriceConfig(conventional=0.12, renewable=0.18)
+    prices = _section(op, 'power_cost_per_kwh', 'operating_expenses.')
+    where = 'operating_expenses.power_cost_per_kwh.'
+    return PowerPriceConfig(
+        conventional=_number(prices, 'conventional', where, minimum=0),
+        renewable=_number(prices, 'renewable', where, minimum=0),
+    )
+
+
+TARIFF_TYPES = {
+    # type: (required params, optional params)
+    'flat': ((), ('rate',)),
+    'series': ((), ('scale', 'adder')),
+    'time_of_use': (('peak', 'offpeak', 'peak_hours'), ('weekdays_only',)),
+    'ppa': (('rate', 'coverage'), ('residual',)),
+}
+
+
+def _tariff(raw, where, has_prices):
+    if not isinstance(raw, dict):
+        raise ConfigError(f"'{where}' must be a mapping")
+    kind = raw.get('type')
+    if kind not in TARIFF_TYPES:
+        raise ConfigError(f"'{where}.type' must be one of {sorted(TARIFF_TYPES)}, got {kind!r}")
+    required, optional = TARIFF_TYPES[kind]
+    unknown = [name for name in raw if name != 'type' and name not in required + optional]
+    if unknown:
+        raise ConfigError(f"'{where}' has unknown {kind} setting(s) {unknown}")
+    missing = [name for name in required if name not in raw]
+    if missing:
+        raise ConfigError(f"'{where}.{missing[0]}' is required for a {kind} tariff")
+    if kind == 'series' and not has_prices:
+        raise ConfigError(f"'{where}' is a series tariff but 'operating_expenses.energy.hourly_prices' is not set")
+
+    params = {}
+    residual = None
+    for name in raw:
+        if name in ('type', 'residual'):
+            continue
+        if name == 'peak_hours':
+            hours = raw[name]
+            if (not isinstance(hours, (list, tuple)) or len(hours) != 2
+                    or not all(isinstance(h, int) and not isinstance(h, bool) and 0 <= h <= 24 for h in hours)):
+                raise ConfigError(f"'{where}.peak_hours' must be [start, end) hours of the day, got {hours!r}")
+            params[name] = tuple(hours)
+        elif name == 'weekdays_only':
+            if not isinstance(raw[name], bool):
+                raise ConfigError(f"'{where}.weekdays_only' must be true or false, got {raw[name]!r}")
+            params[name] = raw[name]
+        elif name == 'adder':
+            params[name] = _number(raw, name, f'{where}.')
+        else:
+            params[name] = _number(raw, name, f'{where}.', minimum=0)
+    if kind == 'ppa':
+        if params['coverage'] > 1:
+            raise ConfigError(f"'{where}.coverage' must be <= 1, got {params['coverage']!r}")
+        residual_raw = raw.get('residual') or {'type': 'series' if has_prices else 'flat'}
+        residual = _tariff(residual_raw, f'{where}.residual', has_prices)
+    return TariffSpec(type=kind, params=tuple(sorted(params.items())), residual=residual)
+
+
+def _energy_files(op, path):
+    """Absolute paths of the operating_expenses.energy series (relative to config.yml)."""
+    energy = op.get('energy') if isinstance(op, dict) else None
+    if not isinstance(energy, dict):
+        return {}
+    return {
+        key: _relative_path(energy.get(key) or '', path)
+        for key in ('hourly_prices', 'load_profile', 'ambient_temperature')
+    }
+
+
+def _energy(op, path):
+    # The hourly energy model is optional; without it power is the flat rate x constant PUE.
+    if op.get('energy') is None:
+        return None
+    energy = _section(op, 'energy', 'operating_expenses.')
+    where = 'operating_expenses.energy.'
+    files = _energy_files(op, path)
+    if not files['hourly_prices'] and not files['load_profile']:
+        raise ConfigError(f"'{where[:-1]}' needs hourly_prices and/or load_profile")
+
+    start_weekday = _number(energy, 'start_weekday', where, minimum=0) if 'start_weekday' in energy else 0
+    if start_weekday != int(start_weekday) or start_weekday > 6:
+        raise ConfigError(f"'{where}start_weekday' must be 0 (Monday) .. 6, got {energy['start_weekday']!r}")
+
+    pue_curve = None
+    if energy.get('pue_curve') is not None:
+        curve = _section(energy, 'pue_curve', where)
+        curve_where = f'{where}pue_curve.'
+        pue_curve = PueCurveSpec(
+            fixed_overhead=_number(curve, 'fixed_overhead', curve_where, minimum=0),
+            cooling_overhead=_number(curve, 'cooling_overhead', curve_where, minimum=0),
+            ambient_coefficient=_number(curve, 'ambient_coefficient', curve_where, minimum=0) if 'ambient_coefficient' in curve else 0.0,
+            reference_temp_c=_number(curve, 'reference_temp_c', curve_where) if 'reference_temp_c' in curve else 20.0,
+        )
+
+    # Default tariffs: grid power follows the hourly prices, renewable power is contracted flat.
+    has_prices = bool(files['hourly_prices'])
+    tariffs_raw = energy.get('tariffs') or {}
+    if not isinstance(tariffs_raw, dict):
+        raise ConfigError(f"'{where}tariffs' must be a mapping")
+    unknown = [name for name in tariffs_raw if name not in ('conventional', 'renewable')]
+    if unknown:
+        raise ConfigError(f"'{where}tariffs' has unknown power source(s) {unknown}")
+    defaults = {'conventional': {'type': 'series' if has_prices else 'flat'}, 'renewable': {'type': 'flat'}}
+    tariffs = tuple(
+        (source, _tariff(tariffs_raw.get(source) or defaults[source], f'{where}tariffs.{source}', has_prices))
+        for source in ('conventional', 'renewable')
+    )
+    return EnergyConfig(
+        **files,
+        start_weekday=int(start_weekday),
+        pue_curve=pue_curve,
+        tariffs=tariffs,
+    )
+
+
+def _relative_path(file, path):
+    """`file` made absolute against the directory of config.yml at `path` ('' stays '')."""
+    if file and not os.path.isabs(file):
+        base = os.path.dirname(path) if os.path.isabs(path) else os.path.dirname(DEFAULT_CONFIG_PATH)
+        file = os.path.join(base, file)
+    return file
+
+
+def _finance(raw, path):
+    # The finance section is optional; defaults reproduce an unramped 20-year horizon at 8%.
+    fin = raw.get('finance')
+    if fin is None:
+        return FinanceConfig(discount_rate=0.08, horizon_years=20, demand_profile='')
+    fin = _section(raw, 'finance', '')
+    horizon = _number(fin, 'horizon_years', 'finance.', positive=True)
+    if horizon != int(horizon):
+        raise ConfigError(f"'finance.horizon_years' must be a whole number, got {horizon!r}")
+    profile = _relative_path(fin.get('demand_profile') or '', path)
+    return FinanceConfig(
+        discount_rate=_number(fin, 'discount_rate', 'finance.', minimum=0),
+        horizon_years=int(horizon),
+        demand_profile=profile,
+    )
+
+
+_DISTRIBUTION_PARAMS = {
+    'triangular': ('low', 'high'),
+    'uniform': ('low', 'high'),
+    'normal': ('std',),
+    'lognormal': ('sigma',),
+}
+
+
+def _uncertainty_specs(raw, prefix=''):
+    """Collects every `<key>_uncertainty` mapping declared next to a numeric value."""
+    specs = []
+    for key, value in raw.items():
+        key = str(key)
+        if isinstance(value, dict) and not key.endswith('_uncertainty'):
+            specs.extend(_uncertainty_specs(value, f'{prefix}{key}.'))
+            continue
+        if not key.endswith('_uncertainty'):
+            continue
+        base = key[:-len('_uncertainty')]
+        where = f'{prefix}{key}'
+        if not isinstance(value, dict):
+            raise ConfigError(f"'{where}' must be a mapping")
+        distribution = value.get('distribution')
+        if distribution not in _DISTRIBUTION_PARAMS:
+            raise ConfigError(f"'{where}.distribution' must be one of {sorted(_DISTRIBUTION_PARAMS)}, got {distribution!r}")
+        base_value = _number(raw, base, prefix)
+        params = {name: _number(value, name, f'{where}.') for name in value if name != 'distribution'}
+        for name in _DISTRIBUTION_PARAMS[distribution]:
+            if name not in params:
+                raise ConfigError(f"'{where}.{name}' is required for a {distribution} distribution")
+        if 'low' in params and params['low'] > params['high']:
+            raise ConfigError(f"'{where}.low' must be <= '{where}.high'")
+        specs.append(UncertaintySpec(
+            path=f'{prefix}{base}',
+            distribution=distribution,
+            value=base_value,
+            params=tuple(sorted(params.items())),
+        ))
+    return specs
+
+
+def _tier_paid(value, where):
+    if value is None:
+        return None
+    if not isinstance(value, bool):
+        raise ConfigError(f"'{where}paid' must be true or false, got {value!r}")
+    return value
+
+
+def _tiers_from_mapping(tiers_raw):
+    tiers = []
+    for tier_name, tier_info in tiers_raw.items():
+        where = f'model_and_market.tiers.{tier_name}.'
+        if not isinstance(tier_info, dict):
+            raise ConfigError(f"'{where[:-1]}' must be a mapping")
+        tiers.append(TierSpec(
+            name=str(tier_name),
+            ratio=_number(tier_info, 'ratio', where, minimum=0),
+            monthly_token_usage_m=_number(tier_info, 'monthly_token_usage_m', where, minimum=0),
+            paid=_tier_paid(tier_info.get('paid'), where),
+        ))
+    return tiers
+
+
+def _fee_limits(mm):
+    # Configs predating the section keep the historical Standard/Premium limits. A limit for
+    # a tier that is not defined (e.g. with a cohort tiers_file) does not apply.
+    if mm.get('achievable_fee_limits') is None:
+        return ModelMarketConfig.achievable_fee_limits
+    limits = _section(mm, 'achievable_fee_limits', 'model_and_market.')
+    return tuple((str(name), _number(limits, name, 'model_and_market.achievable_fee_limits.', positive=True)) for name in limits)
+
+
+def _tiers_file(mm, path):
+    """Absolute path of model_and_market.tiers_file (relative to config.yml), or ''."""
+    return _relative_path(mm.get('tiers_file') or '', path)
+
+
+def _tiers_from_csv(path, content=None):
+    """
+    Reads tiers/cohorts from a CSV with columns name, ratio, monthly_token_usage_m and an
+    optional paid (true/false) column. Ratios are normalized to sum to 1, so user counts
+    from a billing export can be used as they are.
+    """
+    where = f"tiers_file {os.path.basename(path)}"
+    if content is None:
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            raise ConfigError(f"{where}: file not found: {path}") from None
+    rows = list(csv.DictReader(io.StringIO(content.decode('utf-8-sig'))))
+    missing = [name for name in ('name', 'ratio', 'monthly_token_usage_m') if rows and name not in rows[0]]
+    if not rows or missing:
+        raise ConfigError(f"{where}: needs rows with columns name, ratio, monthly_token_usage_m (missing {missing})")
+    tiers = []
+    for line, row in enumerate(rows, start=2):
+        try:
+            ratio = float(row['ratio'])
+            usage = float(row['monthly_token_usage_m'])
+        except ValueError as exc:
+            raise ConfigError(f"{where} line {line}: {exc}") from None
+        if ratio < 0 or usage < 0:
+            raise ConfigError(f"{where} line {line}: ratio and monthly_token_usage_m must be >= 0")
+        paid = (row.get('paid') or '').strip().lower()
+        tiers.append(TierSpec(
+            name=row['name'].strip(),
+            ratio=ratio,
+            monthly_token_usage_m=usage,
+            paid=None if not paid else paid in ('1', 'true', 'yes'),
+        ))
+    if len({tier.name for tier in tiers}) != len(tiers):
+        raise ConfigError(f"{where}: tier names must be unique")
+    total = sum(tier.ratio for tier in tiers)
+    if total <= 0:
+        raise ConfigError(f"{where}: ratios must not all be 0")
+    return [TierSpec(tier.name, tier.ratio / total, tier.monthly_token_usage_m, tier.paid) for tier in tiers]
+
+
+def parse_config(raw, path="<memory>", config_hash="", contents=None):
+    """
+    Builds a validated SimulatorConfig from the dict produced by yaml.safe_load. `contents`
+    maps data file paths to bytes already read (and hashed) by the caller.
+    """
+    inv = _section(raw, 'investment', '')
+    years = _section(inv, 'amortization_years', 'investment.')
+    hw = _section(raw, 'hardware', '')
+    op = _section(raw, 'operating_expenses', '')
+    rd = _section(raw, 'research_and_development', '')
+    mm = _section(raw, 'model_and_market', '')
+
+    investment = InvestmentConfig(
+        dc_capex_per_mw=_number(inv, 'dc_capex_per_mw', 'investment.', minimum=0),
+        it_budget_per_mw=_number(inv, 'it_budget_per_mw', 'investment.', minimum=0),
+        amortization_years=AmortizationYears(
+            datacenter=_number(years, 'datacenter', 'investment.amortization_years.', positive=True),
+            it_hardware=_number(years, 'it_hardware', 'investment.amortization_years.', positive=True),
+            research_and_development=_number(years, 'research_and_development', 'investment.amortization_years.', positive=True),
+        ),
+    )
+    gpus = {gpu_name: _gpu_spec(_section(hw, gpu_name, 'hardware.'), f'hardware.{gpu_name}.') for gpu_name in ('high_perf_gpu', 'standard_gpu')}
+    skus = hw.get('skus') or {}
+    if not isinstance(skus, dict):
+        raise ConfigError("'hardware.skus' must be a mapping")
+    hardware = HardwareConfig(
+        **gpus,
+        skus=tuple((str(name), _gpu_spec(_section(skus, name, 'hardware.skus.'), f'hardware.skus.{name}.', sku=True)) for name in skus),
+    )
+    operating_expenses = OperatingExpensesConfig(
+        maintenance_and_cooling_per_mw=_number(op, 'maintenance_and_cooling_per_mw', 'operating_expenses.', minimum=0),
+        personnel_and_other_per_mw=_number(op, 'personnel_and_other_per_mw', 'operating_expenses.', minimum=0),
+        sgna_as_percent_of_revenue=_number(op, 'sgna_as_percent_of_revenue', 'operating_expenses.', minimum=0),
+        pue=_number(op, 'pue', 'operating_expenses.', minimum=1.0),
+        power_cost_per_kwh=_power_prices(op),
+        energy=_energy(op, path),
+    )
+    if operating_expenses.sgna_as_percent_of_revenue >= 100:
+        raise ConfigError("'operating_expenses.sgna_as_percent_of_revenue' must be < 100")
+    research = ResearchConfig(
+        total_model_development_cost=_number(rd, 'total_model_development_cost', 'research_and_development.', minimum=0),
+        global_datacenter_count_for_cost_allocation=_number(rd, 'global_datacenter_count_for_cost_allocation', 'research_and_development.', positive=True),
+    )
+
+    tiers_file = _tiers_file(mm, path)
+    tiers = _tiers_from_csv(tiers_file, (contents or {}).get(tiers_file)) if tiers_file else _tiers_from_mapping(_section(mm, 'tiers', 'model_and_market.'))
+    if not any(tier.is_paid and tier.ratio > 0 for tier in tiers):
+        raise ConfigError("'model_and_market.tiers' must include a paid tier with a non-zero ratio")
+    ratio_sum = sum(tier.ratio for tier in tiers)
+    if abs(ratio_sum - 1.0) > 1e-6:
+        raise ConfigError(f"'model_and_market.tiers' ratios must sum to 1.0, got {ratio_sum}")
+
+    model_and_market = ModelMarketConfig(
+        intelligent_arch_efficiency=_number(mm, 'intelligent_arch_efficiency', 'model_and_market.', positive=True),
+        market_price_per_million_tokens=_number(mm, 'market_price_per_million_tokens', 'model_and_market.', minimum=0),
+        total_users_for_100mw=_number(mm, 'total_users_for_100mw', 'model_and_market.', minimum=0),
+        tiers=tuple(tiers),
+        tiers_file=tiers_file,
+        achievable_fee_limits=_fee_limits(mm),
+    )
+
+    # --- Derived constants ---
+    total_token_demand_ratio = sum(tier.ratio * tier.monthly_token_usage_m for tier in tiers)
+    token_usage_ratios = tuple(
+        (tier.ratio * tier.monthly_token_usage_m) / total_token_demand_ratio if total_token_demand_ratio > 0 else 0
+        for tier in tiers
+    )
+    return SimulatorConfig(
+        investment=investment,
+        hardware=hardware,
+        operating_expenses=operating_expenses,
+        research_and_development=research,
+        finance=_finance(raw, path),
+        model_and_market=model_and_market,
+        uncertainty=tuple(_uncertainty_specs(raw)),
+        path=path,
+        config_hash=config_hash,
+        total_paid_token_usage_ratio=sum(tier.ratio for tier in tiers if tier.is_paid),
+        total_token_demand_ratio=total_token_demand_ratio,
+        token_usage_ratios=token_usage_ratios,
+        rd_amortization=(research.total_model_development_cost / research.global_datacenter_count_for_cost_allocation)
+        / investment.amortization_years.research_and_development,
+    )
+
+
+# --- Per-path cache ---
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def load_config(path=None):
+    """
+    Returns the parsed config for `path` (default: the config.yml next to this module).
+
+    The file is only re-read when its mtime or size changed, and only re-parsed when
+    the content hash differs from the cached one.
+    """
+    if not profiling.is_enabled():
+        return _load_config(path)
+    with profiling.span('config.load'):
+        return _load_config(path)
+
+
+def _stamp(paths):
+    stamps = []
+    for dependency in paths:
+        try:
+            stat = os.stat(dependency)
+        except FileNotFoundError:
+            raise ConfigError(f"config file not found: {dependency}") from None
+        stamps.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(stamps)
+
+
+def _read_all(paths):
+    contents = []
+    for dependency in paths:
+        with open(dependency, "rb") as f:
+            contents.append(f.read())
+    return contents
+
+
+def _load_config(path):
+    path = os.path.abspath(os.fspath(path)) if path is not None else DEFAULT_CONFIG_PATH
+    with _cache_lock:
+        # Entries are (files, stamps, digest, config): config.yml plus its data files (a
+        # tiers_file and hourly energy series, if any), all of which feed the content hash.
+        entry = _cache.get(path)
+        if entry is None:
+            _stamp([path])  # a missing config.yml fails here with a ConfigError
+        elif _stamp(entry[0]) == entry[1]:
+            return entry[3]
+
+        content = _read_all([path])[0]
+        if entry is not None:
+            digest = _digest([content, *_read_all(entry[0][1:])])
+            if digest == entry[2]:
+                _cache[path] = (entry[0], _stamp(entry[0]), digest, entry[3])
+                return entry[3]
+
+        with profiling.span('config.parse'):
+            raw = yaml.safe_load(content)
+            mm = raw.get('model_and_market') if isinstance(raw, dict) else None
+            op = raw.get('operating_expenses') if isinstance(raw, dict) else None
+            files = [path]
+            if isinstance(mm, dict) and mm.get('tiers_file'):
+                files.append(_tiers_file(mm, path))
+            files.extend(dict.fromkeys(file for file in _energy_files(op, path).values() if file))
+            stamp = _stamp(files)
+            data = _read_all(files[1:])
+            digest = _digest([content, *data])
+            config = parse_config(raw, path=path, config_hash=digest, contents=dict(zip(files[1:], data)))
+        _cache[path] = (files, stamp, digest, config)
+        return config
+
+
+def _digest(contents):
+    if len(contents) == 1:
+        return hashlib.sha256(contents[0]).hexdigest()  # unchanged for configs without data files
+    h = hashlib.sha256()
+    for content in contents:
+        h.update(hashlib.sha256(content).digest())
+    return h.hexdigest()
+
+
+def resolve_config(config=None):
+    """Accepts None (default file), a path, or an already-loaded SimulatorConfig."""
+    if isinstance(config, SimulatorConfig):
+        return config
+    return load_config(config)
+
+
+def clear_config_cache():
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,239 @@
+# energy.py (v1.0 - Hourly Energy Model)
+# Prices a site's electricity hour by hour instead of as flat rate x constant PUE. The series
+# named in operating_expenses.energy (hourly $/kWh, IT load profile, ambient temperature;
+# .npy files are memory-mapped, CSVs parsed once per modification) are folded into per-tariff
+# prefix sums at load time, so the annual cost of any number of scenarios is one sorted
+# lookup each: exact, including hours where the load profile would exceed the site capacity.
+#
+# Tariffs (flat, series, time_of_use, ppa) are declared per power source in config.yml.
+#
+#   python energy.py [--dc-size 100] [--utilization 70] [--renewable] [--config config.yml]
+#   python energy.py --hourly hourly.csv          # the hourly breakdown of that scenario
+import argparse
+import bisect
+import csv
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+from config_loader import ConfigError, resolve_config
+
+HOURS_PER_YEAR = 8760
+SOURCES = ('conventional', 'renewable')
+# Column read from a CSV for each series; CSVs without it use their last column.
+SERIES_COLUMNS = {'hourly_prices': 'price', 'load_profile': 'load', 'ambient_temperature': 'ambient_c'}
+
+
+@lru_cache(maxsize=16)
+def _read_series(path, column, mtime_ns):
+    if path.endswith('.npy'):
+        values = np.load(path, mmap_mode='r')
+    else:
+        with open(path, newline='') as f:
+            header = next(csv.reader(f), None)
+        if not header:
+            raise ConfigError(f"hourly series {path} is empty")
+        index = header.index(column) if column in header else len(header) - 1
+        values = np.loadtxt(path, delimiter=',', skiprows=1, usecols=index, ndmin=1)
+    if values.ndim != 1 or values.size == 0:
+        raise ConfigError(f"hourly series {path} must hold one value per hour")
+    if not np.isfinite(values).all():
+        raise ConfigError(f"hourly series {path} has missing or non-finite values")
+    return values
+
+
+def load_series(path, column):
+    """One hourly series as a 1-D array (read-only; memory-mapped for .npy files)."""
+    return _read_series(path, column, os.stat(path).st_mtime_ns)
+
+
+class EnergyModel:
+    """
+    The hourly facility power and energy cost of a site, per unit of IT capacity.
+
+    At hour h a site of `dc` MW at average utilization u draws
+        it_h       = dc * min(u * load_h, 1)                        (MW of IT load)
+        facility_h = it_h * (1 + cooling_h) + dc * fixed_overhead
+    where cooling_h rises with the ambient temperature above the reference, and pays
+    price_h per kWh under its power source's tariff.
+
+    With a flat load profile, a flat tariff and no PUE curve this is exactly the
+    calculator's flat formula, dc * u * pue * 8760 * 1000 * rate.
+    """
+
+    def __init__(self, spec, pue, rates):
+        self.spec = spec
+        self.base_pue = pue
+        self.base_rates = {source: getattr(rates, source) for source in SOURCES}
+        series = {key: load_series(getattr(spec, key), column) if getattr(spec, key) else None for key, column in SERIES_COLUMNS.items()}
+        lengths = {key: values.size for key, values in series.items() if values is not None}
+        if len(set(lengths.values())) > 1:
+            raise ConfigError(f"'operating_expenses.energy' series differ in length: {lengths}")
+        self.hours = next(iter(lengths.values()))
+        self.years = self.hours / HOURS_PER_YEAR
+
+        load = series['load_profile']
+        if load is None:
+            self.load = np.ones(self.hours)
+        else:
+            if (load < 0).any() or load.mean() <= 0:
+                raise ConfigError("'operating_expenses.energy.load_profile' must be >= 0 with a positive mean")
+            self.load = load / load.mean()  # relative to the average, so utilization keeps its meaning
+
+        curve = spec.pue_curve
+        if curve is None:
+            self.fixed_overhead = 0.0
+            self.cooling = np.full(self.hours, pue - 1.0)
+        else:
+            self.fixed_overhead = curve.fixed_overhead
+            self.cooling = np.full(self.hours, curve.cooling_overhead)
+            if series['ambient_temperature'] is not None:
+                excess = np.maximum(series['ambient_temperature'] - curve.reference_temp_c, 0.0)
+                self.cooling = self.cooling * (1.0 + curve.ambient_coefficient * excess)
+
+        hour = np.arange(self.hours)
+        self.hour_of_day = hour % 24
+        self.weekday = (spec.start_weekday + hour // 24) % 7
+        self.hourly_prices = series['hourly_prices']
+        self.prices = {source: self._tariff_prices(tariff, source) for source, tariff in spec.tariffs}
+
+        # --- Prefix sums over hours sorted by load (one row per source) ---
+        # Hours with load < 1/u run unclipped and cost u * sum(load * w); the rest run at
+        # capacity and cost sum(w), with w = (1 + cooling) * price.
+        order = np.argsort(self.load, kind='stable')
+        self._sorted_load = self.load[order]
+        weights = np.stack([(1.0 + self.cooling) * self.prices[source] for source in SOURCES])[:, order]
+        zeros = np.zeros((len(SOURCES), 1))
+        self._load_weight = np.hstack([zeros, np.cumsum(weights * self._sorted_load, axis=1)])
+        weight_sum = np.cumsum(weights, axis=1)
+        self._tail_weight = np.hstack([weight_sum[:, -1:], weight_sum[:, -1:] - weight_sum])
+        self._fixed_weight = np.array([self.prices[source].sum() for source in SOURCES])
+        # The same as plain lists for the single-scenario path (bisect instead of array calls).
+        self._scalar = (self._sorted_load.tolist(), self._load_weight.tolist(), self._tail_weight.tolist(), self._fixed_weight.tolist())
+
+    def _tariff_prices(self, tariff, source):
+        """$/kWh of every hour under `tariff`."""
+        if tariff.type == 'flat':
+            return np.full(self.hours, tariff.param('rate', self.base_rates[source]))
+        if tariff.type == 'series':
+            return self.hourly_prices * tariff.param('scale', 1.0) + tariff.param('adder', 0.0)
+        if tariff.type == 'time_of_use':
+            start, end = tariff.param('peak_hours')
+            peak = (self.hour_of_day >= start) & (self.hour_of_day < end)
+            if tariff.param('weekdays_only', True):
+                peak &= self.weekday < 5
+            return np.where(peak, tariff.param('peak'), tariff.param('offpeak'))
+        # ppa: a fixed share of every hour is bought at the contract rate, the rest at the residual tariff
+        coverage = tariff.param('coverage')
+        return coverage * tariff.param('rate') + (1.0 - coverage) * self._tariff_prices(tariff.residual, source)
+
+    def annual_cost(self, dc_size_mw, utilization, use_clean_power):
+        """
+        Annual energy cost ($) of every scenario at the config's rates and PUE.
+
+        `utilization` is a fraction (0..1); inputs broadcast. Only arithmetic is applied to
+        `dc_size_mw` and `utilization`, so the dual numbers of sensitivity.py pass through.
+        """
+        if isinstance(utilization, (int, float)) and isinstance(dc_size_mw, (int, float)):
+            return self._annual_cost_scalar(dc_size_mw, utilization, bool(use_clean_power))
+        u_value = np.asarray(getattr(utilization, 'value', utilization), dtype=float)
+        source = np.asarray(use_clean_power, dtype=bool).astype(int)
+        with np.errstate(divide='ignore'):
+            threshold = np.where(u_value > 0, 1.0 / u_value, np.inf)
+        k = np.searchsorted(self._sorted_load, threshold, side='left')
+        per_mw = utilization * self._load_weight[source, k] + self._tail_weight[source, k] + self.fixed_overhead * self._fixed_weight[source]
+        return dc_size_mw * 1000.0 * per_mw / self.years
+
+    def _annual_cost_scalar(self, dc_size_mw, utilization, use_clean_power):
+        sorted_load, load_weight, tail_weight, fixed_weight = self._scalar
+        source = int(use_clean_power)
+        k = bisect.bisect_left(sorted_load, 1.0 / utilization) if utilization > 0 else len(sorted_load)
+        per_mw = utilization * load_weight[source][k] + tail_weight[source][k] + self.fixed_overhead * fixed_weight[source]
+        return dc_size_mw * 1000.0 * per_mw / self.years
+
+    def power_cost(self, dc_size_mw, utilization, use_clean_power, pue=None, conventional=None, renewable=None):
+        """
+        annual_cost with overridden PUE and rates (e.g. Monte Carlo draws or site values)
+        applied as multipliers on the hourly model relative to the config's values.
+        """
+        cost = self.annual_cost(dc_size_mw, utilization, use_clean_power)
+        if pue is not None:
+            cost = cost * (pue / self.base_pue)
+        if conventional is not None or renewable is not None:
+            scale = {}
+            for source, rate in zip(SOURCES, (conventional, renewable)):
+                base = self.base_rates[source]
+                scale[source] = 1.0 if rate is None or base <= 0 else rate / base
+            cost = cost * np.where(use_clean_power, scale['renewable'], scale['conventional'])
+        return cost
+
+    def hourly(self, dc_size_mw, utilization, use_clean_power):
+        """The hourly breakdown of one scenario: IT and facility kW, PUE, $/kWh and cost."""
+        source = 'renewable' if use_clean_power else 'conventional'
+        it_kw = dc_size_mw * 1000.0 * np.minimum(utilization * self.load, 1.0)
+        facility_kw = it_kw * (1.0 + self.cooling) + dc_size_mw * 1000.0 * self.fixed_overhead
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pue = np.where(it_kw > 0, facility_kw / it_kw, np.nan)
+        price = self.prices[source]
+        return {'it_kw': it_kw, 'facility_kw': facility_kw, 'pue': pue, 'price_per_kwh': price, 'cost': facility_kw * price}
+
+    def summary(self, dc_size_mw, utilization, use_clean_power):
+        """Annual totals of one scenario and the flat-formula cost it replaces."""
+        hourly = self.hourly(dc_size_mw, utilization, use_clean_power)
+        source = 'renewable' if use_clean_power else 'conventional'
+        facility_kwh = hourly['facility_kw'].sum()
+        it_kwh = hourly['it_kw'].sum()
+        return {
+            'annual_cost': float(self.annual_cost(dc_size_mw, utilization, use_clean_power)),
+            'flat_formula_cost': dc_size_mw * utilization * self.base_pue * HOURS_PER_YEAR * 1000 * self.base_rates[source],
+            'annual_facility_mwh': float(facility_kwh / 1000 / self.years),
+            'average_pue': float(facility_kwh / it_kwh) if it_kwh > 0 else float('nan'),
+            'effective_rate_per_kwh': float(hourly['cost'].sum() / facility_kwh) if facility_kwh > 0 else float('nan'),
+            'clipped_hours_share': float((utilization * self.load > 1.0).mean()),
+        }
+
+
+@lru_cache(maxsize=8)
+def _model(spec, pue, rates, stamps):
+    return EnergyModel(spec, pue, rates)
+
+
+def energy_model(config):
+    """The config's EnergyModel, or None when operating_expenses.energy is not set."""
+    op_conf = config.operating_expenses
+    if op_conf.energy is None:
+        return None
+    stamps = tuple(os.stat(path).st_mtime_ns for path in op_conf.energy.files())
+    return _model(op_conf.energy, op_conf.pue, op_conf.power_cost_per_kwh, stamps)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Annual energy cost of a site under the hourly energy model.")
+    parser.add_argument("--dc-size", type=float, default=100.0, help="IT capacity (MW)")
+    parser.add_argument("--utilization", type=float, default=70.0, help="average utilization (%%)")
+    parser.add_argument("--renewable", action="store_true", help="price renewable instead of conventional power")
+    parser.add_argument("--hourly", default=None, help="write the hourly breakdown to this CSV")
+    parser.add_argument("--config", default=None)
+    args = parser.parse_args(argv)
+
+    model = energy_model(resolve_config(args.config))
+    if model is None:
+        print("operating_expenses.energy is not configured: power is the flat rate x constant PUE", file=sys.stderr)
+        return 1
+    utilization = args.utilization / 100.0
+    for name, value in model.summary(args.dc_size, utilization, args.renewable).items():
+        print(f"{name:>24}: {value:,.4f}")
+    if args.hourly:
+        hourly = model.hourly(args.dc_size, utilization, args.renewable)
+        with open(args.hourly, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["hour", *hourly])
+            writer.writerows(zip(range(model.hours), *(np.round(values, 6).tolist() for values in hourly.values())))
+        print(f"{model.hours:,} hours written to {args.hourly}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+# fleet_optimizer.py (v1.0 - GPU Fleet Optimizer)
+# Chooses integer GPU counts per SKU (config hardware.skus) that maximize serviced tokens or
+# operating profit within the IT budget (it_budget_per_mw x dc_size_mw) and the site's IT
+# power envelope, and traces the throughput vs. capex Pareto frontier.
+#
+# Both objectives are linear in the counts, so this is an integer program with two resource
+# rows. Its LP relaxation has an optimal vertex using at most two SKUs; every such vertex is
+# evaluated at once with NumPy, and the best few are rounded into integer candidates that are
+# greedily topped up with leftover budget/power. With scipy installed, scipy.optimize.milp
+# solves the integer program exactly instead.
+#
+#   python fleet_optimizer.py [--dc-size 100] [--objective tokens|profit] [--frontier 20]
+import argparse
+import sys
+
+import numpy as np
+
+from config_loader import resolve_config
+from energy import energy_model
+
+HOURS_PER_YEAR = 8760
+OBJECTIVES = ("tokens", "profit")
+METHODS = ("auto", "milp", "heuristic")
+# Rounding search: LP vertices kept per budget level, and how far each is stepped down.
+CANDIDATE_VERTICES = 8
+ROUNDING_STEPS = 16
+
+
+def _milp():
+    try:
+        from scipy.optimize import Bounds, LinearConstraint, milp
+    except ImportError:
+        return None
+    return Bounds, LinearConstraint, milp
+
+
+def _fit(budget, power, costs, powers):
+    """Most units of each SKU that fit in the remaining budget and power (broadcasting)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        by_power = np.where(powers > 0, power / np.where(powers > 0, powers, 1.0), np.inf)
+    return np.floor(np.maximum(np.minimum(budget / costs, by_power), 0.0))
+
+
+def lp_vertices(values, costs, powers, budget, power_limit):
+    """
+    Basic solutions of  max values.x  s.t.  costs.x <= budget, powers.x <= power_limit, x >= 0.
+
+    `budget` and `power_limit` are (levels,) arrays. Returns (i, j, x_i, x_j, value), each
+    (levels, vertices): single-SKU vertices have i == j and x_j == 0, two-SKU vertices make
+    both constraints tight. Infeasible vertices have value -inf.
+    """
+    k = len(values)
+    budget = np.asarray(budget, dtype=float)[:, None]
+    power_limit = np.asarray(power_limit, dtype=float)[:, None]
+
+    single = np.arange(k)
+    x_single = np.minimum(budget / costs, np.where(powers > 0, power_limit / np.where(powers > 0, powers, 1.0), np.inf))
+
+    i, j = np.triu_indices(k, 1)
+    det = costs[i] * powers[j] - costs[j] * powers[i]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_i = (budget * powers[j] - costs[j] * power_limit) / det
+        x_j = (costs[i] * power_limit - budget * powers[i]) / det
+        feasible = (det != 0) & (x_i >= 0) & (x_j >= 0)
+        pair_value = np.where(feasible, values[i] * x_i + values[j] * x_j, -np.inf)
+
+    levels = budget.shape[0]
+    return (
+        np.concatenate([np.broadcast_to(single, (levels, k)), np.broadcast_to(i, (levels, len(i)))], axis=1),
+        np.concatenate([np.broadcast_to(single, (levels, k)), np.broadcast_to(j, (levels, len(j)))], axis=1),
+        np.concatenate([x_single, np.where(feasible, x_i, 0.0)], axis=1),
+        np.concatenate([np.zeros((levels, k)), np.where(feasible, x_j, 0.0)], axis=1),
+        np.concatenate([values * x_single, pair_value], axis=1),
+    )
+
+
+def lp_bound(values, costs, powers, budget, power_limit):
+    """The LP relaxation optimum per (budget, power_limit) level, an upper bound on the integer optimum."""
+    budget = np.asarray(budget, dtype=float)
+    power_limit = np.broadcast_to(np.asarray(power_limit, dtype=float), budget.shape)
+    return np.maximum(lp_vertices(values, costs, powers, budget, power_limit)[-1].max(axis=1), 0.0)
+
+
+def solve_heuristic(values, costs, powers, budget, power_limit):
+    """
+    Integer counts for every (budget, power_limit) level via LP-vertex rounding. At fleet
+    scale (thousands of GPUs) the result is within a few units of the integer optimum.
+
+    Returns (counts (levels, skus), lp_bound (levels,)); lp_bound is the relaxation optimum,
+    an upper bound on the integer optimum.
+    """
+    budget = np.asarray(budget, dtype=float)
+    power_limit = np.broadcast_to(np.asarray(power_limit, dtype=float), budget.shape)
+    levels, k = len(budget), len(values)
+    vi, vj, xi, xj, value = lp_vertices(values, costs, powers, budget, power_limit)
+    lp_bound = np.maximum(value.max(axis=1), 0.0)
+
+    # --- Candidates: the best vertices, each stepped down 0..ROUNDING_STEPS-1 units on one SKU ---
+    top = np.argsort(-value, axis=1)[:, :CANDIDATE_VERTICES]
+    take = lambda a: np.take_along_axis(a, top, axis=1)[:, :, None]
+    vi, vj, xi, xj = take(vi), take(vj), take(xi), take(xj)
+    steps = np.arange(ROUNDING_STEPS)
+    b, p = budget[:, None, None], power_limit[:, None, None]
+
+    n_i = np.maximum(np.floor(xi) - steps, 0.0)  # (levels, vertices, steps): step x_i down, refill j
+    n_j = _fit(b - n_i * costs[vi], p - n_i * powers[vi], costs[vj], powers[vj])
+    m_j = np.maximum(np.floor(xj) - steps, 0.0)  # or step x_j down, refill i
+    m_i = _fit(b - m_j * costs[vj], p - m_j * powers[vj], costs[vi], powers[vi])
+
+    sku_a = np.broadcast_to(vi, n_i.shape)
+    sku_b = np.broadcast_to(vj, n_i.shape)
+    flat = lambda *blocks: np.concatenate([block.reshape(levels, -1) for block in blocks], axis=1)
+    rows = np.arange(levels)[:, None]
+    cols = np.arange(2 * n_i[0].size)[None, :]
+    counts = np.zeros((levels, cols.shape[1], k))
+    np.add.at(counts, (rows, cols, flat(sku_a, sku_a)), flat(n_i, m_i))  # a single-SKU vertex has
+    np.add.at(counts, (rows, cols, flat(sku_b, sku_b)), flat(n_j, m_j))  # sku_a == sku_b: add.at sums
+
+    # --- Greedy top-up: twice add as many units as fit of the SKU adding the most value ---
+    for _ in range(2):
+        fit = _fit((budget[:, None] - counts @ costs)[..., None], (power_limit[:, None] - counts @ powers)[..., None], costs, powers)
+        best = np.argmax(fit * values, axis=2)
+        counts[rows, cols, best] += np.take_along_axis(fit, best[..., None], axis=2)[..., 0]
+
+    best = np.argmax(counts @ values, axis=1)
+    return counts[np.arange(levels), best], lp_bound
+
+
+def solve_milp(values, costs, powers, budget, power_limit):
+    """Exact integer counts per level with scipy.optimize.milp (None without scipy)."""
+    solver = _milp()
+    if solver is None:
+        return None
+    Bounds, LinearConstraint, milp = solver
+    budget = np.asarray(budget, dtype=float)
+    power_limit = np.broadcast_to(np.asarray(power_limit, dtype=float), budget.shape)
+    rows = np.vstack([costs, powers])
+    counts = np.zeros((len(budget), len(values)))
+    for level, limits in enumerate(zip(budget, power_limit)):
+        result = milp(
+            -values, integrality=np.ones(len(values)), bounds=Bounds(0, np.inf),
+            constraints=LinearConstraint(rows, -np.inf, np.array(limits)),
+        )
+        if result.x is None:
+            raise RuntimeError(f"milp failed at budget {limits[0]:,.0f}: {result.message}")
+        counts[level] = np.round(result.x)
+    return counts
+
+
+class FleetOptimizer:
+    """
+    Per-GPU economics of every SKU in the catalog for one site.
+
+        optimizer = FleetOptimizer(dc_size_mw=100, utilization_rate=60)
+        plan = optimizer.optimize("profit")      # {'counts': {sku: n}, 'capex': ..., ...}
+        frontier = optimizer.frontier(points=50)  # throughput vs. capex, non-dominated plans
+    """
+
+    def __init__(self, dc_size_mw=100.0, use_clean_power=False, apply_mirrormind=False, utilization_rate=60.0,
+                 market_price_per_m_tokens=None, config=None, power_limit_kw=None):
+        self.config = config = resolve_config(config)
+        inv_conf = config.investment
+        op_conf = config.operating_expenses
+        catalog = [(name, spec) for name, spec in config.hardware.catalog() if spec.cost > 0]
+        if not catalog:
+            raise ValueError("the hardware catalog has no SKU with a cost > 0")
+        if market_price_per_m_tokens is None:
+            market_price_per_m_tokens = config.model_and_market.market_price_per_million_tokens
+
+        self.skus = tuple(name for name, _ in catalog)
+        self.costs = np.array([spec.cost for _, spec in catalog])
+        self.powers = np.array([spec.power_kw for _, spec in catalog])
+        self.budget = inv_conf.it_budget_per_mw * dc_size_mw
+        # dc_size_mw is the IT load the site is built for (PUE applies on top, as in the calculator).
+        self.power_limit_kw = dc_size_mw * 1000.0 if power_limit_kw is None else power_limit_kw
+
+        # --- Per-GPU annual contribution (both objectives are linear in the counts) ---
+        arch_efficiency = config.model_and_market.intelligent_arch_efficiency if apply_mirrormind else 1.0
+        m_tokens_per_hour = np.array([spec.m_tokens_per_hour for _, spec in catalog])
+        self.tokens = m_tokens_per_hour * 1e6 * HOURS_PER_YEAR * arch_efficiency * (utilization_rate / 100.0)
+        revenue = self.tokens / 1e6 * market_price_per_m_tokens * config.total_paid_token_usage_ratio
+        power_rate = op_conf.power_cost_per_kwh.renewable if use_clean_power else op_conf.power_cost_per_kwh.conventional
+        it_energy_rate = op_conf.pue * power_rate  # facility $ per kWh of IT energy
+        site_power_cost = dc_size_mw * (utilization_rate / 100.0) * op_conf.pue * HOURS_PER_YEAR * 1000 * power_rate
+        energy = energy_model(config)
+        if energy is not None:
+            # The hourly model's average over the site's load, so per-GPU power cost stays linear.
+            site_power_cost = energy.annual_cost(dc_size_mw, utilization_rate / 100.0, use_clean_power)
+            it_kwh = dc_size_mw * (utilization_rate / 100.0) * HOURS_PER_YEAR * 1000
+            it_energy_rate = site_power_cost / it_kwh if it_kwh > 0 else it_energy_rate
+        power_cost = self.powers * (utilization_rate / 100.0) * HOURS_PER_YEAR * it_energy_rate
+        depreciation = self.costs / inv_conf.amortization_years.it_hardware
+        self.margins = revenue * (1 - op_conf.sgna_as_percent_of_revenue / 100.0) - power_cost - depreciation
+
+        # Costs that do not depend on the fleet. Without power figures the calculator's
+        # site-level power cost applies unchanged.
+        site_power = 0.0 if self.powers.any() else site_power_cost
+        self.fixed_costs = (
+            inv_conf.dc_capex_per_mw * dc_size_mw / inv_conf.amortization_years.datacenter
+            + (op_conf.maintenance_and_cooling_per_mw + op_conf.personnel_and_other_per_mw) * dc_size_mw
+            + config.rd_amortization
+            + site_power
+        )
+
+    def _objective_values(self, objective):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"objective must be one of {OBJECTIVES}, got {objective!r}")
+        values = self.tokens if objective == "tokens" else self.margins
+        return np.maximum(values, 0.0)  # a SKU that loses money is never bought
+
+    def _solve(self, values, budgets, method):
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+        counts = solve_milp(values, self.costs, self.powers, budgets, self.power_limit_kw) if method != "heuristic" else None
+        if counts is not None:
+            return counts, lp_bound(values, self.costs, self.powers, budgets, self.power_limit_kw), "milp"
+        if method == "milp":
+            raise ImportError("method='milp' needs scipy: pip install scipy", name="scipy")
+        # Without scipy, "auto" falls back to the heuristic, which computes the bound on the way.
+        return (*solve_heuristic(values, self.costs, self.powers, budgets, self.power_limit_kw), "heuristic")
+
+    def evaluate(self, counts):
+        """Capex, IT power, serviced tokens and operating profit of (..., skus) count arrays."""
+        counts = np.asarray(counts, dtype=float)
+        return {
+            "capex": counts @ self.costs,
+            "power_kw": counts @ self.powers,
+            "serviced_tokens": counts @ self.tokens,
+            "operating_profit": counts @ self.margins - self.fixed_costs,
+        }
+
+    def optimize(self, objective="tokens", budget=None, method="auto"):
+        """The best integer fleet for `objective` within `budget` (default: the site's IT budget)."""
+        values = self._objective_values(objective)
+        counts, lp_bound, used = self._solve(values, np.array([self.budget if budget is None else budget]), method)
+        counts = counts[0]
+        achieved = float(counts @ values)
+        return {
+            "objective": objective,
+            "method": used,
+            "counts": {sku: int(n) for sku, n in zip(self.skus, counts) if n > 0},
+            **{key: float(value) for key, value in self.evaluate(counts).items()},
+            # Relative distance to the LP relaxation; the integer optimum lies in between.
+            "optimality_gap": float((lp_bound[0] - achieved) / lp_bound[0]) if lp_bound[0] > 0 else 0.0,
+        }
+
+    def frontier(self, points=50, method="auto"):
+        """
+        Non-dominated (capex, serviced tokens) fleets: the max-throughput fleet at `points`
+        budgets up to the site's IT budget, keeping only those that add throughput.
+        """
+        budgets = np.linspace(self.budget / points, self.budget, points)
+        counts, _, used = self._solve(self._objective_values("tokens"), budgets, method)
+        metrics = self.evaluate(counts)
+        order = np.argsort(metrics["capex"], kind="stable")
+        tokens = metrics["serviced_tokens"][order]
+        keep = order[tokens > np.maximum.accumulate(np.concatenate([[-np.inf], tokens[:-1]]))]
+        return {
+            "method": used,
+            "skus": self.skus,
+            "counts": counts[keep].astype(np.int64),
+            **{key: value[keep] for key, value in metrics.items()},
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Optimize the GPU SKU mix of a site.")
+    parser.add_argument("--dc-size", type=float, default=100.0, help="site size in MW")
+    parser.add_argument("--utilization", type=float, default=60.0, help="utilization rate in %%")
+    parser.add_argument("--renewable", action="store_true")
+    parser.add_argument("--mirrormind", action="store_true")
+    parser.add_argument("--price", type=float, default=None, help="market price per M tokens")
+    parser.add_argument("--objective", choices=OBJECTIVES, default="tokens")
+    parser.add_argument("--method", choices=METHODS, default="auto")
+    parser.add_argument("--frontier", type=int, default=0, metavar="POINTS", help="also print the Pareto frontier")
+    parser.add_argument("--config", default=None)
+    args = parser.parse_args(argv)
+
+    optimizer = FleetOptimizer(args.dc_size, args.renewable, args.mirrormind, args.utilization, args.price, config=args.config)
+    plan = optimizer.optimize(args.objective, method=args.method)
+    print(f"{args.objective} objective ({plan['method']}, within {plan['optimality_gap']:.3%} of the LP bound)")
+    for sku, n in plan["counts"].items():
+        print(f"  {sku:<24}{n:>10,}")
+    print(f"  capex ${plan['capex']:,.0f} of ${optimizer.budget:,.0f}; IT power {plan['power_kw'] / 1e3:,.1f} of {optimizer.power_limit_kw / 1e3:,.1f} MW")
+    print(f"  serviced tokens {plan['serviced_tokens'] / 1e12:,.2f}T/yr; operating profit ${plan['operating_profit']:,.0f}")
+
+    if args.frontier:
+        frontier = optimizer.frontier(args.frontier, method=args.method)
+        print(f"\nPareto frontier ({len(frontier['capex'])} fleets)")
+        print(f"{'capex':>18}{'tokens/yr':>14}{'IT MW':>9}  mix")
+        for capex, tokens, power, counts in zip(frontier["capex"], frontier["serviced_tokens"], frontier["power_kw"], frontier["counts"]):
+            mix = ", ".join(f"{sku}:{n:,}" for sku, n in zip(frontier["skus"], counts) if n)
+            print(f"{capex:>18,.0f}{tokens / 1e12:>13,.2f}T{power / 1e3:>9,.1f}  {mix}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
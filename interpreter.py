@@ -1,74 +1,157 @@
 # interpreter.py
 # 시뮬레이션 결과를 분석하고, 서술형 해설과 전략적 제언을 생성합니다.
+# 문구는 언어마다 한 번만 조립(NarrativeTemplate)하고, 시나리오마다 숫자만 채워 넣습니다.
+from functools import lru_cache
+
+from localization import template
+
+# 벤치마크 전략: 옵션 키 -> (고성능 GPU 예산 비율 %, 지능형 아키텍처 적용 여부)
+BENCHMARK_STRATEGIES = {
+    'option_1': (100, False),
+    'option_2': (0, False),
+    'option_3': (100, True),
+    'option_4': (0, True),
+}
+# 핵심 동인 해설에 인용하는 벤치마크: 아키텍처 적용 여부 -> (옵션 키, 문구 필드명)
+_DRIVER_BENCHMARK = {True: ('option_3', 'option_3_cost'), False: ('option_1', 'option_1_cost')}
+
+
+def _hw_strategy_key(hw_ratio):
+    if hw_ratio > 80:
+        return 'hw_strategy_high'
+    if hw_ratio < 20:
+        return 'hw_strategy_low'
+    return 'hw_strategy_hybrid'
+
+
+def _rec_key(apply_mm, hw_ratio):
+    if not apply_mm:
+        return 'rec_no_mm'
+    if hw_ratio == 100:
+        return 'rec_mm_high'
+    if hw_ratio == 0:
+        return 'rec_mm_low'
+    return 'rec_mm_hybrid'
+
+
+class NarrativeTemplate:
+    """
+    한 언어의 리포트 문구를 미리 조립해 둔 것. 분기마다 고정된 문단은 완성된 문자열로,
+    숫자가 들어가는 문장은 남은 필드만 채우면 되는 템플릿으로 보관합니다.
+
+    Args:
+        t (function): 키를 받아 현재 언어의 문자열을 반환하는 함수.
+    """
+
+    def __init__(self, t):
+        self.head = f"### {t('narrative_title')}\n\n**{t('your_choice_title')}**\n👉 "
+        # 선택 요약: (아키텍처 적용, 하드웨어 전략)마다 문장을 채우고 투자액 자리만 남깁니다.
+        self.choice = {
+            (apply_mm, hw_key): t('your_choice_text').format(
+                apply_mm_text=t('applied') if apply_mm else t('not_applied'),
+                hw_strategy=t(hw_key),
+                investment_per_mw='{investment_per_mw}',
+            ) + "\n\n"
+            for apply_mm in (True, False)
+            for hw_key in ('hw_strategy_high', 'hw_strategy_low', 'hw_strategy_hybrid')
+        }
+        self.driver = {
+            True: f"**{t('key_driver_title')}**\n✅ **{t('driver_mm_on_title')}** {t('driver_mm_on_text')}\n",
+            False: f"**{t('key_driver_title')}**\n⚠️ **{t('driver_mm_off_title')}** {t('driver_mm_off_text')}\n",
+        }
+        self.driver_subtext = {True: t('driver_mm_on_subtext'), False: t('driver_mm_off_subtext')}
+        self.viability = f"**{t('viability_title')}**\n📈 " + t('viability_text')
+        icons = {'rec_mm_high': '👍', 'rec_mm_low': '💡', 'rec_mm_hybrid': '🎯', 'rec_no_mm': '🔥'}
+        closing = f"   - {t('viability_recommendation')}\n"
+        self.recommendation = {
+            key: f"\n\n**{t('recommendation_title')}**\n{icon} **{t(key + '_title')}** {t(key + '_text')}\n{closing}"
+            for key, icon in icons.items()
+        }
+        # 레거시 DataFrame 벤치마크의 전략명 -> 옵션 키
+        self.option_names = {t(f'{option}_name'): option for option in BENCHMARK_STRATEGIES}
+        self.strategy_columns = (t('strategy_col_1'), t('strategy_col_3'))
+
+    def render(self, apply_mm, hw_ratio, investment_per_mw, target_irr, viability, benchmark=None):
+        """
+        Args:
+            apply_mm (bool): 지능형 아키텍처 적용 여부.
+            hw_ratio (float): 고성능 GPU 예산 비율 (%).
+            investment_per_mw (float): MW당 투자액 ($M).
+            target_irr (float): 목표 수익률 (%).
+            viability (dict): required_annual_revenue, price_per_million_tokens, monthly_fee_per_user.
+            benchmark (dict, optional): 옵션 키 -> 100만 토큰당 원가 문자열.
+
+        Returns:
+            str: Markdown 형식의 리포트.
+        """
+        apply_mm = bool(apply_mm)
+        investment = f'${investment_per_mw:,.2f} M'
+        parts = [
+            self.head,
+            self.choice[apply_mm, _hw_strategy_key(hw_ratio)].format(investment_per_mw=investment),
+            self.driver[apply_mm],
+        ]
+        option, field = _DRIVER_BENCHMARK[apply_mm]
+        cost = (benchmark or {}).get(option)
+        if cost is not None:
+            parts += ["   - ", self.driver_subtext[apply_mm].format(**{field: cost}), "\n\n"]
+        parts.append(self.viability.format(
+            investment_per_mw=investment,
+            target_irr=target_irr,
+            annual_revenue=viability.get('required_annual_revenue', 0),
+            token_price=viability.get('price_per_million_tokens', 0),
+            user_fee=viability.get('monthly_fee_per_user', 0),
+        ))
+        parts.append(self.recommendation[_rec_key(apply_mm, hw_ratio)])
+        return ''.join(parts)
+
+    def benchmark_index(self, benchmark_df):
+        """레거시 벤치마크 DataFrame(전략명, ..., 원가 열)을 옵션 키 -> 원가 dict로 한 번에 변환합니다."""
+        if benchmark_df is None:
+            return {}
+        if isinstance(benchmark_df, dict):
+            return benchmark_df
+        name_col, cost_col = self.strategy_columns
+        if name_col not in benchmark_df or cost_col not in benchmark_df:
+            return {}
+        return {
+            self.option_names[name]: cost
+            for name, cost in zip(benchmark_df[name_col], benchmark_df[cost_col])
+            if name in self.option_names
+        }
+
+
+@lru_cache(maxsize=None)
+def narrative_template(lang):
+    """언어별로 한 번만 만들어 재사용하는 NarrativeTemplate."""
+    return NarrativeTemplate(lambda key: template(key, lang))
+
 
 def generate_narrative(user_inputs, user_summary, benchmark_df, t):
     """
     사용자의 선택과 결과 데이터를 바탕으로 동적인 해설을 생성합니다.
-    
+
     Args:
         user_inputs (dict): 사용자가 사이드바에서 선택한 모든 입력값.
         user_summary (dict): 사용자의 시나리오에 대한 계산 결과 요약.
-        benchmark_df (pd.DataFrame): 4가지 핵심 전략에 대한 벤치마크 데이터.
+        benchmark_df (pd.DataFrame | dict): 4가지 핵심 전략에 대한 벤치마크 데이터
+            (또는 옵션 키 -> 100만 토큰당 원가 dict).
         t (function): 현재 선택된 언어에 맞는 문자열을 반환하는 함수.
 
     Returns:
         str: Markdown 형식의 동적 분석 리포트.
     """
-    # --- 1. 입력 변수 추출 ---
-    apply_mm = user_inputs.get('apply_mirrormind', False)
-    hw_ratio = user_inputs.get('high_perf_hw_ratio', 100)
-    target_irr = user_inputs.get('econ_assumptions', {}).get('target_irr', 0.08) * 100
-    user_investment_per_mw = user_summary.get('investment_per_mw', 0)
-    viability = user_summary.get('viability', {})
-
-    # --- 2. 사용자 전략 정의 ---
-    if hw_ratio > 80:
-        hw_strategy = t('hw_strategy_high')
-    elif hw_ratio < 20:
-        hw_strategy = t('hw_strategy_low')
-    else:
-        hw_strategy = t('hw_strategy_hybrid')
-
-    # --- 3. 리포트 본문 생성 시작 ---
-    narrative = f"### {t('narrative_title')}\n\n"
-    
-    # --- 3.1. 선택 전략 요약 ---
-    narrative += f"**{t('your_choice_title')}**\n"
-    narrative += f"👉 {t('your_choice_text').format(apply_mm_text=t('applied') if apply_mm else t('not_applied'), hw_strategy=hw_strategy, investment_per_mw=f'${user_investment_per_mw:,.2f} M')}\n\n"
-
-    # --- 3.2. 핵심 동인 분석 ---
-    narrative += f"**{t('key_driver_title')}**\n"
-    if apply_mm:
-        narrative += f"✅ **{t('driver_mm_on_title')}** {t('driver_mm_on_text')}\n"
-        try:
-            option_3_cost_str = benchmark_df[benchmark_df[t('strategy_col_1')] == t('option_3_name')][t('strategy_col_3')].iloc[0]
-            narrative += f"   - {t('driver_mm_on_subtext').format(option_3_cost=option_3_cost_str)}\n\n"
-        except (IndexError, KeyError):
-            pass # 벤치마크 데이터가 없는 경우를 대비
-    else:
-        narrative += f"⚠️ **{t('driver_mm_off_title')}** {t('driver_mm_off_text')}\n"
-        try:
-            option_1_cost_str = benchmark_df[benchmark_df[t('strategy_col_1')] == t('option_1_name')][t('strategy_col_3')].iloc[0]
-            narrative += f"   - {t('driver_mm_off_subtext').format(option_1_cost=option_1_cost_str)}\n\n"
-        except (IndexError, KeyError):
-            pass
-
-    # --- 3.3. 사업 타당성 평가 ---
-    narrative += f"**{t('viability_title')}**\n"
-    narrative += f"📈 {t('viability_text').format(investment_per_mw=f'${user_investment_per_mw:,.2f} M', target_irr=target_irr, annual_revenue=viability.get('required_annual_revenue', 0), token_price=viability.get('price_per_million_tokens', 0), user_fee=viability.get('monthly_fee_per_user', 0))}\n\n"
-
-    # --- 3.4. 전략적 제언 ---
-    narrative += f"**{t('recommendation_title')}**\n"
-    if apply_mm:
-        if hw_ratio == 100:
-            narrative += f"👍 **{t('rec_mm_high_title')}** {t('rec_mm_high_text')}\n"
-        elif hw_ratio == 0:
-            narrative += f"💡 **{t('rec_mm_low_title')}** {t('rec_mm_low_text')}\n"
-        else:
-            narrative += f"🎯 **{t('rec_mm_hybrid_title')}** {t('rec_mm_hybrid_text')}\n"
-    else:
-        narrative += f"🔥 **{t('rec_no_mm_title')}** {t('rec_no_mm_text')}\n"
-        
-    narrative += f"   - {t('viability_recommendation')}\n"
-
-    return narrative
+    narrative = _template_for(t)
+    return narrative.render(
+        apply_mm=user_inputs.get('apply_mirrormind', False),
+        hw_ratio=user_inputs.get('high_perf_hw_ratio', 100),
+        investment_per_mw=user_summary.get('investment_per_mw', 0),
+        target_irr=user_inputs.get('econ_assumptions', {}).get('target_irr', 0.08) * 100,
+        viability=user_summary.get('viability', {}),
+        benchmark=narrative.benchmark_index(benchmark_df),
+    )
+
+
+@lru_cache(maxsize=16)
+def _template_for(t):
+    return NarrativeTemplate(t)
@@ -0,0 +1,347 @@
+# inverse_solver.py (v1.0 - Inverse Solver)
+# Solves the model backwards: the minimum token price, utilization or fixed tier fee(s), or
+# the maximum DC capex per MW, at which a scenario meets a payback, IRR or margin target.
+# Whole scenario grids are solved at once by batched bracketed root-finding (Illinois false
+# position): every iteration is one batch evaluation of the scenarios still bracketing a root.
+#
+# Instead of a single achievable flag, every scenario gets a feasibility region over the
+# unknown's bracket: 'above' / 'below' (the target is met above / below the boundary value),
+# 'always' (met across the whole bracket) or 'never'.
+#
+#   python inverse_solver.py price --target payback --value 5 [--dc-size 100] [--utilization 70]
+#   python inverse_solver.py tier_fee --tier premium --target irr --value 0.12 --grid utilization=40:100:7
+import argparse
+import sys
+
+import numpy as np
+
+from calculator import SCENARIO_COLUMNS, _scenario_arrays, calculate_core_business_case_batch
+from config_loader import resolve_config
+from what_if_calculator import analyze_fixed_fee_batch
+
+# Each target is met when its slack g >= 0, on the model's steady-state annual figures:
+#   payback  cash_flow - total_investment / years             (cash flow = operating profit + D&A)
+#   irr      cash_flow * annuity(rate, finance.horizon_years) - total_investment
+#   margin   operating_profit - margin * revenue
+TARGETS = ('payback', 'irr', 'margin')
+DEFAULT_PAYBACK_YEARS = 5  # the recommended fees' payback target in calculator.py
+REGIONS = ('always', 'never', 'above', 'below')
+
+# Unknown -> (scenario input or config override it replaces, sense, default bracket).
+# 'min' unknowns report the lowest value meeting the target, 'max' unknowns the highest.
+UNKNOWNS = {
+    'price': ('market_price_per_m_tokens', 'min', (0.0, 1000.0)),
+    'utilization': ('utilization_rate', 'min', (0.0, 100.0)),
+    'dc_capex': ('investment.dc_capex_per_mw', 'max', None),  # (0, 20 x the config value)
+    'tier_fee': ('tier_fee', 'min', (0.0, 100_000.0)),        # one tier's monthly fee
+    'tier_fees': ('tier_fees', 'min', (0.0, 1000.0)),         # scale on every paid tier's usage revenue
+}
+
+
+def annuity_factor(rate, years):
+    """Present value of 1 per year for `years` years at `rate` (broadcasts)."""
+    rate = np.asarray(rate, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = (1.0 - (1.0 + rate) ** -years) / rate
+    return np.where(rate == 0, float(years), factor)
+
+
+def _slack(target, target_value, pnl, total_investment, horizon_years):
+    """g >= 0 where the target is met; `target_value` broadcasts against the rows."""
+    cash_flow = pnl['operating_profit'] + pnl['d_and_a']
+    if target == 'payback':
+        return cash_flow - total_investment / target_value
+    if target == 'irr':
+        return cash_flow * annuity_factor(target_value, horizon_years) - total_investment
+    return pnl['operating_profit'] - target_value * pnl['revenue']
+
+
+def bracketed_root(f, low, high, xtol=1e-9, max_iter=100):
+    """
+    Roots of g = f(x, rows) for every row bracketed by [low, high] (g(low) and g(high) of
+    opposite sign), by the Illinois variant of false position. `f` evaluates only the rows
+    it is given, so converged rows drop out of later batch evaluations.
+
+    Returns (root, g(low), g(high), iterations); rows without a sign change get NaN.
+    """
+    low = np.array(low, dtype=float)
+    high = np.array(high, dtype=float)
+    n = low.size
+    rows = np.arange(n)
+    g_low = f(low, rows)
+    g_high = f(high, rows)
+    root = np.full(n, np.nan)
+    iterations = np.zeros(n, dtype=int)
+    root[g_low == 0] = low[g_low == 0]
+    root[g_high == 0] = high[g_high == 0]
+
+    active = rows[(np.sign(g_low) * np.sign(g_high) < 0)]
+    a, b = low[active], high[active]
+    ga, gb = g_low[active], g_high[active]
+    side = np.zeros(active.size, dtype=int)  # which end was kept last: -1 low, +1 high
+    for iteration in range(1, max_iter + 1):
+        if active.size == 0:
+            break
+        x = b - gb * (b - a) / (gb - ga)
+        gx = f(x, active)
+        iterations[active] = iteration
+        done = (gx == 0) | (np.abs(b - a) <= xtol * np.maximum(1.0, np.abs(x)))
+        root[active[done]] = x[done]
+
+        replace_low = np.sign(gx) == np.sign(ga)
+        # Illinois: halve the value at the end that stays put twice in a row.
+        ga = np.where(replace_low, gx, np.where(side == -1, ga * 0.5, ga))
+        a = np.where(replace_low, x, a)
+        gb = np.where(replace_low, np.where(side == 1, gb * 0.5, gb), gx)
+        b = np.where(replace_low, b, x)
+        side = np.where(replace_low, 1, -1)
+
+        keep = ~done
+        active, a, b, ga, gb, side = active[keep], a[keep], b[keep], ga[keep], gb[keep], side[keep]
+    if active.size:
+        root[active] = b - gb * (b - a) / (gb - ga)
+    return root, g_low, g_high, iterations
+
+
+def _resolve_tier(config, tier):
+    """Position and key of `tier` (a tier name or tier_name_key) in the config's tier table."""
+    tiers = config.tier_table
+    name = tier[len('tier_'):] if tier and tier.startswith('tier_') else tier
+    j = tiers.index(name)
+    if j is None:
+        raise ValueError(f"Unknown tier {tier!r}; the config defines {list(tiers.names)}")
+    return j, tiers.keys[j]
+
+
+def _take_rows(results, rows):
+    """The pnl and segment sections of batch results, for `rows` only."""
+    segments = results['segment_narratives']
+    return {
+        'pnl_annual': {name: column[rows] for name, column in results['pnl_annual'].items()},
+        'segment_narratives': {
+            name: (values if name == 'tier_name_key' else values[rows]) for name, values in segments.items()
+        },
+    }
+
+
+def solve(
+    unknown,
+    target,
+    target_value=None,
+    dc_size_mw=None,
+    use_clean_power=None,
+    apply_mirrormind=None,
+    high_perf_gpu_ratio=None,
+    utilization_rate=None,
+    market_price_per_m_tokens=None,
+    config=None,
+    overrides=None,
+    bracket=None,
+    tier=None,
+    fees=None,
+    xtol=1e-9,
+    max_iter=100,
+):
+    """
+    Solves every scenario (inputs broadcast as in calculate_core_business_case_batch) for
+    the `unknown` that meets `target`. The scenario input the unknown replaces is ignored.
+
+    Args:
+        unknown (str): One of UNKNOWNS.
+        target (str): 'payback' (years), 'irr' (a rate, e.g. 0.12) or 'margin' (operating
+            margin, e.g. 0.2). The default value is the 5-year payback, the config's
+            discount rate, or break-even.
+        target_value (float | array): The target, per scenario or shared.
+        overrides (dict, optional): Per-scenario config overrides (see OVERRIDABLE_PARAMS).
+        bracket (tuple, optional): (low, high) search range; each end may be per scenario.
+        tier (str): The tier solved for by 'tier_fee' (name or tier_name_key).
+        fees (dict, optional): Fixed monthly fees of the other tiers (by tier_name_key) for
+            'tier_fee'; tiers not listed pay 0.
+
+    Returns:
+        dict: 'value' (the lowest value meeting the target for 'min' unknowns, the highest
+            for 'max' ones; NaN where it is never met), 'region' (one of REGIONS), the root
+            'boundary' (NaN without a crossing), 'feasible_at_low' / 'feasible_at_high',
+            'bracket' and 'iterations'. 'tier_fees' also returns the scenarios x tiers
+            'fees' matrix and 'tier_name_key'.
+    """
+    if unknown not in UNKNOWNS:
+        raise ValueError(f"unknown must be one of {tuple(UNKNOWNS)}, got {unknown!r}")
+    if target not in TARGETS:
+        raise ValueError(f"target must be one of {TARGETS}, got {target!r}")
+    config = resolve_config(config)
+    overrides = dict(overrides or {})
+    replaces, sense, default_bracket = UNKNOWNS[unknown]
+
+    market = config.model_and_market
+    inputs = dict(zip(SCENARIO_COLUMNS, (dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio, utilization_rate, market_price_per_m_tokens)))
+    if replaces in inputs:
+        inputs[replaces] = 0.0  # placeholder; replaced by the trial values
+    if inputs['market_price_per_m_tokens'] is None:
+        inputs['market_price_per_m_tokens'] = market.market_price_per_million_tokens
+    missing = [name for name, value in inputs.items() if value is None]
+    if missing:
+        raise ValueError(f"Missing scenario input(s): {missing}")
+    if target_value is None:
+        target_value = {'payback': DEFAULT_PAYBACK_YEARS, 'irr': config.finance.discount_rate, 'margin': 0.0}[target]
+    # The target may vary per scenario too, so it is broadcast with the inputs.
+    *columns, target_value = np.broadcast_arrays(*_scenario_arrays(*inputs.values()), np.asarray(target_value, dtype=float))
+    n = target_value.size
+    columns = dict(zip(SCENARIO_COLUMNS, columns))
+    overrides = {path: np.broadcast_to(np.asarray(values, dtype=float), (n,)) for path, values in overrides.items()}
+    if target == 'payback' and (target_value <= 0).any():
+        raise ValueError("A payback target must be positive")
+    horizon_years = config.finance.horizon_years
+
+    def core(rows, values=None):
+        """Batch results of `rows`, with the unknown (if it is a model input) set to `values`."""
+        scenario = {name: column[rows] for name, column in columns.items()}
+        row_overrides = {path: column[rows] for path, column in overrides.items()}
+        if replaces in scenario:
+            scenario[replaces] = values
+        elif values is not None:
+            row_overrides[replaces] = values  # a config value, e.g. investment.dc_capex_per_mw
+        return calculate_core_business_case_batch(*scenario.values(), config=config, overrides=row_overrides)
+
+    extra = {}
+    if unknown in ('tier_fee', 'tier_fees'):
+        # Fees do not change the usage-based model, so it is evaluated once.
+        base = core(np.arange(n))
+        if unknown == 'tier_fee':
+            j, key = _resolve_tier(config, tier)
+            fixed = dict(fees or {})
+            fixed.pop(key, None)
+
+            def fee_matrix(x, rows):
+                matrix = analyze_fixed_fee_batch(_take_rows(base, rows), tier_fees=fixed)['segments']['fixed_fee'].copy()
+                matrix[:, j] = x
+                return matrix
+        else:
+            revenue_per_user = base['segment_narratives']['revenue_per_user']
+
+            def fee_matrix(x, rows):
+                return x[:, None] * revenue_per_user[rows]
+
+        def g(x, rows):
+            pnl = analyze_fixed_fee_batch(_take_rows(base, rows), tier_fees=fee_matrix(x, rows))['pnl_what_if']
+            return _slack(target, target_value[rows], pnl, base['total_investment'][rows], horizon_years)
+    else:
+        def g(x, rows):
+            results = core(rows, x)
+            return _slack(target, target_value[rows], results['pnl_annual'], results['total_investment'], horizon_years)
+
+    if bracket is None:
+        bracket = default_bracket or (0.0, 20.0 * config.investment.dc_capex_per_mw)
+    low, high = (np.broadcast_to(np.asarray(end, dtype=float), (n,)) for end in bracket)
+    if (low > high).any():
+        raise ValueError(f"Bracket low end exceeds its high end: {bracket}")
+
+    boundary, g_low, g_high, iterations = bracketed_root(g, low, high, xtol, max_iter)
+    feasible_low = g_low >= 0
+    feasible_high = g_high >= 0
+    region = np.select(
+        [feasible_low & feasible_high, ~feasible_low & ~feasible_high, feasible_high],
+        ['always', 'never', 'above'],
+        'below',
+    )
+    if sense == 'min':
+        value = np.where(feasible_low, low, boundary)
+    else:
+        value = np.where(feasible_high, high, boundary)
+    value = np.where(region == 'never', np.nan, value)
+
+    result = {
+        'unknown': unknown,
+        'target': target,
+        'sense': sense,
+        'value': value,
+        'region': region,
+        'boundary': boundary,
+        'feasible_at_low': feasible_low,
+        'feasible_at_high': feasible_high,
+        'bracket': (low, high),
+        'iterations': iterations,
+    }
+    if unknown == 'tier_fees':
+        result['fees'] = fee_matrix(np.where(np.isnan(value), 0.0, value), np.arange(n))
+        result['fees'][np.isnan(value)] = np.nan
+        result['tier_name_key'] = list(config.tier_table.keys)
+    return result
+
+
+def solve_grid(unknown, target, axes, target_value=None, config=None, **kwargs):
+    """
+    `solve` over the full grid of `axes` ({scenario input or 'target_value': values}).
+    Inputs not on an axis are passed in `kwargs`; array outputs come back in grid shape
+    (one dimension per axis, in order).
+    """
+    axes = {name: np.asarray(values) for name, values in axes.items()}
+    unsupported = set(axes) - set(SCENARIO_COLUMNS) - {'target_value'}
+    if unsupported:
+        raise ValueError(f"Unsupported grid axis/axes: {sorted(unsupported)}")
+    shape = tuple(values.size for values in axes.values())
+    mesh = dict(zip(axes, (grid.ravel() for grid in np.meshgrid(*axes.values(), indexing='ij'))))
+    if 'target_value' in mesh:
+        target_value = mesh.pop('target_value')
+    result = solve(unknown, target, target_value, config=config, **{**kwargs, **mesh})
+
+    n = int(np.prod(shape))
+    for name, value in list(result.items()):
+        if isinstance(value, np.ndarray) and value.shape[:1] == (n,):
+            result[name] = value.reshape(shape + value.shape[1:])
+    result['bracket'] = tuple(end.reshape(shape) for end in result['bracket'])
+    result['axes'] = axes
+    return result
+
+
+def _axis(text):
+    """'name=start:stop:count' or 'name=a,b,c' -> (name, values)."""
+    name, _, spec = text.partition('=')
+    name = {'utilization': 'utilization_rate', 'price': 'market_price_per_m_tokens', 'dc_size': 'dc_size_mw',
+            'hw_ratio': 'high_perf_gpu_ratio', 'target': 'target_value'}.get(name, name)
+    if spec.count(':') == 2:
+        start, stop, count = spec.split(':')
+        return name, np.linspace(float(start), float(stop), int(count))
+    return name, np.array([float(value) for value in spec.split(',')])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inverse solve: the price, utilization, fee(s) or capex that meet a target.")
+    parser.add_argument("unknown", choices=tuple(UNKNOWNS))
+    parser.add_argument("--target", default="payback", choices=TARGETS)
+    parser.add_argument("--value", type=float, default=None, help="payback years, IRR (e.g. 0.12) or operating margin")
+    parser.add_argument("--dc-size", type=float, default=100.0)
+    parser.add_argument("--renewable", action="store_true")
+    parser.add_argument("--no-mirrormind", action="store_true")
+    parser.add_argument("--hw-ratio", type=float, default=100.0)
+    parser.add_argument("--utilization", type=float, default=70.0)
+    parser.add_argument("--price", type=float, default=None)
+    parser.add_argument("--tier", default=None, help="tier solved for by tier_fee")
+    parser.add_argument("--grid", action="append", default=[], help="axis as name=start:stop:count or name=a,b,c (repeatable)")
+    parser.add_argument("--config", default=None)
+    args = parser.parse_args(argv)
+
+    config = resolve_config(args.config)
+    scenario = {
+        'dc_size_mw': args.dc_size,
+        'use_clean_power': args.renewable,
+        'apply_mirrormind': not args.no_mirrormind,
+        'high_perf_gpu_ratio': args.hw_ratio,
+        'utilization_rate': args.utilization,
+        'market_price_per_m_tokens': args.price,
+    }
+    axes = dict(_axis(text) for text in args.grid)
+    for name in axes:
+        scenario.pop(name, None)
+    result = solve_grid(args.unknown, args.target, axes, target_value=args.value, config=config, tier=args.tier, **scenario)
+
+    names = list(axes)
+    print(",".join(names + ["value", "region", "iterations"]))
+    for index in np.ndindex(result['region'].shape):
+        coordinates = [f"{axes[name][i]:g}" for name, i in zip(names, index)]
+        print(",".join(coordinates + [f"{result['value'][index]:.6g}", str(result['region'][index]), str(result['iterations'][index])]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+# jobs.py (v1.0 - Background Jobs)
+# Runs heavy analyses (Monte Carlo, sweeps, fee surfaces) off the Streamlit script thread.
+# One JobManager per server process owns a small thread pool shared by all sessions. A job
+# submitted while an identical one (same function and arguments) is queued or running, or
+# recently finished, attaches to it instead of running twice. Jobs report progress and
+# partial results as they go, and are cancelled cooperatively once the last session
+# waiting for them lets go (a cancel click or a superseding submission).
+import inspect
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from config_loader import SimulatorConfig
+
+# Keyword hooks a job function may declare; each is passed only if the function accepts it.
+HOOKS = ('progress', 'partial', 'cancel_event')
+STATES = ('queued', 'running', 'done', 'failed', 'cancelled')
+
+
+class JobCancelled(Exception):
+    """Raised by Job.result() for a job that was cancelled before it finished."""
+
+
+def job_key(fn, args, kwargs):
+    """A hashable identity for a call: configs by content hash, arrays by their bytes."""
+    return (f"{fn.__module__}.{fn.__qualname__}", _freeze(args), _freeze(kwargs))
+
+
+def _freeze(value):
+    if isinstance(value, SimulatorConfig):
+        return ('config', value.config_hash)
+    if isinstance(value, np.ndarray):
+        return ('array', value.dtype.str, value.shape, value.tobytes())
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class Job:
+    """
+    One submitted computation. The attributes are written by the worker thread and read by
+    page reruns; `snapshot()` returns a consistent copy of them.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, key, name):
+        self.id = f"job-{next(self._ids)}"
+        self.key = key
+        self.name = name
+        self.state = 'queued'
+        self.done = 0
+        self.total = None
+        self.partial = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self._result = None
+        self._finished = threading.Event()
+        self._watchers = 0
+        self._lock = threading.Lock()
+
+    # --- Hooks handed to the job function ---
+    def report_progress(self, done, total=None):
+        with self._lock:
+            self.done = done
+            self.total = total
+
+    def report_partial(self, value):
+        with self._lock:
+            self.partial = value
+
+    # --- Reading ---
+    @property
+    def finished(self):
+        return self._finished.is_set()
+
+    @property
+    def progress(self):
+        """Fraction done (0..1), or None when the job does not report progress."""
+        with self._lock:
+            if self.state == 'done':
+                return 1.0
+            return min(self.done / self.total, 1.0) if self.total else None
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'id': self.id,
+                'name': self.name,
+                'state': self.state,
+                'done': self.done,
+                'total': self.total,
+                'partial': self.partial,
+                'error': self.error,
+                'elapsed': (self.finished_at or time.time()) - (self.started_at or self.submitted_at),
+            }
+
+    def wait(self, timeout=None):
+        """Blocks until the job finishes; returns False on timeout."""
+        return self._finished.wait(timeout)
+
+    def result(self, timeout=None):
+        """The job's return value; re-raises its error, or JobCancelled."""
+        if not self._finished.wait(timeout):
+            raise TimeoutError(f"{self.id} is still {self.state}")
+        if self.state == 'failed':
+            raise self.error
+        if self.state == 'cancelled':
+            raise JobCancelled(self.id)
+        return self._result
+
+    def _set_state(self, state, result=None, error=None):
+        with self._lock:
+            self.state = state
+            if state == 'running':
+                self.started_at = time.time()
+            elif state in ('done', 'failed', 'cancelled'):
+                self.finished_at = time.time()
+                self._result = result
+                self.error = error
+        # Waiters are woken by the manager (JobManager._finish) once it has filed the job.
+
+
+class JobManager:
+    """
+    A shared pool of background jobs.
+
+    Args:
+        max_workers (int): Jobs that run at once; the rest wait in the queue. A thread pool
+            is used because jobs report progress and watch a cancel event in shared memory,
+            and the NumPy-bound work releases the GIL.
+        keep_finished (int): Finished jobs kept for reuse by identical submissions.
+    """
+
+    def __init__(self, max_workers=2, keep_finished=64):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='sim-job')
+        self._keep_finished = keep_finished
+        self._jobs = {}  # key -> queued or running Job
+        self._finished = OrderedDict()  # key -> done Job, oldest first
+        self._by_id = {}
+        self._lock = threading.Lock()
+        self.counts = dict.fromkeys(('submitted', 'deduplicated', 'reused') + STATES[2:], 0)
+
+    def submit(self, fn, *args, name=None, **kwargs):
+        """
+        Runs fn(*args, **kwargs) in the background and returns its Job, or the Job of an
+        identical call that is already queued, running or finished. Every caller that gets
+        a Job back is one of its watchers and should `release` it when done with it.
+        """
+        key = job_key(fn, args, kwargs)
+        with self._lock:
+            self.counts['submitted'] += 1
+            job = self._jobs.get(key)
+            if job is not None and not job.cancel_event.is_set():
+                self.counts['deduplicated'] += 1
+            else:
+                job = self._finished.get(key)
+                if job is not None:
+                    self._finished.move_to_end(key)
+                    self.counts['reused'] += 1
+                else:
+                    job = Job(key, name or fn.__name__)
+                    self._jobs[key] = job
+                    self._by_id[job.id] = job
+                    self._pool.submit(self._run, job, fn, args, kwargs)
+            job._watchers += 1
+            return job
+
+    def get(self, job_id):
+        """The Job with `job_id`, or None once it has been forgotten."""
+        with self._lock:
+            return self._by_id.get(job_id)
+
+    def release(self, job):
+        """Detaches one watcher; the job is cancelled when nobody waits for it any more."""
+        with self._lock:
+            job._watchers = max(job._watchers - 1, 0)
+            if job._watchers > 0:
+                return
+            if not job.finished:
+                job.cancel_event.set()
+                if self._jobs.get(job.key) is job:
+                    del self._jobs[job.key]  # a new identical submission starts afresh
+            elif self._finished.get(job.key) is not job:
+                self._by_id.pop(job.id, None)
+
+    def supersede(self, old_job, fn, *args, name=None, **kwargs):
+        """Submits the new call, then releases `old_job` (if any) unless it is the same job."""
+        job = self.submit(fn, *args, name=name, **kwargs)
+        if old_job is not None:
+            self.release(old_job)
+        return job
+
+    def stats(self):
+        with self._lock:
+            states = [job.state for job in self._jobs.values()]
+            return {
+                **self.counts,
+                'queued': states.count('queued'),
+                'running': states.count('running'),
+                'finished_kept': len(self._finished),
+            }
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            for job in self._jobs.values():
+                job.cancel_event.set()
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    # --- Worker side ---
+    def _run(self, job, fn, args, kwargs):
+        if job.cancel_event.is_set():
+            return self._finish(job, 'cancelled')
+        job._set_state('running')
+        hooks = dict(zip(HOOKS, (job.report_progress, job.report_partial, job.cancel_event)))
+        accepted = inspect.signature(fn).parameters
+        kwargs = {**kwargs, **{name: hook for name, hook in hooks.items() if name in accepted}}
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as exc:
+            return self._finish(job, 'failed', error=exc)
+        # A cancelled function may return what it had; that is not a complete result.
+        self._finish(job, 'cancelled' if job.cancel_event.is_set() else 'done', result)
+
+    def _finish(self, job, state, result=None, error=None):
+        job._set_state(state, result, error)
+        with self._lock:
+            self.counts[state] += 1
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+            if state == 'done':
+                self._finished[job.key] = job
+                while len(self._finished) > self._keep_finished:
+                    _, old = self._finished.popitem(last=False)
+                    self._by_id.pop(old.id, None)
+            elif job._watchers == 0:
+                self._by_id.pop(job.id, None)
+        # Only now, so a waiter that resubmits the same call finds this job for reuse.
+        job._finished.set()
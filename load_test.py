@@ -0,0 +1,137 @@
+# load_test.py (v1.0 - Service Load Test)
+# Drives service.py with keep-alive connections at increasing concurrency and reports
+# throughput, latency and the server-side batch size, showing how micro-batching scales.
+#
+#   python load_test.py                      # starts a local service in a subprocess
+#   python load_test.py --url http://127.0.0.1:8765 --concurrency 1 16 256
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _payload(rng):
+    return json.dumps({
+        "dc_size_mw": int(rng.integers(10, 301)),
+        "use_clean_power": "Renewable" if rng.random() < 0.5 else "Conventional",
+        "apply_mirrormind": bool(rng.random() < 0.5),
+        "high_perf_gpu_ratio": int(rng.integers(0, 21) * 5),
+        "utilization_rate": int(rng.integers(8, 21) * 5),
+        "market_price_per_m_tokens": float(rng.integers(5, 51) / 10),
+        "standard_fee": 20.0,
+        "premium_fee": 100.0,
+    }).encode()
+
+
+async def _request(reader, writer, host, method, path, body=b""):
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def _client(host, port, path, deadline, latencies, seed):
+    rng = np.random.default_rng(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status, _ = await _request(reader, writer, host, "POST", path, _payload(rng))
+            if status != 200:
+                raise RuntimeError(f"HTTP {status}")
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def _metrics(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, body = await _request(reader, writer, host, "GET", "/metrics")
+        return json.loads(body)
+    finally:
+        writer.close()
+
+
+async def run_level(host, port, path, concurrency, duration):
+    before = await _metrics(host, port)
+    latencies = []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, path, deadline, latencies, seed) for seed in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    after = await _metrics(host, port)
+    batches = after["batches"] - before["batches"]
+    values = np.array(latencies)
+    return {
+        "concurrency": concurrency,
+        "requests": values.size,
+        "throughput_rps": values.size / elapsed,
+        "p50_ms": float(np.percentile(values, 50) * 1e3),
+        "p99_ms": float(np.percentile(values, 99) * 1e3),
+        "mean_batch": values.size / batches if batches else 0.0,
+    }
+
+
+async def _wait_until_up(host, port, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            await _metrics(host, port)
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the local simulation service.")
+    parser.add_argument("--url", default=None, help="existing service; default starts one on --port")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--endpoint", default="/v1/core")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64, 256])
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds per concurrency level")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        parsed = urlparse(args.url)
+        host, port = parsed.hostname, parsed.port or 80
+    else:
+        host, port = "127.0.0.1", args.port
+        server = subprocess.Popen([sys.executable, os.path.join(ROOT, "service.py"), "--port", str(port)])
+    try:
+        asyncio.run(_wait_until_up(host, port))
+        print(f"{'concurrency':>11}{'requests':>10}{'req/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'batch':>8}")
+        for level in args.concurrency:
+            r = asyncio.run(run_level(host, port, args.endpoint, level, args.duration))
+            print(f"{r['concurrency']:>11}{r['requests']:>10}{r['throughput_rps']:>10.0f}{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['mean_batch']:>8.1f}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 # localization.py (v30.0 - Final Logic Flow)
+from string import Formatter
 
 loc_strings = {
     "en": {
@@ -21,6 +22,13 @@ loc_strings = {
         "initial_prompt": "Set your scenario variables in the sidebar and click 'Run Analysis'.",
         "section_1_title": "1. Core Business Potential & Cash Flow (Annual)",
         "assumptions_title": "Key Assumptions & Capacity",
+        "changes_title": "🔍 What Changed Since the Previous Run",
+        "changes_quantity": "Quantity",
+        "changes_before": "Before",
+        "changes_after": "After",
+        "changes_delta": "Change",
+        "changes_because": "Because Of",
+        "changes_caption": "Only quantities downstream of the changed inputs were recomputed. 'Because Of' lists the changed values each quantity depends on directly.",
         "pnl_revenue": "Revenue",
         "pnl_cost_of_revenue": "Cost of Revenue",
         "pnl_gross_profit": "Gross Profit",
@@ -37,7 +45,7 @@ loc_strings = {
         "narrative_revenue_per_user": "Usage-Based Revenue",
         "narrative_cost_per_user": "Cost per User",
         "narrative_profit_per_user": "Usage-Based Profit",
-        "sidebar_pricing_title": "💰 Pricing Strategy (for Section 3)",
+        "what_if_fees_title": "💰 Monthly Fees to Test",
         "pricing_standard_fee": "Standard Tier Monthly Fee ($)",
         "pricing_premium_fee": "Premium Tier Monthly Fee ($)",
         "what_if_subtitle_potential": "1. Usage-Based Analysis (Potential)",
@@ -51,6 +59,11 @@ loc_strings = {
         "what_if_opportunity_cost": "Difference from Potential Profit (Opportunity Cost)",
         "what_if_interpretation": "Interpretation: By applying this fee, you would earn ${opportunity_cost:.2f} less per user each month compared to the maximum potential.",
         "what_if_pnl_title": "Annual P&L under this Fixed-Fee Scenario",
+        "fee_surface_title": "Operating Profit across Fee Combinations",
+        "fee_surface_caption": "Annual operating profit for every Standard × Premium monthly fee pair. The dashed line marks break-even; the dotted line marks a {target:.0f}-year payback.",
+        "fee_surface_zero_profit": "Break-even",
+        "fee_surface_target_payback": "{target:.0f}-Year Payback",
+        "fee_surface_current": "Your Fees",
         "payback_analysis_intro": "Based on the core business potential (usage-based), the realistic payback period is calculated as follows:",
         "annual_cash_flow": "Annual Operating Cash Flow (Profit + D&A)",
         "calculated_payback_period": "Calculated Payback Period (Years)",
@@ -59,8 +72,64 @@ loc_strings = {
         "recommended_standard_fee": "Recommended Standard Fee",
         "recommended_premium_fee": "Recommended Premium Fee",
         "recommendation_unachievable": "With the current cost structure, achieving a 5-year payback is not feasible. If the calculated payback period above is longer than your target, a fundamental review of the hardware or architectural strategy is required.",
+        "sensitivity_title": "Sensitivity Analysis (Tornado)",
+        "sensitivity_output": "Metric",
+        "sensitivity_caption": "Change in the selected metric when each variable moves ±{swing:.0f}% from the current scenario (exact derivatives, linearized).",
+        "sensitivity_low": "−{swing:.0f}%",
+        "sensitivity_high": "+{swing:.0f}%",
+        "profile_title": "⏱️ Stage Timings (Profiling)",
+        "profile_download": "Download Chrome Trace (JSON)",
+        "uncertainty_title": "🎲 Uncertainty Analysis (Monte Carlo)",
+        "uncertainty_draws": "Draws",
+        "uncertainty_run": "Run in Background",
+        "uncertainty_cancel": "Cancel",
+        "uncertainty_queued": "Waiting for a free worker…",
+        "uncertainty_progress": "{done:,} / {total:,} draws ({elapsed:.1f}s)",
+        "uncertainty_partial": "Partial results from the draws so far; they update while the analysis runs.",
+        "uncertainty_done": "{total:,} draws in {elapsed:.1f}s.",
+        "uncertainty_cancelled": "The analysis was cancelled.",
+        "uncertainty_failed": "The analysis failed: {error}",
+        "uncertainty_superseded": "The inputs changed, so the running analysis was replaced by one for the new scenario.",
+        "uncertainty_metric": "Metric",
+        "uncertainty_mean": "Mean",
+        "uncertainty_caption": "Distribution of outcomes over random draws of the uncertain config values (`*_uncertainty` in config.yml). The page stays usable while it runs.",
         "arch_explanation_title": "What is an Intelligent Architecture?",
-        "arch_explanation_text": "It's an approach that maximizes performance-to-cost by designing a superior system to efficiently control and utilize the LLM, rather than simply increasing the LLM model's size. The efficiency gains in this simulator are based on the mathematical proof of the **MirrorMind architecture**.\\n\\n- [View MirrorMind Efficiency Proof Paper](https://github.com/HWAN-OH/H2-Energy-for-AI-DC-Mix-Simulator/blob/main/paper/A%20Mathematical%20Proof%20of%20the%20Computational%20and%20Energy%20Efficiency%20of%20the%20MirrorMind%20Architecture.pdf)"
+        "arch_explanation_text": "It's an approach that maximizes performance-to-cost by designing a superior system to efficiently control and utilize the LLM, rather than simply increasing the LLM model's size. The efficiency gains in this simulator are based on the mathematical proof of the **MirrorMind architecture**.\\n\\n- [View MirrorMind Efficiency Proof Paper](https://github.com/HWAN-OH/H2-Energy-for-AI-DC-Mix-Simulator/blob/main/paper/A%20Mathematical%20Proof%20of%20the%20Computational%20and%20Energy%20Efficiency%20of%20the%20MirrorMind%20Architecture.pdf)",
+        "report_title": "📄 Strategy Report",
+        "report_download_md": "Download Report (Markdown)",
+        "report_index_title": "Strategy Reports",
+        "narrative_title": "Strategy Report",
+        "your_choice_title": "Your Strategy",
+        "your_choice_text": "Intelligent architecture {apply_mm_text}, {hw_strategy}, investing {investment_per_mw} per MW.",
+        "applied": "applied",
+        "not_applied": "not applied",
+        "hw_strategy_high": "a high-performance GPU fleet",
+        "hw_strategy_low": "a cost-efficient standard GPU fleet",
+        "hw_strategy_hybrid": "a hybrid GPU fleet",
+        "key_driver_title": "Key Driver",
+        "driver_mm_on_title": "Efficiency from architecture:",
+        "driver_mm_on_text": "more tokens are served by the same hardware, lowering the unit cost of every token.",
+        "driver_mm_on_subtext": "Reference: the intelligent-architecture benchmark costs {option_3_cost} per 1M tokens.",
+        "driver_mm_off_title": "Hardware-bound economics:",
+        "driver_mm_off_text": "throughput scales only with GPU spend, so unit cost stays tied to hardware prices.",
+        "driver_mm_off_subtext": "Reference: the high-performance GPU benchmark without the architecture costs {option_1_cost} per 1M tokens.",
+        "viability_title": "Business Viability",
+        "viability_text": "Recovering {investment_per_mw} per MW within 5 years (discount rate {target_irr:.1f}%) takes ${annual_revenue:,.0f} of annual revenue, i.e. ${token_price:,.2f} per 1M tokens or about ${user_fee:,.2f} per paid user per month.",
+        "rec_mm_high_title": "Keep the premium fleet.",
+        "rec_mm_high_text": "With the architecture applied, high-performance GPUs convert the efficiency gain into the largest margin.",
+        "rec_mm_low_title": "Lean fleet, smart software.",
+        "rec_mm_low_text": "The architecture lets standard GPUs carry the load; consider adding high-performance capacity as demand grows.",
+        "rec_mm_hybrid_title": "Balance the mix.",
+        "rec_mm_hybrid_text": "A hybrid fleet hedges hardware prices while the architecture raises throughput across both GPU classes.",
+        "rec_no_mm_title": "Apply the architecture first.",
+        "rec_no_mm_text": "Without it, every gain must be bought as hardware; the efficiency uplift is the cheapest lever available.",
+        "viability_recommendation": "Compare the recommended pricing above with market rates before committing capital.",
+        "strategy_col_1": "Strategy",
+        "strategy_col_3": "Cost per 1M Tokens",
+        "option_1_name": "High-Performance GPUs",
+        "option_2_name": "Standard GPUs",
+        "option_3_name": "High-Performance GPUs + Architecture",
+        "option_4_name": "Standard GPUs + Architecture"
     },
     "ko": {
         "app_title": "AI 데이터센터 사업성 시뮬레이터",
@@ -82,6 +151,13 @@ loc_strings = {
         "initial_prompt": "사이드바에서 시나리오 변수를 설정한 후 '분석 실행' 버튼을 눌러 결과를 확인하세요.",
         "section_1_title": "1. 핵심 사업 잠재력 및 현금흐름 (연간)",
         "assumptions_title": "주요 가정 및 생산량",
+        "changes_title": "🔍 이전 실행 대비 변경 사항",
+        "changes_quantity": "항목",
+        "changes_before": "이전",
+        "changes_after": "현재",
+        "changes_delta": "변화량",
+        "changes_because": "변경 원인",
+        "changes_caption": "변경된 입력값의 하위 항목만 다시 계산되었습니다. '변경 원인'은 각 항목이 직접 의존하는 값 중 변경된 값입니다.",
         "pnl_revenue": "매출",
         "pnl_cost_of_revenue": "매출원가",
         "pnl_gross_profit": "매출총이익",
@@ -98,7 +174,7 @@ loc_strings = {
         "narrative_revenue_per_user": "사용량 기반 매출",
         "narrative_cost_per_user": "인당 원가",
         "narrative_profit_per_user": "사용량 기반 이익",
-        "sidebar_pricing_title": "💰 요금제 전략 설정 (섹션 3 분석용)",
+        "what_if_fees_title": "💰 적용할 월 요금 설정",
         "pricing_standard_fee": "유료 사용자 월 요금 ($)",
         "pricing_premium_fee": "프리미엄 사용자 월 요금 ($)",
         "what_if_subtitle_potential": "1. 사용량 기반 분석 (잠재력)",
@@ -112,6 +188,11 @@ loc_strings = {
         "what_if_opportunity_cost": "잠재 이익과의 차이 (기회비용)",
         "what_if_interpretation": "해석: 이 요금제를 적용하면, 최대 잠재력 대비 사용자 한 명당 매달 ${opportunity_cost:.2f}의 이익을 덜 벌게 됩니다.",
         "what_if_pnl_title": "해당 고정 요금제 적용 시 연간 손익",
+        "fee_surface_title": "요금 조합별 영업이익",
+        "fee_surface_caption": "유료 × 프리미엄 월 요금의 모든 조합에 대한 연간 영업이익입니다. 점선(--)은 손익분기선, 점선(··)은 {target:.0f}년 회수선입니다.",
+        "fee_surface_zero_profit": "손익분기",
+        "fee_surface_target_payback": "{target:.0f}년 회수",
+        "fee_surface_current": "설정 요금",
         "payback_analysis_intro": "핵심 사업 잠재력(사용량 기반)을 기준으로, 현실적인 투자 회수 기간은 다음과 같이 계산됩니다:",
         "annual_cash_flow": "연간 영업 현금흐름 (영업이익 + 감가상각비)",
         "calculated_payback_period": "계산된 투자 회수 기간 (년)",
@@ -120,11 +201,89 @@ loc_strings = {
         "recommended_standard_fee": "권장 유료 요금",
         "recommended_premium_fee": "권장 프리미엄 요금",
         "recommendation_unachievable": "현재 비용 구조에서는 5년 내 투자금 회수가 현실적으로 어렵습니다. 위 계산된 회수 기간이 목표보다 길 경우, 하드웨어 또는 아키텍처 전략의 근본적인 재검토가 필요합니다.",
+        "sensitivity_title": "민감도 분석 (토네이도 차트)",
+        "sensitivity_output": "지표",
+        "sensitivity_caption": "각 변수가 현재 시나리오 대비 ±{swing:.0f}% 변할 때 선택한 지표의 변화량입니다 (정확한 미분값 기반 선형 근사).",
+        "sensitivity_low": "−{swing:.0f}%",
+        "sensitivity_high": "+{swing:.0f}%",
+        "profile_title": "⏱️ 단계별 소요 시간 (프로파일링)",
+        "profile_download": "Chrome Trace 다운로드 (JSON)",
+        "uncertainty_title": "🎲 불확실성 분석 (몬테카를로)",
+        "uncertainty_draws": "표본 수",
+        "uncertainty_run": "백그라운드에서 실행",
+        "uncertainty_cancel": "취소",
+        "uncertainty_queued": "작업자를 기다리는 중…",
+        "uncertainty_progress": "{done:,} / {total:,} 표본 ({elapsed:.1f}초)",
+        "uncertainty_partial": "지금까지의 표본으로 계산한 중간 결과이며, 분석이 진행되는 동안 갱신됩니다.",
+        "uncertainty_done": "{total:,}개 표본, {elapsed:.1f}초.",
+        "uncertainty_cancelled": "분석이 취소되었습니다.",
+        "uncertainty_failed": "분석에 실패했습니다: {error}",
+        "uncertainty_superseded": "입력값이 바뀌어 진행 중이던 분석을 새 시나리오의 분석으로 교체했습니다.",
+        "uncertainty_metric": "지표",
+        "uncertainty_mean": "평균",
+        "uncertainty_caption": "config.yml의 불확실한 값(`*_uncertainty`)을 무작위로 뽑아 계산한 결과 분포입니다. 분석 중에도 페이지를 계속 사용할 수 있습니다.",
         "arch_explanation_title": "지능형 아키텍처(Intelligent Architecture)란?",
-        "arch_explanation_text": "단순히 LLM 모델의 크기를 키우는 대신, LLM을 효율적으로 제어하고 활용하는 상위 시스템을 설계하여 비용 대비 성능을 극대화하는 접근 방식입니다. 이 시뮬레이터의 효율성 증가는 **MirrorMind 아키텍처**의 수학적 증명에 기반합니다.\\n\\n- [MirrorMind 효율성 증명 논문 보기](https://github.com/HWAN-OH/H2-Energy-for-AI-DC-Mix-Simulator/blob/main/paper/A%20Mathematical%20Proof%20of%20the%20Computational%20and%20Energy%20Efficiency%20of%20the%20MirrorMind%20Architecture.pdf)"
+        "arch_explanation_text": "단순히 LLM 모델의 크기를 키우는 대신, LLM을 효율적으로 제어하고 활용하는 상위 시스템을 설계하여 비용 대비 성능을 극대화하는 접근 방식입니다. 이 시뮬레이터의 효율성 증가는 **MirrorMind 아키텍처**의 수학적 증명에 기반합니다.\\n\\n- [MirrorMind 효율성 증명 논문 보기](https://github.com/HWAN-OH/H2-Energy-for-AI-DC-Mix-Simulator/blob/main/paper/A%20Mathematical%20Proof%20of%20the%20Computational%20and%20Energy%20Efficiency%20of%20the%20MirrorMind%20Architecture.pdf)",
+        "report_title": "📄 전략 리포트",
+        "report_download_md": "리포트 다운로드 (Markdown)",
+        "report_index_title": "전략 리포트 목록",
+        "narrative_title": "전략 리포트",
+        "your_choice_title": "선택한 전략",
+        "your_choice_text": "지능형 아키텍처 {apply_mm_text}, {hw_strategy}, MW당 {investment_per_mw} 투자.",
+        "applied": "적용",
+        "not_applied": "미적용",
+        "hw_strategy_high": "고성능 GPU 중심 구성",
+        "hw_strategy_low": "비용 효율형 표준 GPU 중심 구성",
+        "hw_strategy_hybrid": "혼합 GPU 구성",
+        "key_driver_title": "핵심 동인",
+        "driver_mm_on_title": "아키텍처 효율:",
+        "driver_mm_on_text": "같은 하드웨어로 더 많은 토큰을 처리하므로 토큰당 원가가 낮아집니다.",
+        "driver_mm_on_subtext": "참고: 지능형 아키텍처 벤치마크의 100만 토큰당 원가는 {option_3_cost}입니다.",
+        "driver_mm_off_title": "하드웨어 의존 구조:",
+        "driver_mm_off_text": "처리량이 GPU 투자에만 비례하므로 단위 원가가 하드웨어 가격에 묶여 있습니다.",
+        "driver_mm_off_subtext": "참고: 아키텍처 없이 고성능 GPU만 쓰는 벤치마크의 100만 토큰당 원가는 {option_1_cost}입니다.",
+        "viability_title": "사업 타당성",
+        "viability_text": "MW당 {investment_per_mw}를 5년 내 회수하려면(할인율 {target_irr:.1f}%) 연 매출 ${annual_revenue:,.0f}, 즉 100만 토큰당 ${token_price:,.2f} 또는 유료 사용자 1인당 월 ${user_fee:,.2f} 수준이 필요합니다.",
+        "rec_mm_high_title": "고성능 구성을 유지하세요.",
+        "rec_mm_high_text": "아키텍처를 적용한 상태에서는 고성능 GPU가 효율 향상을 가장 큰 마진으로 전환합니다.",
+        "rec_mm_low_title": "가벼운 하드웨어, 똑똑한 소프트웨어.",
+        "rec_mm_low_text": "아키텍처 덕분에 표준 GPU로도 부하를 감당할 수 있습니다. 수요가 늘면 고성능 용량 추가를 검토하세요.",
+        "rec_mm_hybrid_title": "구성의 균형을 맞추세요.",
+        "rec_mm_hybrid_text": "혼합 구성은 하드웨어 가격 위험을 분산하고, 아키텍처가 두 GPU 모두의 처리량을 높입니다.",
+        "rec_no_mm_title": "아키텍처부터 적용하세요.",
+        "rec_no_mm_text": "적용하지 않으면 모든 성장을 하드웨어로 사야 합니다. 효율 향상이 가장 저렴한 수단입니다.",
+        "viability_recommendation": "자본을 투입하기 전에 위 권장 요금을 시장 가격과 비교해 보세요.",
+        "strategy_col_1": "전략",
+        "strategy_col_3": "100만 토큰당 원가",
+        "option_1_name": "고성능 GPU",
+        "option_2_name": "표준 GPU",
+        "option_3_name": "고성능 GPU + 아키텍처",
+        "option_4_name": "표준 GPU + 아키텍처"
     }
 }
 
+_compiled = {}
+
+
+def _compile(lang):
+    # Templates are preprocessed once per language: markdown newlines are resolved, and strings
+    # without placeholders are fully formatted so that t() is a plain dict lookup for them.
+    compiled = {}
+    for key, text in loc_strings.get(lang, {}).items():
+        text = text.replace('\\n', '\n')
+        has_fields = any(field is not None for _, field, _, _ in Formatter().parse(text))
+        compiled[key] = (text, True) if has_fields else (text.format(), False)
+    _compiled[lang] = compiled
+    return compiled
+
+
 def t(key, lang="ko", **kwargs):
-    # Use replace to handle markdown newlines
-    return loc_strings.get(lang, {}).get(key, key).format(**kwargs).replace('\\n', '\n')
+    compiled = _compiled.get(lang) or _compile(lang)
+    text, has_fields = compiled.get(key, (key, False))
+    return text.format(**kwargs) if has_fields else text
+
+
+def template(key, lang="ko"):
+    """The text of `key` with its {placeholders} left unfilled, for callers that format it later."""
+    compiled = _compiled.get(lang) or _compile(lang)
+    return compiled.get(key, (key, False))[0]
@@ -0,0 +1,328 @@
+# model_graph.py (v1.0 - Incremental Model Graph)
+# The core calculator expressed as a graph of named quantities. Each quantity is a small
+# function whose parameter names are its dependencies; values are memoized, and changing an
+# input invalidates only the quantities downstream of it. The same graph explains "what
+# changed and why" between two scenarios. Every formula is one of calculator.py's
+# single-scenario helpers, the same ones calculate_core_business_case is built from.
+import math
+from collections import Counter
+
+from calculator import (
+    _arch_efficiency, _capex, _cost_of_revenue, _depreciation, _gpu_counts, _power_cost, _price_ratio,
+    _recommendation, _required_annual_revenue, _segment_dicts, _token_capacity, _total_users, _usage_revenue,
+)
+from config_loader import resolve_config
+
+INPUTS = (
+    'config', 'dc_size_mw', 'use_clean_power', 'apply_mirrormind', 'high_perf_gpu_ratio',
+    'utilization_rate', 'market_price_per_m_tokens',
+)
+
+QUANTITIES = {}  # name -> (function, dependency names), in definition (= topological) order
+
+
+def quantity(fn):
+    """Registers `fn` as the quantity of the same name; its parameters are its dependencies."""
+    deps = fn.__code__.co_varnames[:fn.__code__.co_argcount]
+    unknown = [dep for dep in deps if dep not in INPUTS and dep not in QUANTITIES]
+    if unknown:
+        raise ValueError(f"{fn.__name__}: undefined dependencies {unknown}")
+    QUANTITIES[fn.__name__] = (fn, deps)
+    return fn
+
+
+# --- 1. CAPEX & GPU ---
+@quantity
+def dc_construction_cost(config, dc_size_mw):
+    return _capex(config.investment, dc_size_mw)[0]
+
+
+@quantity
+def it_hw_budget(config, dc_size_mw):
+    return _capex(config.investment, dc_size_mw)[1]
+
+
+@quantity
+def total_investment(dc_construction_cost, it_hw_budget):
+    return dc_construction_cost + it_hw_budget
+
+
+@quantity
+def gpu_counts(config, it_hw_budget, high_perf_gpu_ratio):
+    return _gpu_counts(config.hardware, it_hw_budget, high_perf_gpu_ratio / 100.0)
+
+
+@quantity
+def num_high_perf_gpus(gpu_counts):
+    return gpu_counts[0]
+
+
+@quantity
+def num_standard_gpus(gpu_counts):
+    return gpu_counts[1]
+
+
+# --- 2. Capacity ---
+@quantity
+def arch_efficiency(config, apply_mirrormind):
+    return _arch_efficiency(config.model_and_market, apply_mirrormind)
+
+
+@quantity
+def total_token_capacity(config, num_high_perf_gpus, num_standard_gpus, arch_efficiency):
+    return _token_capacity(config.hardware, num_high_perf_gpus, num_standard_gpus, arch_efficiency)
+
+
+@quantity
+def serviced_tokens(total_token_capacity, utilization_rate):
+    return total_token_capacity * (utilization_rate / 100.0)
+
+
+# --- 3. P&L based on USAGE potential ---
+@quantity
+def revenue(config, serviced_tokens, market_price_per_m_tokens):
+    return _usage_revenue(config, serviced_tokens, market_price_per_m_tokens)
+
+
+@quantity
+def power_cost(config, dc_size_mw, utilization_rate, use_clean_power):
+    return _power_cost(config, dc_size_mw, utilization_rate, use_clean_power)
+
+
+@quantity
+def cost_of_revenue(config, dc_size_mw, power_cost):
+    return _cost_of_revenue(config.operating_expenses, dc_size_mw, power_cost)
+
+
+@quantity
+def sgna_rate(config):
+    return config.operating_expenses.sgna_as_percent_of_revenue / 100.0
+
+
+@quantity
+def sg_and_a(revenue, sgna_rate):
+    return revenue * sgna_rate
+
+
+@quantity
+def depreciation(config, dc_construction_cost, it_hw_budget):
+    return _depreciation(config.investment, dc_construction_cost, it_hw_budget)
+
+
+@quantity
+def it_depreciation(depreciation):
+    return depreciation[1]
+
+
+@quantity
+def d_and_a(depreciation):
+    return depreciation[0]
+
+
+@quantity
+def rd_amortization(config):
+    return config.rd_amortization
+
+
+@quantity
+def total_operating_cost(cost_of_revenue, sg_and_a, d_and_a, rd_amortization):
+    return cost_of_revenue + sg_and_a + d_and_a + rd_amortization
+
+
+@quantity
+def operating_profit(revenue, total_operating_cost):
+    return revenue - total_operating_cost
+
+
+@quantity
+def annual_cash_flow(operating_profit, d_and_a):
+    return operating_profit + d_and_a
+
+
+# --- 4. Recommended Pricing ---
+@quantity
+def required_annual_revenue(total_investment, cost_of_revenue, d_and_a, rd_amortization, sgna_rate):
+    return _required_annual_revenue(total_investment, cost_of_revenue, d_and_a, rd_amortization, sgna_rate)
+
+
+@quantity
+def price_ratio(config, required_annual_revenue, serviced_tokens, market_price_per_m_tokens):
+    return _price_ratio(config.tier_table, required_annual_revenue, serviced_tokens, market_price_per_m_tokens)
+
+
+# --- 5. Per-User Monthly Metrics ---
+@quantity
+def total_users(config, dc_size_mw):
+    return _total_users(config.model_and_market, dc_size_mw)
+
+
+@quantity
+def segment_narratives(config, total_users, serviced_tokens, market_price_per_m_tokens, total_operating_cost, price_ratio):
+    return tuple(_segment_dicts(config.tier_table, total_users, serviced_tokens, market_price_per_m_tokens, total_operating_cost, price_ratio))
+
+
+@quantity
+def recommended_standard_fee(config, segment_narratives):
+    return _recommend(config, segment_narratives)['standard_fee']
+
+
+@quantity
+def recommended_premium_fee(config, segment_narratives):
+    return _recommend(config, segment_narratives)['premium_fee']
+
+
+@quantity
+def is_achievable(config, segment_narratives):
+    return _recommend(config, segment_narratives)['is_achievable']
+
+
+def _recommend(config, segments):
+    fees = [segment['recommended_fee'] for segment in segments]
+    return _recommendation(config.tier_table, fees, config.model_and_market.achievable_fee_limits)
+
+
+def _downstream():
+    """name -> every quantity that (transitively) depends on it."""
+    direct = {name: [] for name in (*INPUTS, *QUANTITIES)}
+    for name, (_, deps) in QUANTITIES.items():
+        for dep in deps:
+            direct[dep].append(name)
+    closure = {}
+    for name in reversed(list(direct)):  # dependents are always defined later
+        below = set()
+        for child in direct[name]:
+            below.add(child)
+            below |= closure[child]
+        closure[name] = below
+    return closure
+
+
+DOWNSTREAM = _downstream()
+
+
+class ModelGraph:
+    """
+    Memoized evaluation of QUANTITIES for one scenario at a time.
+
+        graph = ModelGraph(dc_size_mw=100, use_clean_power='Conventional', ...)
+        graph.results()                             # everything computed once
+        graph.update(market_price_per_m_tokens=2)   # recomputes only revenue-side quantities
+
+    `evaluations` counts how often each quantity has been computed.
+    """
+
+    def __init__(self, config=None, **inputs):
+        missing = [name for name in INPUTS[1:] if name not in inputs]
+        if missing:
+            raise ValueError(f"missing input(s): {missing}")
+        self._values = {'config': resolve_config(config)}
+        self._values.update(self._check(inputs))
+        self.evaluations = Counter()
+
+    @staticmethod
+    def _check(inputs):
+        unknown = [name for name in inputs if name not in INPUTS]
+        if unknown:
+            raise ValueError(f"unknown input(s): {unknown}")
+        return inputs
+
+    def __getitem__(self, name):
+        values = self._values
+        if name in values:
+            return values[name]
+        if name not in QUANTITIES:
+            raise KeyError(name)
+        fn, deps = QUANTITIES[name]
+        value = fn(*(self[dep] for dep in deps))
+        values[name] = value
+        self.evaluations[name] += 1
+        return value
+
+    def inputs(self):
+        return {name: self._values[name] for name in INPUTS}
+
+    def set(self, **inputs):
+        """Changes inputs; returns the names of the quantities that were invalidated."""
+        inputs = self._check(dict(inputs))
+        if 'config' in inputs:
+            inputs['config'] = resolve_config(inputs['config'])
+        invalidated = set()
+        for name, value in inputs.items():
+            if _same(name, self._values[name], value):
+                continue
+            self._values[name] = value
+            invalidated |= DOWNSTREAM[name]
+        for name in invalidated:
+            self._values.pop(name, None)
+        return invalidated
+
+    def update(self, **inputs):
+        """
+        Like set(), but returns what changed and why: one record per input or quantity whose
+        value differs, in dependency order, with the changed dependencies that caused it.
+        """
+        before = {name: self[name] for name in (*INPUTS, *QUANTITIES)}
+        self.set(**inputs)
+        changed = []
+        changed_names = set()
+        for name in (*INPUTS, *QUANTITIES):
+            old, new = before[name], self[name]
+            if _same(name, old, new):
+                continue
+            changed_names.add(name)
+            deps = QUANTITIES[name][1] if name in QUANTITIES else ()
+            changed.append({
+                'quantity': name,
+                'before': old,
+                'after': new,
+                'change': new - old if _is_number(old) and _is_number(new) else None,
+                'because': [dep for dep in deps if dep in changed_names],
+            })
+        return changed
+
+    def results(self):
+        """The `calculate_core_business_case` results dict, built from the graph."""
+        standard_fee = self['recommended_standard_fee']
+        premium_fee = self['recommended_premium_fee']
+        return {
+            "pnl_annual": {
+                'revenue': self['revenue'],
+                'cost_of_revenue': self['cost_of_revenue'],
+                'gross_profit': self['revenue'] - self['cost_of_revenue'],
+                'sg_and_a': self['sg_and_a'],
+                'd_and_a': self['d_and_a'],
+                'it_depreciation': self['it_depreciation'],
+                'rd_amortization': self['rd_amortization'],
+                'operating_profit': self['operating_profit'],
+                'annual_cash_flow': self['annual_cash_flow'],
+            },
+            "segment_narratives": [dict(segment) for segment in self['segment_narratives']],
+            "total_investment": self['total_investment'],
+            "assumptions": {
+                "gpu_mix_string": f"H:{int(self['num_high_perf_gpus'])} / S:{int(self['num_standard_gpus'])}",
+                "utilization_rate": self['utilization_rate'],
+                "serviced_tokens_t": self['serviced_tokens'] / 1e12,
+            },
+            "recommendation": {
+                "standard_fee": standard_fee,
+                "premium_fee": premium_fee,
+                "is_achievable": self['is_achievable'],
+            },
+        }
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _same(name, old, new):
+    if name == 'config':
+        return old.config_hash == new.config_hash and old.path == new.path
+    if _is_number(old) and _is_number(new):
+        return old == new or (math.isnan(old) and math.isnan(new))
+    return old == new
+
+
+def diff_scenarios(before, after, config=None):
+    """What changed and why between two scenarios given as input dicts (see ModelGraph.update)."""
+    return ModelGraph(config, **before).update(**after)
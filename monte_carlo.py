@@ -0,0 +1,270 @@
+# monte_carlo.py (v1.0 - Uncertainty Engine)
+# Runs the batch engine over random draws of the uncertain config values declared in config.yml
+# (`<key>_uncertainty`) and aggregates the outputs with mergeable streaming quantile sketches.
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from calculator import OVERRIDABLE_PARAMS, calculate_core_business_case_batch
+from config_loader import resolve_config
+
+MARKET_PRICE_PATH = 'model_and_market.market_price_per_million_tokens'
+METRICS = ('operating_profit', 'annual_cash_flow', 'payback_period', 'standard_fee', 'premium_fee')
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+class QuantileSketch:
+    """
+    Mergeable streaming quantile sketch (KLL-style compactor hierarchy).
+
+    Memory is O(k log(n / k)) regardless of how many values are fed in; rank error is
+    roughly 1/k. Compaction randomness comes from `seed`, so results are reproducible.
+    """
+
+    def __init__(self, k=2000, seed=None):
+        self.k = k
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - 1 - level
+        return max(8, int(self.k * (2.0 / 3.0) ** depth))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            buffer = self.levels[level]
+            if buffer.size > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                buffer = np.sort(buffer)
+                keep = buffer[:buffer.size % 2]
+                buffer = buffer[buffer.size % 2:]
+                promoted = buffer[self._rng.integers(2)::2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self.levels[level] = keep
+            level += 1
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        self.count += values.size
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, buffer in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], buffer])
+        self._compress()
+        return self
+
+    def quantiles(self, qs):
+        if self.count == 0:
+            return np.full(len(qs), np.nan)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(buffer.size, 2.0 ** level) for level, buffer in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, cumulative = items[order], np.cumsum(weights[order])
+        ranks = np.asarray(qs, dtype=float) * cumulative[-1]
+        result = items[np.minimum(np.searchsorted(cumulative, ranks, side='left'), items.size - 1)]
+        # The extremes are tracked exactly.
+        result = np.where(np.asarray(qs) <= 0, self.min, result)
+        return np.where(np.asarray(qs) >= 1, self.max, result)
+
+
+class _Accumulator:
+    """Per-metric sketch plus exact count/sum/min/max."""
+
+    def __init__(self, seed):
+        self.sketch = QuantileSketch(seed=seed)
+        self.finite_sum = 0.0
+        self.finite_count = 0
+
+    def update(self, values):
+        finite = values[np.isfinite(values)]
+        self.finite_sum += finite.sum()
+        self.finite_count += finite.size
+        self.sketch.update(values)
+
+    def merge(self, other):
+        self.finite_sum += other.finite_sum
+        self.finite_count += other.finite_count
+        self.sketch.merge(other.sketch)
+        return self
+
+
+def _draw_overrides(config, rng, size):
+    """Samples every declared uncertainty. Returns (config overrides, market price multiplier)."""
+    overrides = {}
+    price_multiplier = np.ones(size)
+    for spec in config.uncertainty:
+        draws = spec.sample(rng, size)
+        if spec.path == MARKET_PRICE_PATH:
+            # The market price is a scenario input; its distribution is applied as a multiplier.
+            price_multiplier = draws / spec.value if spec.value > 0 else price_multiplier
+        elif spec.path in OVERRIDABLE_PARAMS:
+            overrides[spec.path] = np.maximum(draws, 0.0)
+    return overrides, price_multiplier
+
+
+def _run_chunk(task):
+    """Worker entry point: simulate one chunk of draws; returns (chunk index, draws, accumulators)."""
+    scenario, config, chunk_index, size, seed = task
+    seed_seq = np.random.SeedSequence(entropy=seed, spawn_key=(chunk_index,))
+    draw_seq, sketch_seq = seed_seq.spawn(2)
+    rng = np.random.default_rng(draw_seq)
+
+    overrides, price_multiplier = _draw_overrides(config, rng, size)
+    results = calculate_core_business_case_batch(
+        np.full(size, scenario['dc_size_mw'], dtype=float),
+        scenario['use_clean_power'],
+        scenario['apply_mirrormind'],
+        scenario['high_perf_gpu_ratio'],
+        scenario['utilization_rate'],
+        scenario['market_price_per_m_tokens'] * price_multiplier,
+        config=config,
+        overrides=overrides,
+    )
+    pnl = results['pnl_annual']
+    cash_flow = pnl['annual_cash_flow']
+    payback = np.full(size, np.inf)
+    np.divide(results['total_investment'], cash_flow, out=payback, where=cash_flow > 0)
+    columns = {
+        'operating_profit': pnl['operating_profit'],
+        'annual_cash_flow': cash_flow,
+        'payback_period': payback,
+        'standard_fee': results['recommendation']['standard_fee'],
+        'premium_fee': results['recommendation']['premium_fee'],
+    }
+
+    sketch_seeds = sketch_seq.spawn(len(METRICS))
+    accumulators = {}
+    for metric, metric_seed in zip(METRICS, sketch_seeds):
+        accumulators[metric] = _Accumulator(metric_seed)
+        accumulators[metric].update(columns[metric])
+    return chunk_index, size, accumulators
+
+
+def run_monte_carlo(
+    dc_size_mw,
+    use_clean_power,
+    apply_mirrormind,
+    high_perf_gpu_ratio,
+    utilization_rate,
+    market_price_per_m_tokens,
+    n_draws=100_000,
+    seed=0,
+    chunk_size=100_000,
+    max_workers=None,
+    quantiles=DEFAULT_QUANTILES,
+    config=None,
+    progress=None,
+    cancel_event=None,
+    partial=None,
+):
+    """
+    Monte Carlo uncertainty analysis of one scenario.
+
+    Draws are split into fixed-size chunks whose seeds derive from (seed, chunk index), so
+    results are identical for any `max_workers`. Only a bounded number of chunks is in
+    flight at once and each returns compact sketches, so memory stays flat in `n_draws`.
+
+    Args:
+        max_workers (int | None): Process count (None = os.cpu_count()); 0 or 1 runs in-process.
+        progress (callable | None): Called as progress(done_draws, n_draws) after each chunk.
+        cancel_event (threading.Event | None): Stops submitting new chunks once set.
+        partial (callable | None): Called as partial(summary) with the summary of the draws
+            merged so far, after each chunk (same shape as the return value).
+
+    Returns:
+        dict: {metric: {'mean', 'min', 'max', 'quantiles': {q: value}}} plus 'n_draws'.
+            payback_period is +inf for draws whose cash flow never recovers the investment;
+            its mean is taken over the finite draws only.
+    """
+    config = resolve_config(config)
+    scenario = {
+        'dc_size_mw': dc_size_mw,
+        'use_clean_power': use_clean_power,
+        'apply_mirrormind': apply_mirrormind,
+        'high_perf_gpu_ratio': high_perf_gpu_ratio,
+        'utilization_rate': utilization_rate,
+        'market_price_per_m_tokens': market_price_per_m_tokens,
+    }
+    n_chunks = -(-n_draws // chunk_size)
+    tasks = (
+        (scenario, config, i, min(chunk_size, n_draws - i * chunk_size), seed)
+        for i in range(n_chunks)
+    )
+
+    totals = None
+    pending = {}
+    next_to_merge = 0
+    done_draws = 0
+
+    def absorb(chunk_index, size, accumulators):
+        # Merge strictly in chunk order so the sketch state does not depend on scheduling.
+        nonlocal totals, next_to_merge, done_draws
+        pending[chunk_index] = (size, accumulators)
+        while next_to_merge in pending:
+            size, chunk = pending.pop(next_to_merge)
+            if totals is None:
+                totals = chunk
+            else:
+                for metric in METRICS:
+                    totals[metric].merge(chunk[metric])
+            done_draws += size
+            next_to_merge += 1
+            if progress is not None:
+                progress(done_draws, n_draws)
+            if partial is not None:
+                partial(_summary(totals, done_draws, quantiles))
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers <= 1:
+        for task in tasks:
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            absorb(*_run_chunk(task))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            in_flight = set()
+            for task in tasks:
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                in_flight.add(pool.submit(_run_chunk, task))
+                if len(in_flight) >= 2 * max_workers:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        absorb(*future.result())
+            for future in in_flight:
+                absorb(*future.result())
+
+    return _summary(totals, done_draws, quantiles)
+
+
+def _summary(totals, done_draws, quantiles):
+    summary = {'n_draws': done_draws}
+    for metric in METRICS:
+        accumulator = totals[metric] if totals is not None else _Accumulator(None)
+        values = accumulator.sketch.quantiles(quantiles)
+        summary[metric] = {
+            'mean': float(accumulator.finite_sum / accumulator.finite_count) if accumulator.finite_count else np.nan,
+            'min': float(accumulator.sketch.min),
+            'max': float(accumulator.sketch.max),
+            'quantiles': dict(zip(quantiles, values.tolist())),
+        }
+    return summary
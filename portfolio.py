@@ -0,0 +1,337 @@
+# portfolio.py (v1.0 - Multi-site Portfolio)
+# Evaluates a table of datacenter sites as one batch and rolls them up into fleet P&L, cash
+# flow and payback, with the shared R&D and SG&A allocated across sites. Every site's yearly
+# schedule is computed once; a portfolio variant is then a weight vector over the sites, so
+# many variants (e.g. an optimizer's candidates) cost one matrix product each.
+#
+#   python portfolio.py sites.csv [--price 1.5] [--allocation revenue|capacity|equal]
+import argparse
+import csv
+import math
+import sys
+
+import numpy as np
+
+from calculator import calculate_core_business_case_batch
+from cashflow import irr, it_age, it_refresh, load_demand_profile, npv, payback_period, utilization_ramp
+from config_loader import resolve_config
+
+SITE_COLUMNS = ("dc_size_mw", "high_perf_gpu_ratio", "utilization_rate", "use_clean_power")
+# Optional columns; a missing column or an empty/NaN cell falls back to the config value.
+OPTIONAL_SITE_COLUMNS = ("site", "apply_mirrormind", "power_cost_per_kwh", "pue", "commissioning_year")
+ALLOCATION_BASES = ("revenue", "capacity", "equal")
+
+_TRUE = {"1", "true", "yes", "y", "renewable"}
+
+
+def _flag(value):
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUE
+    return bool(value) and not (isinstance(value, float) and math.isnan(value))
+
+
+def _number(value):
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return np.nan
+    return float(value)
+
+
+def load_sites(source):
+    """
+    Reads a sites table from a .csv/.parquet path, a DataFrame or a {column: values} dict.
+
+    Returns {column: array} with every column of SITE_COLUMNS and OPTIONAL_SITE_COLUMNS;
+    optional numeric columns hold NaN where the config default applies.
+    """
+    if isinstance(source, str):
+        if source.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            source = pq.read_table(source).to_pydict()
+        else:
+            with open(source, newline="") as f:
+                rows = list(csv.DictReader(f))
+            source = {name: [row[name] for row in rows] for name in (rows[0] if rows else ())}
+    elif hasattr(source, "columns"):
+        source = {name: source[name].to_numpy() for name in source.columns}
+
+    missing = [name for name in SITE_COLUMNS if name not in source]
+    if missing:
+        raise ValueError(f"sites table is missing column(s) {missing}")
+    n = len(source["dc_size_mw"])
+    if n == 0:
+        raise ValueError("sites table is empty")
+
+    sites = {
+        "site": np.array([str(name) for name in source.get("site", [f"site_{i + 1}" for i in range(n)])]),
+        "use_clean_power": np.array([_flag(value) for value in source["use_clean_power"]]),
+        "apply_mirrormind": np.array([_flag(value) for value in source.get("apply_mirrormind", [False] * n)]),
+    }
+    for name in ("dc_size_mw", "high_perf_gpu_ratio", "utilization_rate", "power_cost_per_kwh", "pue", "commissioning_year"):
+        sites[name] = np.array([_number(value) for value in source.get(name, [None] * n)], dtype=float)
+
+    for name in ("dc_size_mw", "high_perf_gpu_ratio", "utilization_rate"):
+        if np.isnan(sites[name]).any():
+            raise ValueError(f"sites table: '{name}' is required for every site")
+    checks = (
+        ("dc_size_mw", sites["dc_size_mw"] > 0, "> 0"),
+        ("high_perf_gpu_ratio", (sites["high_perf_gpu_ratio"] >= 0) & (sites["high_perf_gpu_ratio"] <= 100), "within 0-100"),
+        ("utilization_rate", (sites["utilization_rate"] >= 0) & (sites["utilization_rate"] <= 100), "within 0-100"),
+        ("power_cost_per_kwh", ~(sites["power_cost_per_kwh"] < 0), ">= 0"),
+        ("pue", ~(sites["pue"] < 1), ">= 1"),
+    )
+    for name, ok, rule in checks:
+        if not ok.all():
+            bad = sites["site"][~ok][0]
+            raise ValueError(f"sites table: '{name}' must be {rule} (site {bad!r})")
+    return sites
+
+
+def site_overrides(sites, config):
+    """Per-site config overrides for calculate_core_business_case_batch (one value per site)."""
+    op_conf = config.operating_expenses
+    power_price = sites["power_cost_per_kwh"]
+    return {
+        # A site's own power price replaces the config rate of whichever source it uses.
+        "operating_expenses.power_cost_per_kwh.conventional": np.where(np.isnan(power_price), op_conf.power_cost_per_kwh.conventional, power_price),
+        "operating_expenses.power_cost_per_kwh.renewable": np.where(np.isnan(power_price), op_conf.power_cost_per_kwh.renewable, power_price),
+        "operating_expenses.pue": np.where(np.isnan(sites["pue"]), op_conf.pue, sites["pue"]),
+    }
+
+
+class Portfolio:
+    """
+    Yearly schedules of every site on a shared calendar, ready to be combined.
+
+        portfolio = Portfolio(load_sites("sites.csv"), market_price_per_m_tokens=1.5)
+        fleet = portfolio.evaluate()           # all sites once
+        fleet = portfolio.evaluate(weights)    # (variants x sites) weights, e.g. 0/1 selections
+        detail = portfolio.allocate()          # per-site view with the shared costs allocated
+
+    The calendar starts with the earliest commissioning year and runs `horizon_years`
+    (finance.horizon_years by default); column 0 of the cash-flow matrices is the year
+    before it, when the first sites are built. A site's utilization ramps along the demand
+    profile from its own commissioning year, and its IT hardware is refreshed every IT life.
+
+    Shared costs:
+        R&D: every site in its R&D amortization years carries `config.rd_amortization`, as
+            in the single-site model, for at most global_datacenter_count_for_cost_allocation
+            sites a year; once the fleet has been charged the whole program
+            (research_and_development.total_model_development_cost), later years carry none.
+        SG&A: the fleet's SG&A is its revenue times the SG&A rate.
+    """
+
+    def __init__(self, sites, market_price_per_m_tokens=None, config=None, horizon_years=None, demand_profile=None):
+        config = resolve_config(config)
+        self.config = config
+        self.sites = sites
+        fin = config.finance
+        years_conf = config.investment.amortization_years
+        horizon = fin.horizon_years if horizon_years is None else int(horizon_years)
+        profile = fin.demand_profile if demand_profile is None else demand_profile
+        price = config.model_and_market.market_price_per_million_tokens if market_price_per_m_tokens is None else market_price_per_m_tokens
+
+        default_year = int(load_demand_profile(profile)[0][0]) if profile else 1
+        commissioning = np.where(np.isnan(sites["commissioning_year"]), default_year, sites["commissioning_year"]).astype(int)
+        start_year = int(commissioning.min())
+        offset = commissioning - start_year
+        if (offset >= horizon).any():
+            late = sites["site"][offset >= horizon][0]
+            raise ValueError(f"site {late!r} is commissioned after the {horizon}-year horizon starting {start_year}")
+
+        n = len(offset)
+        self.size = n
+        self.offset = offset
+        self.horizon = horizon
+        self.years = start_year + np.arange(horizon)
+
+        # --- 1. Yearly operating results of every site: one batch over sites x years ---
+        age = np.arange(1, horizon + 1)[None, :] - offset[:, None]  # 1 in the first operating year
+        operating = age >= 1
+        ramp = utilization_ramp(horizon, profile)
+        yearly_utilization = sites["utilization_rate"][:, None] * ramp[np.clip(age, 1, horizon) - 1]
+
+        overrides = site_overrides(sites, config)
+        yearly = calculate_core_business_case_batch(
+            np.repeat(sites["dc_size_mw"], horizon),
+            np.repeat(sites["use_clean_power"], horizon),
+            np.repeat(sites["apply_mirrormind"], horizon),
+            np.repeat(sites["high_perf_gpu_ratio"], horizon),
+            yearly_utilization.ravel(),
+            price,
+            config=config,
+            overrides={path: np.repeat(value, horizon) for path, value in overrides.items()},
+        )
+
+        def schedule(values):
+            return np.where(operating, values.reshape(n, horizon), 0.0)
+
+        self.revenue = schedule(yearly.pnl_annual["revenue"])
+        self.gross_profit = schedule(yearly.pnl_annual["gross_profit"])
+        self.sg_and_a = schedule(yearly.pnl_annual["sg_and_a"])
+        self.utilization_rate = np.where(operating, yearly_utilization, 0.0)
+
+        # --- 2. Investment, depreciation and the site's own cash flows ---
+        self.dc_capex = config.investment.dc_capex_per_mw * sites["dc_size_mw"]
+        self.it_budget = config.investment.it_budget_per_mw * sites["dc_size_mw"]
+        self.total_investment = self.dc_capex + self.it_budget
+        dc_depreciation = np.where(operating & (age <= years_conf.datacenter), (self.dc_capex / years_conf.datacenter)[:, None], 0.0)
+        it_depreciation = np.where(operating, (self.it_budget / years_conf.it_hardware)[:, None], 0.0)
+        self.d_and_a = dc_depreciation + it_depreciation
+        self.rd_eligible = (operating & (age <= years_conf.research_and_development)).astype(float)
+
+        refresh = operating & it_refresh(age, years_conf.it_hardware) & (np.arange(1, horizon + 1) < horizon)
+        self.capex = np.where(refresh, self.it_budget[:, None], 0.0)
+        # Cash flows before the shared costs (SG&A and R&D), columns = years before/after build.
+        self.site_cash_flow = np.zeros((n, horizon + 1))
+        self.site_cash_flow[np.arange(n), offset] -= self.total_investment
+        self.site_cash_flow[:, 1:] += self.gross_profit - self.capex
+        final_age = age[:, -1]
+        dc_book = self.dc_capex * np.maximum(0.0, 1.0 - final_age / years_conf.datacenter)
+        it_book = self.it_budget * np.maximum(0.0, 1.0 - it_age(final_age, years_conf.it_hardware) / years_conf.it_hardware)
+        self.site_cash_flow[:, -1] += dc_book + it_book
+
+        self.rd_per_site = config.rd_amortization
+        self.max_rd_sites = config.research_and_development.global_datacenter_count_for_cost_allocation
+        self.rd_program_cost = config.research_and_development.total_model_development_cost
+
+    def _weights(self, weights):
+        if weights is None:
+            return np.ones((1, self.size))
+        weights = np.atleast_2d(np.asarray(weights, dtype=float))
+        if weights.shape[1] != self.size:
+            raise ValueError(f"weights must have one column per site ({self.size}), got shape {weights.shape}")
+        return weights
+
+    def evaluate(self, weights=None, discount_rate=None):
+        """
+        Fleet results for each portfolio variant.
+
+        Args:
+            weights: (variants x sites) multiplicities, e.g. 0/1 site selections; a single
+                vector is one variant. Default: every site once.
+
+        Returns:
+            dict: 'years', (variants x years) 'revenue', 'gross_profit', 'sg_and_a', 'd_and_a',
+                'rd_amortization', 'operating_profit', 'operating_cash_flow' and 'capex',
+                the (variants x years+1) 'net_cash_flow', and per-variant 'total_investment',
+                'npv', 'irr', 'payback_period' and 'discounted_payback_period'.
+        """
+        weights = self._weights(weights)
+        rate = self.config.finance.discount_rate if discount_rate is None else discount_rate
+
+        revenue = weights @ self.revenue
+        gross_profit = weights @ self.gross_profit
+        sg_and_a = weights @ self.sg_and_a
+        d_and_a = weights @ self.d_and_a
+        # Staggered commissioning keeps sites in their R&D years longer than the program lasts,
+        # so the cumulative charge is capped at the program cost, not just each year's.
+        rd_charged = np.cumsum(self.rd_per_site * np.minimum(weights @ self.rd_eligible, self.max_rd_sites), axis=1)
+        rd_amortization = np.diff(np.minimum(rd_charged, self.rd_program_cost), axis=1, prepend=0.0)
+        operating_profit = gross_profit - sg_and_a - d_and_a - rd_amortization
+        net_cash_flow = weights @ self.site_cash_flow
+        net_cash_flow[:, 1:] -= sg_and_a + rd_amortization
+
+        return {
+            "years": self.years,
+            "revenue": revenue,
+            "gross_profit": gross_profit,
+            "sg_and_a": sg_and_a,
+            "d_and_a": d_and_a,
+            "rd_amortization": rd_amortization,
+            "operating_profit": operating_profit,
+            "operating_cash_flow": operating_profit + d_and_a,
+            "capex": weights @ self.capex,
+            "net_cash_flow": net_cash_flow,
+            "total_investment": weights @ self.total_investment,
+            "npv": npv(rate, net_cash_flow),
+            "irr": irr(net_cash_flow),
+            "payback_period": payback_period(net_cash_flow),
+            "discounted_payback_period": payback_period(net_cash_flow, rate),
+        }
+
+    def allocate(self, weights=None, basis="revenue"):
+        """
+        Per-site results of one portfolio variant with the fleet's SG&A and R&D allocated in
+        proportion to `basis`: each site's revenue, its capacity (MW) or equal shares.
+        R&D is shared only among the sites in their R&D amortization years.
+
+        Returns:
+            dict: 'site', (sites x years) 'sg_and_a', 'rd_amortization' and 'operating_profit',
+                the (sites x years+1) 'net_cash_flow', and per-site 'payback_period' counted
+                from the site's own build year.
+        """
+        if basis not in ALLOCATION_BASES:
+            raise ValueError(f"basis must be one of {ALLOCATION_BASES}, got {basis!r}")
+        weights = self._weights(weights)
+        if weights.shape[0] != 1:
+            raise ValueError("allocate() takes the weights of a single portfolio variant")
+        fleet = self.evaluate(weights)
+        w = weights[0][:, None]
+
+        operating = self.revenue > 0
+        if basis == "revenue":
+            key = w * self.revenue
+        elif basis == "capacity":
+            key = w * self.sites["dc_size_mw"][:, None] * operating
+        else:
+            key = w * operating
+        eligible_key = key * self.rd_eligible
+
+        def share(key):
+            total = key.sum(axis=0)
+            return np.divide(key, total, out=np.zeros_like(key), where=total > 0)
+
+        sg_and_a = share(key) * fleet["sg_and_a"]
+        rd_amortization = share(eligible_key) * fleet["rd_amortization"]
+        operating_profit = w * (self.gross_profit - self.d_and_a) - sg_and_a - rd_amortization
+        net_cash_flow = w * self.site_cash_flow
+        net_cash_flow[:, 1:] -= sg_and_a + rd_amortization
+        # Shift every site's row so that its build year comes first.
+        columns = self.offset[:, None] + np.arange(self.horizon + 1)
+        own_years = np.where(
+            columns <= self.horizon,
+            np.take_along_axis(net_cash_flow, np.minimum(columns, self.horizon), axis=1),
+            0.0,
+        )
+        return {
+            "site": self.sites["site"],
+            "sg_and_a": sg_and_a,
+            "rd_amortization": rd_amortization,
+            "operating_profit": operating_profit,
+            "net_cash_flow": net_cash_flow,
+            "payback_period": payback_period(own_years),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-site portfolio roll-up.")
+    parser.add_argument("sites", help="sites table (.csv or .parquet) with columns: " + ", ".join(SITE_COLUMNS + OPTIONAL_SITE_COLUMNS))
+    parser.add_argument("--price", type=float, default=None, help="market price per 1M tokens (default: config)")
+    parser.add_argument("--config", default=None)
+    parser.add_argument("--horizon", type=int, default=None)
+    parser.add_argument("--allocation", choices=ALLOCATION_BASES, default="revenue", help="basis for allocating shared SG&A and R&D")
+    args = parser.parse_args(argv)
+
+    portfolio = Portfolio(load_sites(args.sites), args.price, args.config, args.horizon)
+    fleet = portfolio.evaluate()
+    detail = portfolio.allocate(basis=args.allocation)
+
+    print(f"{portfolio.size} sites, {portfolio.years[0]}-{portfolio.years[-1]}")
+    print(f"  total investment   ${fleet['total_investment'][0]:,.0f}")
+    print(f"  NPV                ${fleet['npv'][0]:,.0f}")
+    print(f"  IRR                {fleet['irr'][0]:.1%}")
+    print(f"  payback            {fleet['payback_period'][0]:.1f} years (discounted {fleet['discounted_payback_period'][0]:.1f})")
+    print(f"\n{'year':<6}{'revenue':>18}{'SG&A':>16}{'R&D':>16}{'op. profit':>18}{'net cash flow':>18}")
+    for k, year in enumerate(portfolio.years):
+        print(
+            f"{year:<6}{fleet['revenue'][0, k]:>18,.0f}{fleet['sg_and_a'][0, k]:>16,.0f}{fleet['rd_amortization'][0, k]:>16,.0f}"
+            f"{fleet['operating_profit'][0, k]:>18,.0f}{fleet['net_cash_flow'][0, k + 1]:>18,.0f}"
+        )
+    print(f"\n{'site':<16}{'R&D share':>16}{'SG&A share':>16}{'payback':>10}   ({args.allocation} basis)")
+    for i, site in enumerate(detail["site"]):
+        print(f"{site:<16}{detail['rd_amortization'][i].sum():>16,.0f}{detail['sg_and_a'][i].sum():>16,.0f}{detail['payback_period'][i]:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
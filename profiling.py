@@ -0,0 +1,210 @@
+# profiling.py (v1.0 - Stage Profiler)
+# Opt-in timings for the calculator pipeline stages and config loading: call counts, scenarios
+# processed and batch sizes, exported as a Chrome trace (chrome://tracing, Perfetto) or a
+# summary table. Enable with SIM_PROFILE=1 or profiling.enable(); when disabled, each hook is
+# a flag check returning a shared no-op object.
+#
+#   timer = profiling.stages("core", scenarios=n)
+#   ...; timer.lap("capacity")          # records core.capacity since the previous lap
+#   with profiling.span("config.load"):
+#       ...
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+MAX_EVENTS = 200_000  # trace events kept; the summary statistics are never truncated
+
+_enabled = os.environ.get("SIM_PROFILE") == "1"
+_lock = threading.Lock()
+_events = deque(maxlen=MAX_EVENTS)
+_stats = {}
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def reset():
+    with _lock:
+        _events.clear()
+        _stats.clear()
+
+
+@contextmanager
+def recording(clear=True):
+    """Enables profiling for the duration of the block (e.g. in a test or a notebook cell)."""
+    was_enabled = _enabled
+    if clear:
+        reset()
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def _add(event):
+    name, _, duration_ns, scenarios, _, _ = event
+    _events.append(event)
+    stat = _stats.get(name)
+    if stat is None:
+        # calls, scenarios, total ns, min ns, max ns, largest batch
+        stat = _stats[name] = [0, 0, 0, duration_ns, duration_ns, scenarios]
+    stat[0] += 1
+    stat[1] += scenarios
+    stat[2] += duration_ns
+    stat[3] = min(stat[3], duration_ns)
+    stat[4] = max(stat[4], duration_ns)
+    stat[5] = max(stat[5], scenarios)
+
+
+def _record(name, start_ns, end_ns, scenarios):
+    event = (name, start_ns, end_ns - start_ns, scenarios, os.getpid(), threading.get_ident())
+    with _lock:
+        _add(event)
+
+
+class _StageTimer:
+    __slots__ = ("prefix", "scenarios", "_last")
+
+    def __init__(self, prefix, scenarios):
+        self.prefix = prefix
+        self.scenarios = scenarios
+        self._last = time.perf_counter_ns()
+
+    def lap(self, stage):
+        now = time.perf_counter_ns()
+        _record(f"{self.prefix}.{stage}", self._last, now, self.scenarios)
+        self._last = now
+
+
+class _Span:
+    __slots__ = ("name", "scenarios", "_start")
+
+    def __init__(self, name, scenarios):
+        self.name = name
+        self.scenarios = scenarios
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        _record(self.name, self._start, time.perf_counter_ns(), self.scenarios)
+        return False
+
+
+class _Noop:
+    __slots__ = ()
+
+    def lap(self, stage):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _Noop()
+
+
+def stages(prefix, scenarios=1):
+    """A lap timer: each lap(stage) records `prefix.stage` since the previous lap."""
+    return _StageTimer(prefix, scenarios) if _enabled else _NOOP
+
+
+def span(name, scenarios=1):
+    """A context manager recording the time spent in its block under `name`."""
+    return _Span(name, scenarios) if _enabled else _NOOP
+
+
+# ===============================================
+# Export
+# ===============================================
+def drain():
+    """Returns and clears this process's events, e.g. to ship them from a worker process."""
+    with _lock:
+        events = list(_events)
+        _events.clear()
+        _stats.clear()
+    return events
+
+
+def merge(events):
+    """Adds events drained in another process."""
+    with _lock:
+        for event in events:
+            _add(tuple(event))
+
+
+def summary():
+    """Per-name statistics, slowest total first."""
+    with _lock:
+        stats = {name: list(stat) for name, stat in _stats.items()}
+    rows = []
+    for name, (calls, scenarios, total_ns, min_ns, max_ns, max_batch) in stats.items():
+        rows.append({
+            "name": name,
+            "calls": calls,
+            "scenarios": scenarios,
+            "total_ms": total_ns / 1e6,
+            "mean_us": total_ns / calls / 1e3,
+            "min_us": min_ns / 1e3,
+            "max_us": max_ns / 1e3,
+            "ns_per_scenario": total_ns / scenarios if scenarios else 0.0,
+            "mean_batch": scenarios / calls,
+            "max_batch": max_batch,
+        })
+    rows.sort(key=lambda row: row["total_ms"], reverse=True)
+    return rows
+
+
+def format_summary(rows=None):
+    rows = summary() if rows is None else rows
+    lines = [f"{'stage':<24}{'calls':>9}{'scenarios':>13}{'total ms':>12}{'mean us':>11}{'ns/scen':>10}{'batch':>10}"]
+    for row in rows:
+        lines.append(
+            f"{row['name']:<24}{row['calls']:>9,}{row['scenarios']:>13,}{row['total_ms']:>12.2f}"
+            f"{row['mean_us']:>11.1f}{row['ns_per_scenario']:>10.1f}{row['mean_batch']:>10.0f}"
+        )
+    return "\n".join(lines)
+
+
+def chrome_trace():
+    """The recorded events in Chrome trace-event format (complete 'X' events, microseconds)."""
+    with _lock:
+        events = list(_events)
+    return {
+        "displayTimeUnit": "ms",
+        "traceEvents": [
+            {
+                "name": name, "cat": name.split(".", 1)[0], "ph": "X",
+                "ts": start_ns / 1e3, "dur": duration_ns / 1e3, "pid": pid, "tid": tid,
+                "args": {"scenarios": scenarios},
+            }
+            for name, start_ns, duration_ns, scenarios, pid, tid in events
+        ],
+    }
+
+
+def write_chrome_trace(path):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(chrome_trace(), f)
+    os.replace(tmp, path)
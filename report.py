@@ -0,0 +1,232 @@
+# report.py (v1.0 - Strategy Report Pipeline)
+# Renders the interpreter's strategy narrative for every site of a sites table. Each chunk of
+# sites is one batch calculation that also evaluates the four benchmark strategies at the
+# same sites, so benchmark costs are an index lookup. Narratives come from the per-language
+# precompiled template, and reports are written one at a time to Markdown/HTML files or a zip
+# archive (also a stream), so memory stays bounded by the chunk size.
+#
+#   python report.py sites.csv reports.zip [--lang en] [--format md|html] [--price 1.5]
+#   python report.py sites.csv reports/        # one file per site plus an index
+import argparse
+import html
+import os
+import re
+import sys
+import zipfile
+from functools import lru_cache
+
+import numpy as np
+
+from calculator import calculate_core_business_case_batch
+from config_loader import resolve_config
+from interpreter import BENCHMARK_STRATEGIES, narrative_template
+from localization import t
+from portfolio import load_sites, site_overrides
+
+FORMATS = ("md", "html")
+DEFAULT_CHUNK_SIZE = 5_000
+
+
+def _take(sites, rows):
+    return {name: values[rows] for name, values in sites.items()}
+
+
+def _evaluate_chunk(sites, price, config):
+    """
+    Core results of the sites, then the benchmark strategies at the same sites, in one batch.
+
+    Returns (core columns, benchmark cost per 1M tokens (sites, strategies)).
+    """
+    n = len(sites["dc_size_mw"])
+    strategies = len(BENCHMARK_STRATEGIES)
+    ratios = np.array([ratio for ratio, _ in BENCHMARK_STRATEGIES.values()], dtype=float)
+    mirrormind = np.array([applied for _, applied in BENCHMARK_STRATEGIES.values()])
+    repeat = lambda values: np.concatenate([values, np.repeat(values, strategies)])
+    results = calculate_core_business_case_batch(
+        repeat(sites["dc_size_mw"]),
+        repeat(sites["use_clean_power"]),
+        np.concatenate([sites["apply_mirrormind"], np.tile(mirrormind, n)]),
+        np.concatenate([sites["high_perf_gpu_ratio"], np.tile(ratios, n)]),
+        repeat(sites["utilization_rate"]),
+        price,
+        config=config,
+        overrides={path: repeat(values) for path, values in site_overrides(sites, config).items()},
+    ).columns()
+
+    total_cost = results["pnl_revenue"] - results["pnl_operating_profit"]
+    serviced_m_tokens = results["serviced_tokens_t"] * 1e6
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cost_per_m_tokens = np.where(serviced_m_tokens > 0, total_cost / serviced_m_tokens, np.nan)
+    core = {name: column[:n] for name, column in results.items()}
+    return core, cost_per_m_tokens[n:].reshape(n, strategies)
+
+
+def _viability(core, sites, price, config):
+    """Columns for the viability paragraph, derived from the recommended tier fees."""
+    tiers = config.tier_table
+    fees = np.stack([core[f"{key}_recommended_fee"] for key in tiers.keys], axis=1)
+    users = np.stack([core[f"{key}_num_users"] for key in tiers.keys], axis=1)
+    # The recommended fees are exactly what recovers the investment in the payback target.
+    required_annual_revenue = (fees * users).sum(axis=1) * 12
+    paid_users = users[:, tiers.is_paid].sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        token_price = np.where(core["pnl_revenue"] > 0, price * required_annual_revenue / core["pnl_revenue"], 0.0)
+        user_fee = np.where(paid_users > 0, required_annual_revenue / 12 / paid_users, 0.0)
+    return {
+        "investment_per_mw": core["total_investment"] / sites["dc_size_mw"] / 1e6,
+        "required_annual_revenue": required_annual_revenue,
+        "price_per_million_tokens": token_price,
+        "monthly_fee_per_user": user_fee,
+    }
+
+
+def iter_reports(sites, lang="ko", market_price_per_m_tokens=None, config=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields (site, Markdown report) for every site of `sites` (see portfolio.load_sites),
+    evaluating `chunk_size` sites per batch.
+    """
+    config = resolve_config(config)
+    price = config.model_and_market.market_price_per_million_tokens if market_price_per_m_tokens is None else market_price_per_m_tokens
+    template = narrative_template(lang)
+    target_irr = config.finance.discount_rate * 100
+    options = list(BENCHMARK_STRATEGIES)
+    n = len(sites["dc_size_mw"])
+
+    for start in range(0, n, chunk_size):
+        chunk = _take(sites, slice(start, start + chunk_size))
+        core, benchmark = _evaluate_chunk(chunk, price, config)
+        summary = _viability(core, chunk, price, config)
+        # Python scalars once per chunk: the per-report loop below then does no array indexing.
+        columns = {name: values.tolist() for name, values in summary.items()}
+        benchmark_text = [[f"${cost:,.3f}" for cost in row] for row in benchmark.tolist()]
+        for i, (site, apply_mm, hw_ratio) in enumerate(zip(chunk["site"].tolist(), chunk["apply_mirrormind"].tolist(), chunk["high_perf_gpu_ratio"].tolist())):
+            narrative = template.render(
+                apply_mm=apply_mm,
+                hw_ratio=hw_ratio,
+                investment_per_mw=columns["investment_per_mw"][i],
+                target_irr=target_irr,
+                viability={name: values[i] for name, values in columns.items()},
+                benchmark=dict(zip(options, benchmark_text[i])),
+            )
+            yield site, f"# {site}\n\n{narrative}"
+
+
+def scenario_report(dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio, utilization_rate,
+                    market_price_per_m_tokens, lang="ko", config=None):
+    """The Markdown report of one scenario (the app's inputs)."""
+    sites = load_sites({
+        "site": [t("narrative_title", lang)],
+        "dc_size_mw": [dc_size_mw],
+        "use_clean_power": [use_clean_power],
+        "apply_mirrormind": [apply_mirrormind],
+        "high_perf_gpu_ratio": [high_perf_gpu_ratio],
+        "utilization_rate": [utilization_rate],
+    })
+    _, markdown = next(iter_reports(sites, lang, market_price_per_m_tokens, config))
+    return markdown.split("\n\n", 1)[1]  # without the site heading
+
+
+# --- Output ---
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+
+
+@lru_cache(maxsize=4096)  # most lines are fixed template text, repeated in every report
+def _inline(text):
+    return _BOLD.sub(r"<strong>\1</strong>", html.escape(text))
+
+
+def markdown_to_html(markdown, title, lang="ko"):
+    """HTML page for a report; handles the subset of Markdown the narrative uses."""
+    body = []
+    in_list = False
+    for line in markdown.splitlines():
+        item = line.startswith("   - ")
+        if in_list and not item:
+            body.append("</ul>")
+            in_list = False
+        if line.startswith("#"):
+            level = len(line) - len(line.lstrip("#"))
+            body.append(f"<h{level}>{_inline(line[level:].strip())}</h{level}>")
+        elif item:
+            if not in_list:
+                body.append("<ul>")
+                in_list = True
+            body.append(f"<li>{_inline(line[5:])}</li>")
+        elif line.strip():
+            body.append(f"<p>{_inline(line)}</p>")
+    if in_list:
+        body.append("</ul>")
+    return (
+        f'<!DOCTYPE html>\n<html lang="{lang}">\n<head><meta charset="utf-8"><title>{html.escape(title)}</title></head>\n'
+        f'<body>\n{chr(10).join(body)}\n</body>\n</html>\n'
+    )
+
+
+_UNSAFE = re.compile(r"[^\w.-]+")
+
+
+def _file_stem(index, site):
+    return f"{index:05d}_{_UNSAFE.sub('_', site).strip('_') or 'site'}"
+
+
+def _index_page(entries, fmt, lang):
+    title = t("report_index_title", lang)
+    if fmt == "md":
+        return f"# {title}\n\n" + "".join(f"- [{site}]({name})\n" for site, name in entries)
+    links = "\n".join(f'<li><a href="{html.escape(name)}">{html.escape(site)}</a></li>' for site, name in entries)
+    return markdown_to_html(f"# {title}", title, lang).replace("</body>", f"<ul>\n{links}\n</ul>\n</body>")
+
+
+def write_reports(reports, out, fmt="md", lang="ko"):
+    """
+    Writes (site, Markdown) pairs one at a time plus an index page, and returns the count.
+
+    `out` is a directory, a path ending in .zip, or a writable binary stream (zip format;
+    it need not be seekable, e.g. sys.stdout.buffer or an HTTP response).
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {FORMATS}, got {fmt!r}")
+    render = (lambda markdown, title: markdown) if fmt == "md" else (lambda markdown, title: markdown_to_html(markdown, title, lang))
+    entries = []
+
+    def pages():
+        for index, (site, markdown) in enumerate(reports, start=1):
+            name = f"{_file_stem(index, site)}.{fmt}"
+            entries.append((site, name))
+            yield name, render(markdown, site)
+        yield f"index.{fmt}", _index_page(entries, fmt, lang)
+
+    if hasattr(out, "write") or str(out).endswith(".zip"):
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+            for name, text in pages():
+                archive.writestr(name, text)
+    else:
+        os.makedirs(out, exist_ok=True)
+        for name, text in pages():
+            with open(os.path.join(out, name), "w", encoding="utf-8") as f:
+                f.write(text)
+    return len(entries)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render strategy reports for every site of a sites table.")
+    parser.add_argument("sites", help="sites .csv/.parquet (see portfolio.py)")
+    parser.add_argument("out", help="output directory, .zip path, or - for a zip on stdout")
+    parser.add_argument("--lang", default="ko", choices=("ko", "en"))
+    parser.add_argument("--format", default="md", choices=FORMATS)
+    parser.add_argument("--price", type=float, default=None, help="market price per M tokens")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--config", default=None)
+    args = parser.parse_args(argv)
+
+    sites = load_sites(args.sites)
+    reports = iter_reports(sites, args.lang, args.price, args.config, args.chunk_size)
+    out = sys.stdout.buffer if args.out == "-" else args.out
+    count = write_reports(reports, out, args.format, args.lang)
+    if args.out != "-":
+        print(f"{count:,} reports written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+# result_cache.py (v1.0 - Result Memoization)
+# Input-keyed LRU memoization for the core and what-if calculators, plus an optional
+# precomputed tensor covering the app's discrete slider grid.
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from calculator import calculate_core_business_case, calculate_core_business_case_batch
+from config_loader import resolve_config
+from what_if_calculator import analyze_fixed_fee_scenario
+
+
+class LRUCache:
+    """A small thread-safe LRU mapping with hit/miss counters."""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+_core_cache = LRUCache(maxsize=1024)
+_what_if_cache = LRUCache(maxsize=4096)
+
+
+def _core_key(config, dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio, utilization_rate, market_price_per_m_tokens):
+    # Round floats so that e.g. slider values 1.5000000000000002 and 1.5 share an entry.
+    return (
+        config.path, config.config_hash,
+        round(float(dc_size_mw), 9), str(use_clean_power), bool(apply_mirrormind),
+        round(float(high_perf_gpu_ratio), 9), round(float(utilization_rate), 9),
+        round(float(market_price_per_m_tokens), 9),
+    )
+
+
+def cached_core_business_case(
+    dc_size_mw,
+    use_clean_power,
+    apply_mirrormind,
+    high_perf_gpu_ratio,
+    utilization_rate,
+    market_price_per_m_tokens,
+    config=None,
+    grid=None,
+    store=None
+):
+    """
+    Memoized `calculate_core_business_case`. When a SliderGrid is given and the inputs lie
+    on it, the result is read from the grid instead of being computed; otherwise a
+    ResultStore (result_store.py), when given, serves scenarios it already holds.
+
+    The returned dict is shared between callers and must be treated as read-only.
+    """
+    config = resolve_config(config)
+    key = _core_key(config, dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio, utilization_rate, market_price_per_m_tokens)
+
+    def compute():
+        if grid is not None and grid.config_hash == config.config_hash:
+            result = grid.lookup(dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio, utilization_rate, market_price_per_m_tokens)
+            if result is not None:
+                return result
+        if store is not None and store.config.config_hash == config.config_hash:
+            result = store.lookup_scenario(dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio, utilization_rate, market_price_per_m_tokens)
+            if result is not None:
+                return result
+        return calculate_core_business_case(
+            dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio,
+            utilization_rate, market_price_per_m_tokens, config=config
+        )
+    return _core_cache.get_or_compute(key, compute)
+
+
+def cached_fixed_fee_scenario(core_key_inputs, core_results, standard_fee, premium_fee, config=None, tier_fees=None):
+    """
+    Memoized `analyze_fixed_fee_scenario`.
+
+    `core_key_inputs` is the tuple of six scenario inputs `core_results` was computed from;
+    it identifies the core result without hashing the nested dict.
+    """
+    config = resolve_config(config)
+    if tier_fees is None:
+        fees = (round(float(standard_fee), 9), round(float(premium_fee), 9))
+    else:
+        items = tier_fees.items() if isinstance(tier_fees, dict) else enumerate(tier_fees)
+        fees = tuple((k, round(float(fee), 9)) for k, fee in items)
+    key = (_core_key(config, *core_key_inputs), *fees)
+    return _what_if_cache.get_or_compute(key, lambda: analyze_fixed_fee_scenario(core_results, standard_fee, premium_fee, tier_fees))
+
+
+def cache_info():
+    return {
+        "core": {"size": len(_core_cache), "hits": _core_cache.hits, "misses": _core_cache.misses},
+        "what_if": {"size": len(_what_if_cache), "hits": _what_if_cache.hits, "misses": _what_if_cache.misses},
+    }
+
+
+def clear_caches():
+    _core_cache.clear()
+    _what_if_cache.clear()
+
+
+# ===============================================
+# Precomputed slider grid
+# ===============================================
+class SliderGrid:
+    """
+    Results tensor over the sidebar's discrete grid: size 10-300 MW, GPU ratio and
+    utilization in steps of 5, both power sources and MirrorMind on/off.
+
+    Every output of the core model is affine in the market token price (revenue, SG&A and
+    the per-user figures scale linearly; the recommended fees do not depend on it), so the
+    price axis is stored as two anchors at $1 and $2 and any price, including the slider's
+    0.1 steps, is an exact linear interpolation of them.
+    """
+
+    DC_SIZES = np.arange(10, 301)
+    GPU_RATIOS = np.arange(0, 101, 5)
+    UTILIZATION_RATES = np.arange(40, 101, 5)
+
+    def __init__(self, config=None):
+        config = resolve_config(config)
+        self.config = config
+        self.config_hash = config.config_hash
+        self.shape = (self.DC_SIZES.size, self.GPU_RATIOS.size, self.UTILIZATION_RATES.size, 2, 2)
+
+        dc, ratio, util, renewable, mirrormind = (
+            axis.ravel() for axis in np.meshgrid(
+                self.DC_SIZES, self.GPU_RATIOS, self.UTILIZATION_RATES, [False, True], [False, True],
+                indexing='ij'
+            )
+        )
+        at_1 = calculate_core_business_case_batch(dc, renewable, mirrormind, ratio, util, 1.0, config=config)
+        at_2 = calculate_core_business_case_batch(dc, renewable, mirrormind, ratio, util, 2.0, config=config)
+
+        self.tier_name_keys = at_1['segment_narratives']['tier_name_key']
+        self.total_investment = at_1['total_investment']
+        self.assumptions = at_1['assumptions']
+        self.recommendation = at_1['recommendation']
+        # Price-dependent columns as (value at $1, slope per $1).
+        self.pnl = {key: (value, at_2['pnl_annual'][key] - value) for key, value in at_1['pnl_annual'].items()}
+        self.segments = {
+            key: (value, at_2['segment_narratives'][key] - value)
+            for key, value in at_1['segment_narratives'].items() if key != 'tier_name_key'
+        }
+
+    @property
+    def nbytes(self):
+        arrays = [self.total_investment, *self.assumptions.values(), *self.recommendation.values()]
+        arrays += [a for pair in (*self.pnl.values(), *self.segments.values()) for a in pair]
+        return sum(a.nbytes for a in arrays)
+
+    def _index(self, dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio, utilization_rate):
+        coords = []
+        for value, axis in ((dc_size_mw, self.DC_SIZES), (high_perf_gpu_ratio, self.GPU_RATIOS), (utilization_rate, self.UTILIZATION_RATES)):
+            position = int(np.searchsorted(axis, value))
+            if position >= axis.size or not np.isclose(axis[position], value):
+                return None
+            coords.append(position)
+        coords += [int(use_clean_power == 'Renewable'), int(bool(apply_mirrormind))]
+        return int(np.ravel_multi_index(coords, self.shape))
+
+    def lookup(self, dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio, utilization_rate, market_price_per_m_tokens):
+        """Returns the scalar-layout results dict, or None when the inputs are off the grid."""
+        i = self._index(dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio, utilization_rate)
+        if i is None:
+            return None
+        dp = float(market_price_per_m_tokens) - 1.0
+
+        pnl_annual = {key: float(base[i] + dp * slope[i]) for key, (base, slope) in self.pnl.items()}
+        segment_narratives = [
+            {"tier_name_key": name, **{key: float(base[i, j] + dp * slope[i, j]) for key, (base, slope) in self.segments.items()}}
+            for j, name in enumerate(self.tier_name_keys)
+        ]
+        # num_users does not depend on the price; drop the interpolation noise.
+        for j, segment in enumerate(segment_narratives):
+            segment['num_users'] = float(self.segments['num_users'][0][i, j])
+        return {
+            "pnl_annual": pnl_annual,
+            "segment_narratives": segment_narratives,
+            "total_investment": float(self.total_investment[i]),
+            "assumptions": {
+                "gpu_mix_string": f"H:{int(self.assumptions['num_high_perf_gpus'][i])} / S:{int(self.assumptions['num_standard_gpus'][i])}",
+                "utilization_rate": utilization_rate,
+                "serviced_tokens_t": float(self.assumptions['serviced_tokens_t'][i]),
+            },
+            "recommendation": {
+                "standard_fee": float(self.recommendation['standard_fee'][i]),
+                "premium_fee": float(self.recommendation['premium_fee'][i]),
+                "is_achievable": bool(self.recommendation['is_achievable'][i]),
+            },
+        }
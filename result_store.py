@@ -0,0 +1,402 @@
+# result_store.py (v1.0 - Shared Result Store)
+# A persistent, memory-mapped store of batch results shared by app sessions, worker
+# processes and CLI runs. Results live in one generation directory per config hash (and
+# stored layout version), as
+# immutable segment files that are only ever added (atomic rename), so readers need no locks
+# and map the same pages. Fills take an advisory file lock so concurrent runs do not compute
+# the same scenarios twice; old generations are evicted to keep the store under a size bound.
+#
+# Every output of the core model is affine in the market token price (see SliderGrid), so a
+# scenario is keyed by its other five inputs and stored as (value at $1, slope per $1).
+#
+#   python result_store.py warm      # prebuild the app's default slider grid
+#   python result_store.py stats
+#   python result_store.py evict [--max-bytes N]
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+
+from batch_result import BatchResult
+from calculator import _scenario_arrays, calculate_core_business_case_batch
+from config_loader import resolve_config
+
+try:
+    import fcntl
+except ImportError:  # Windows: fills may duplicate work, but segments stay consistent
+    fcntl = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_STORE_DIR = os.environ.get("SIM_RESULT_STORE_DIR", os.path.join(ROOT, ".result_store"))
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+KEY_FIELDS = ('key_dc_size_mw', 'key_use_clean_power', 'key_apply_mirrormind', 'key_high_perf_gpu_ratio', 'key_utilization_rate')
+SLOPE_SUFFIX = '__slope'
+META_NAME = 'meta.json'
+# Bumped whenever the stored columns change, so older generations are left to eviction
+# instead of being appended to with a different row layout.
+LAYOUT_VERSION = 2
+
+
+def _scenario_keys(dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio, utilization_rate):
+    """(n, 5) float64 keys, rounded like result_cache so near-equal slider values match."""
+    return np.round(np.stack([
+        np.asarray(dc_size_mw, dtype=float),
+        np.asarray(use_clean_power, dtype=float),
+        np.asarray(apply_mirrormind, dtype=float),
+        np.asarray(high_perf_gpu_ratio, dtype=float),
+        np.asarray(utilization_rate, dtype=float),
+    ], axis=1), 9) + 0.0  # + 0.0 folds -0.0 into 0.0
+
+
+def _hash_keys(keys):
+    # murmur3 fmix64 over the float bit patterns, one key field at a time (float keys differ
+    # mostly in their high bits, so every step must mix high bits down). Equal keys always
+    # hash equally; collisions are ruled out by comparing the keys themselves.
+    bits = np.ascontiguousarray(keys).view(np.uint64)
+    h = np.zeros(len(keys), dtype=np.uint64)
+    for k in range(bits.shape[1]):
+        h ^= bits[:, k]
+        h ^= h >> np.uint64(33)
+        h *= np.uint64(0xff51afd7ed558ccd)
+        h ^= h >> np.uint64(33)
+        h *= np.uint64(0xc4ceb9fe1a85ec53)
+        h ^= h >> np.uint64(33)
+    return h
+
+
+class _Segment:
+    """
+    One immutable segment file, memory-mapped read-only: a (fields x scenarios) float64
+    matrix, so every stored column is one contiguous row. A sorted hash index sits beside it.
+    """
+
+    __slots__ = ('path', 'data', 'hashes', 'order', 'keys')
+
+    def __init__(self, path):
+        self.path = path
+        # Plain ndarray views of the maps: zero-copy, without np.memmap's per-access overhead.
+        self.data = np.load(path, mmap_mode='r').view(np.ndarray)
+        index = np.load(path[:-len('.npy')] + '.idx.npy', mmap_mode='r').view(np.ndarray)
+        self.hashes = index[0]
+        self.order = index[1]
+        self.keys = self.data[:len(KEY_FIELDS)]
+
+    def find(self, keys, hashes):
+        """Returns (positions in `keys` found here, their rows in this segment)."""
+        if not len(self.hashes):
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        pos = np.minimum(np.searchsorted(self.hashes, hashes), len(self.hashes) - 1)
+        candidates = np.flatnonzero(self.hashes[pos] == hashes)
+        rows = self.order[pos[candidates]].astype(np.intp)
+        match = np.ones(len(candidates), dtype=bool)
+        for k in range(len(KEY_FIELDS)):
+            match &= self.keys[k, rows] == keys[candidates, k]
+        return candidates[match], rows[match]
+
+
+class ResultStore:
+    """
+    The store generation for one config.
+
+        store = ResultStore(config=config)
+        results = store.get_or_compute(dc, power, mirrormind, ratio, util, price)  # BatchResult
+
+    Reads never block; `get_or_compute` appends the scenarios it had to compute.
+    """
+
+    def __init__(self, root=None, config=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.config = resolve_config(config)
+        self.root = os.path.abspath(root or DEFAULT_STORE_DIR)
+        self.directory = os.path.join(self.root, generation_name(self.config))
+        self.max_bytes = max_bytes
+        self.meta = None
+        self._segments = {}
+        os.makedirs(self.directory, exist_ok=True)
+        os.utime(self.directory)  # marks the generation as recently used for eviction
+
+    # --- Reading ---
+    def refresh(self):
+        """Maps segments added since the last call (by this or any other process)."""
+        if not os.path.isdir(self.directory):  # evicted by another process; start over
+            os.makedirs(self.directory, exist_ok=True)
+            self._segments, self.meta = {}, None
+        if self.meta is None and os.path.exists(os.path.join(self.directory, META_NAME)):
+            with open(os.path.join(self.directory, META_NAME)) as f:
+                self.meta = json.load(f)
+        for name in sorted(os.listdir(self.directory)):
+            if name.startswith('seg-') and name.endswith('.npy') and not name.endswith('.idx.npy') and name not in self._segments:
+                self._segments[name] = _Segment(os.path.join(self.directory, name))
+
+    @property
+    def fields(self):
+        """Row names of the segment matrices: keys, column values at $1, then slopes."""
+        return [*KEY_FIELDS, *self.meta['columns'], *(name + SLOPE_SUFFIX for name in self.meta['sloped'])]
+
+    def segments(self):
+        """Per segment, {field: zero-copy memory-mapped column}."""
+        self.refresh()
+        if self.meta is None:
+            return []
+        return [dict(zip(self.fields, segment.data)) for segment in self._segments.values()]
+
+    def __len__(self):
+        self.refresh()
+        return sum(segment.data.shape[1] for segment in self._segments.values())
+
+    def _locate(self, keys):
+        """Per scenario: segment index (-1 when missing) and row."""
+        self.refresh()
+        # Probing in hash order makes the binary searches walk each index sequentially.
+        order = np.argsort(_hash_keys(keys))
+        keys = keys[order]
+        hashes = _hash_keys(keys)
+        segment_of = np.full(len(keys), -1, dtype=np.intp)
+        row_of = np.zeros(len(keys), dtype=np.intp)
+        for s, segment in enumerate(self._segments.values()):
+            missing = np.flatnonzero(segment_of < 0)
+            if not len(missing):
+                break
+            found, rows = segment.find(keys[missing], hashes[missing])
+            segment_of[missing[found]] = s
+            row_of[missing[found]] = rows
+        unsorted = np.empty_like(order)
+        unsorted[order] = np.arange(len(order))
+        return segment_of[unsorted], row_of[unsorted]
+
+    def _gather(self, segment_of, row_of, price):
+        """Columns at `price` for scenarios that are all present."""
+        names, sloped = self.meta['columns'], self.meta['sloped']
+        first = len(KEY_FIELDS)
+        slope_rows = [names.index(name) for name in sloped]
+        # Gather in (segment, row) order so each mapped column is read front to back, then
+        # restore the caller's order with one in-memory permutation.
+        order = np.argsort((segment_of << 40) | row_of)
+        segment_of, row_of = segment_of[order], row_of[order]
+        block = np.empty((len(names) + len(sloped), len(order)))
+        segments = list(self._segments.values())
+        for span in np.split(np.arange(len(order)), np.flatnonzero(np.diff(segment_of)) + 1):
+            np.take(segments[segment_of[span[0]]].data[first:], row_of[span], axis=1, out=block[:, span[0]:span[-1] + 1])
+        values = block[:len(names)]
+        values[slope_rows] += (price[order] - 1.0) * block[len(names):]
+        unsorted = np.empty_like(order)
+        unsorted[order] = np.arange(len(order))
+        values = values[:, unsorted]
+        columns = {
+            name: values[k].astype(bool) if dtype == 'bool' else values[k]
+            for k, (name, dtype) in enumerate(zip(names, self.meta['dtypes']))
+        }
+        return BatchResult.from_columns(columns, self.meta['tier_name_keys'])
+
+    def lookup(self, dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio, utilization_rate, market_price_per_m_tokens):
+        """BatchResult when every scenario is stored (and priced above 0), else None."""
+        dc, power, mirrormind, ratio, util, price = _scenario_arrays(
+            dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio, utilization_rate, market_price_per_m_tokens
+        )
+        if self.meta is None:
+            self.refresh()
+        if self.meta is None or not np.all(price > 0):
+            return None
+        segment_of, row_of = self._locate(_scenario_keys(dc, power, mirrormind, ratio, util))
+        if np.any(segment_of < 0):
+            return None
+        return self._gather(segment_of, row_of, price)
+
+    def lookup_scenario(self, *inputs):
+        """The scalar-layout results dict for one scenario, or None when it is not stored."""
+        results = self.lookup(*inputs)
+        return None if results is None else results.row(0).to_dict()
+
+    # --- Writing ---
+    @contextmanager
+    def _fill_lock(self):
+        with open(os.path.join(self.directory, '.lock'), 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _append(self, keys):
+        """Computes and appends the given unique keys as one new segment."""
+        key_args = (keys[:, 0], keys[:, 1] > 0, keys[:, 2] > 0, keys[:, 3], keys[:, 4])
+        at_1 = calculate_core_business_case_batch(*key_args, 1.0, config=self.config)
+        at_2 = calculate_core_business_case_batch(*key_args, 2.0, config=self.config)
+        base, shifted = at_1.columns(), at_2.columns()
+
+        sloped = [name for name, column in base.items() if column.dtype.kind == 'f']
+        data = np.concatenate([
+            keys.T,
+            np.stack([column.astype(float) for column in base.values()]),
+            np.stack([shifted[name] - base[name] for name in sloped]),
+        ])
+
+        hashes = _hash_keys(keys)
+        order = np.argsort(hashes, kind='stable')
+        index = np.stack([hashes[order], order.astype(np.uint64)])
+
+        if self.meta is None:
+            self.meta = {
+                'config_hash': self.config.config_hash,
+                'tier_name_keys': list(at_1.tier_name_keys),
+                'columns': list(base),
+                'dtypes': [str(column.dtype) for column in base.values()],
+                'sloped': sloped,
+            }
+            _write_atomic(os.path.join(self.directory, META_NAME), lambda f: f.write(json.dumps(self.meta, indent=2).encode()))
+        name = f"seg-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        # The index is published first: a data file is only visible once both are complete.
+        _write_atomic(os.path.join(self.directory, name + '.idx.npy'), lambda f: np.save(f, index))
+        _write_atomic(os.path.join(self.directory, name + '.npy'), lambda f: np.save(f, data))
+
+    def fill(self, keys):
+        """Ensures every key in the (n, 5) array is stored; returns the number computed."""
+        keys = np.unique(keys, axis=0)
+        segment_of, _ = self._locate(keys)
+        if np.all(segment_of >= 0):
+            return 0
+        with self._fill_lock():
+            segment_of, _ = self._locate(keys)  # another process may have filled them meanwhile
+            missing = keys[segment_of < 0]
+            if len(missing):
+                self._append(missing)
+        evict(self.root, self.max_bytes, keep=generation_name(self.config))
+        return len(missing)
+
+    def get_or_compute(self, dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio, utilization_rate, market_price_per_m_tokens):
+        """Like calculate_core_business_case_batch, serving stored scenarios and storing the rest."""
+        dc, power, mirrormind, ratio, util, price = _scenario_arrays(
+            dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio, utilization_rate, market_price_per_m_tokens
+        )
+        if not np.all(price > 0):
+            # The stored price slope does not hold at a zero price (no revenue to scale).
+            return calculate_core_business_case_batch(dc, power, mirrormind, ratio, util, price, config=self.config)
+        keys = _scenario_keys(dc, power, mirrormind, ratio, util)
+        self.fill(keys)
+        self.refresh()
+        return self._gather(*self._locate(keys), price)
+
+
+def _write_atomic(path, write):
+    tmp = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp, 'wb') as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def _directory_bytes(path):
+    total = 0
+    for entry in os.scandir(path):
+        if entry.is_file():
+            total += entry.stat().st_size
+    return total
+
+
+def generation_name(config):
+    """Directory name of `config`'s generation."""
+    return f"{config.config_hash}-v{LAYOUT_VERSION}"
+
+
+def generations(root=None):
+    """[(generation name, bytes, last used)] for every generation, least recently used first."""
+    root = root or DEFAULT_STORE_DIR
+    if not os.path.isdir(root):
+        return []
+    found = []
+    for entry in os.scandir(root):
+        if entry.is_dir():
+            found.append((entry.name, _directory_bytes(entry.path), entry.stat().st_mtime))
+    return sorted(found, key=lambda generation: generation[2])
+
+
+def evict(root=None, max_bytes=DEFAULT_MAX_BYTES, keep=None):
+    """Removes least recently used generations (never `keep`) until the store fits max_bytes."""
+    root = root or DEFAULT_STORE_DIR
+    found = generations(root)
+    total = sum(size for _, size, _ in found)
+    removed = []
+    for name, size, _ in found:
+        if total <= max_bytes:
+            break
+        if name == keep:
+            continue
+        directory = os.path.join(root, name)
+        with _try_fill_lock(directory) as locked:
+            if not locked:
+                continue  # another process is filling it; its segments must not vanish mid-write
+            # Open memory maps in other processes stay valid after the files are unlinked.
+            for entry in os.scandir(directory):
+                os.remove(entry.path)
+            os.rmdir(directory)
+        total -= size
+        removed.append(name)
+    return removed
+
+
+@contextmanager
+def _try_fill_lock(directory):
+    """Takes a generation's fill lock without waiting; yields whether it was acquired."""
+    try:
+        f = open(os.path.join(directory, '.lock'), 'a')
+    except FileNotFoundError:  # evicted by another process meanwhile
+        yield False
+        return
+    with f:
+        if fcntl is None:
+            yield True
+            return
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def default_grid_keys():
+    """Keys of the app's slider grid (see result_cache.SliderGrid)."""
+    from result_cache import SliderGrid
+    axes = np.meshgrid(SliderGrid.DC_SIZES, [0.0, 1.0], [0.0, 1.0], SliderGrid.GPU_RATIOS, SliderGrid.UTILIZATION_RATES, indexing='ij')
+    return _scenario_keys(*(axis.ravel() for axis in axes))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared on-disk result store.")
+    parser.add_argument("--root", default=None, help=f"store directory (default {DEFAULT_STORE_DIR})")
+    parser.add_argument("--config", default=None)
+    sub = parser.add_subparsers(dest="command", required=True)
+    warm = sub.add_parser("warm", help="prebuild the app's default slider grid")
+    warm.add_argument("--chunk-size", type=int, default=100_000)
+    sub.add_parser("stats", help="list generations")
+    evict_parser = sub.add_parser("evict", help="drop stale generations beyond a size bound")
+    evict_parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES)
+    args = parser.parse_args(argv)
+
+    if args.command == "warm":
+        store = ResultStore(args.root, args.config)
+        keys = default_grid_keys()
+        start = time.perf_counter()
+        computed = sum(store.fill(keys[i:i + args.chunk_size]) for i in range(0, len(keys), args.chunk_size))
+        print(f"{len(keys):,} grid scenarios, {computed:,} computed in {time.perf_counter() - start:.1f}s -> {store.directory}")
+    elif args.command == "stats":
+        current = generation_name(resolve_config(args.config))
+        for name, size, used in generations(args.root):
+            marker = " (current config)" if name == current else ""
+            print(f"{name[:16]}..{name[-3:]}  {size / 1e6:10.1f} MB  last used {time.strftime('%Y-%m-%d %H:%M', time.localtime(used))}{marker}")
+    else:
+        removed = evict(args.root, args.max_bytes, keep=generation_name(resolve_config(args.config)))
+        print(f"removed {len(removed)} generation(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+# sensitivity.py (v1.0 - Analytic Sensitivities)
+# Exact gradients and elasticities of the core outputs via forward-mode dual numbers pushed
+# through the batch engine, batched over many base points and all parameters at once.
+import numpy as np
+
+from calculator import OVERRIDABLE_PARAMS, SCENARIO_COLUMNS, _evaluate_batch, _scenario_arrays
+from config_loader import resolve_config
+
+SCENARIO_PARAMS = ('dc_size_mw', 'high_perf_gpu_ratio', 'utilization_rate', 'market_price_per_m_tokens')
+OUTPUTS = ('operating_profit', 'annual_cash_flow', 'payback_period', 'standard_fee', 'premium_fee')
+
+
+class Dual:
+    """
+    Forward-mode dual number over arrays: `value` has the scenario shape and `derivative`
+    one extra trailing axis holding d(value)/d(parameter_k) for every seeded parameter.
+
+    Floor division has a zero derivative almost everywhere; with `relax_floor` (the
+    default) it is differentiated as true division instead, i.e. GPU counts are treated
+    as continuous, which is what a sensitivity question about GPU prices usually means.
+    """
+
+    __array_priority__ = 1000
+
+    def __init__(self, value, derivative, relax_floor=True):
+        self.value = np.asarray(value, dtype=float)
+        self.derivative = np.asarray(derivative, dtype=float)
+        self.relax_floor = relax_floor
+
+    # --- helpers ---
+    @staticmethod
+    def _parts(x):
+        if isinstance(x, Dual):
+            return x.value, x.derivative
+        return np.asarray(x), None
+
+    def _new(self, value, derivative):
+        if derivative is None:
+            return value
+        return Dual(value, derivative, self.relax_floor)
+
+    @staticmethod
+    def _lift(x):
+        # Adds the trailing parameter axis to a value so it broadcasts against derivatives.
+        return np.asarray(x)[..., None]
+
+    @property
+    def shape(self):
+        return self.value.shape
+
+    @property
+    def ndim(self):
+        return self.value.ndim
+
+    def __len__(self):
+        return len(self.value)
+
+    def __getitem__(self, index):
+        index = index if isinstance(index, tuple) else (index,)
+        return Dual(self.value[index], self.derivative[index + (Ellipsis,)], self.relax_floor)
+
+    def sum(self, axis=None):
+        if axis is None:
+            return Dual(self.value.sum(), self.derivative.reshape(-1, self.derivative.shape[-1]).sum(axis=0), self.relax_floor)
+        axis = axis % self.value.ndim
+        return Dual(self.value.sum(axis=axis), self.derivative.sum(axis=axis), self.relax_floor)
+
+    # --- NumPy protocol ---
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != '__call__' or kwargs:
+            return NotImplemented
+        if ufunc.nin == 1:
+            a, da = self._parts(inputs[0])
+            if ufunc is np.negative:
+                return self._new(-a, -da)
+            if ufunc is np.positive:
+                return self._new(a, da)
+            return NotImplemented
+        (a, da), (b, db) = self._parts(inputs[0]), self._parts(inputs[1])
+        if ufunc in (np.greater, np.greater_equal, np.less, np.less_equal, np.equal, np.not_equal):
+            return ufunc(a, b)
+        if ufunc is np.add:
+            return self._new(a + b, _add(da, db))
+        if ufunc is np.subtract:
+            return self._new(a - b, _add(da, None if db is None else -db))
+        if ufunc is np.multiply:
+            return self._new(a * b, _add(None if da is None else da * self._lift(b), None if db is None else self._lift(a) * db))
+        if ufunc is np.true_divide or (ufunc is np.floor_divide and self.relax_floor):
+            value = a / b if ufunc is np.true_divide else a // b
+            return self._new(value, _add(
+                None if da is None else da / self._lift(b),
+                None if db is None else -self._lift(a / b ** 2) * db,
+            ))
+        if ufunc is np.floor_divide:
+            return a // b
+        return NotImplemented
+
+    def __array_function__(self, func, types, args, kwargs):
+        if func is np.where:
+            condition, x, y = args
+            (xv, dx), (yv, dy) = self._parts(x), self._parts(y)
+            value = np.where(condition, xv, yv)
+            shape = value.shape + (self.derivative.shape[-1],)
+            dx = np.zeros(shape) if dx is None else dx
+            dy = np.zeros(shape) if dy is None else dy
+            return Dual(value, np.where(self._lift(condition), dx, dy), self.relax_floor)
+        if func in (np.full_like, np.zeros_like, np.ones_like):
+            proto, *rest = args
+            return func(self._parts(proto)[0], *rest, **kwargs)
+        return NotImplemented
+
+    # --- operators ---
+    def __add__(self, other): return np.add(self, other)
+    def __radd__(self, other): return np.add(other, self)
+    def __sub__(self, other): return np.subtract(self, other)
+    def __rsub__(self, other): return np.subtract(other, self)
+    def __mul__(self, other): return np.multiply(self, other)
+    def __rmul__(self, other): return np.multiply(other, self)
+    def __truediv__(self, other): return np.true_divide(self, other)
+    def __rtruediv__(self, other): return np.true_divide(other, self)
+    def __floordiv__(self, other): return np.floor_divide(self, other)
+    def __rfloordiv__(self, other): return np.floor_divide(other, self)
+    def __neg__(self): return np.negative(self)
+    def __gt__(self, other): return np.greater(self, other)
+    def __ge__(self, other): return np.greater_equal(self, other)
+    def __lt__(self, other): return np.less(self, other)
+    def __le__(self, other): return np.less_equal(self, other)
+
+
+def _add(da, db):
+    if da is None:
+        return db
+    if db is None:
+        return da
+    return da + db
+
+
+def calculate_sensitivities(
+    dc_size_mw,
+    use_clean_power,
+    apply_mirrormind,
+    high_perf_gpu_ratio,
+    utilization_rate,
+    market_price_per_m_tokens,
+    parameters=None,
+    config=None,
+    relax_floor=True
+):
+    """
+    Gradients and elasticities of OUTPUTS with respect to scenario inputs and config values.
+
+    One forward pass of the batch engine evaluates every base point (inputs may be arrays)
+    and every parameter together; no finite-difference re-runs are needed.
+
+    Args:
+        parameters (list | None): Names from SCENARIO_PARAMS and config paths from
+            calculator.OVERRIDABLE_PARAMS. Defaults to all of them.
+
+    Returns:
+        dict: 'parameters' (names), 'values' {name: (n,) base values}, 'base' {output: (n,)},
+            'gradient' {output: (n, k)} and 'elasticity' {output: (n, k)} where elasticity is
+            d(output)/d(param) * param / output (NaN when the output is 0).
+    """
+    config = resolve_config(config)
+    parameters = list(parameters) if parameters is not None else list(SCENARIO_PARAMS) + list(OVERRIDABLE_PARAMS)
+    unknown = [p for p in parameters if p not in SCENARIO_PARAMS and p not in OVERRIDABLE_PARAMS]
+    if unknown:
+        raise ValueError(f"Unknown sensitivity parameter(s): {unknown}")
+
+    arrays = _scenario_arrays(
+        dc_size_mw, use_clean_power, apply_mirrormind, high_perf_gpu_ratio,
+        utilization_rate, market_price_per_m_tokens
+    )
+    inputs = dict(zip(SCENARIO_COLUMNS, arrays))
+    n, k = arrays[0].size, len(parameters)
+
+    # --- 1. Seed one unit direction per parameter ---
+    values = {}
+    overrides = {}
+    for j, name in enumerate(parameters):
+        base = inputs[name] if name in SCENARIO_PARAMS else np.full(n, float(config.get(name)))
+        seed = np.zeros((n, k))
+        seed[:, j] = 1.0
+        values[name] = base
+        dual = Dual(base, seed, relax_floor)
+        if name in SCENARIO_PARAMS:
+            inputs[name] = dual
+        else:
+            overrides[name] = dual
+
+    # --- 2. One forward pass ---
+    results = _evaluate_batch(**inputs, config=config, overrides=overrides)
+    pnl = results['pnl_annual']
+    cash_flow = _as_dual(pnl['annual_cash_flow'], n, k)
+    total_investment = _as_dual(results['total_investment'], n, k)
+    recovers = cash_flow.value > 0
+    payback = np.where(recovers, total_investment / np.where(recovers, cash_flow, 1.0), np.nan)
+    outputs = {
+        'operating_profit': pnl['operating_profit'],
+        'annual_cash_flow': cash_flow,
+        'payback_period': payback,
+        'standard_fee': results['recommendation']['standard_fee'],
+        'premium_fee': results['recommendation']['premium_fee'],
+    }
+
+    # --- 3. Gradients & elasticities ---
+    base, gradient, elasticity = {}, {}, {}
+    param_values = np.stack([values[name] for name in parameters], axis=1)
+    for name, output in outputs.items():
+        output = _as_dual(output, n, k)
+        base[name] = output.value
+        gradient[name] = output.derivative
+        with np.errstate(divide='ignore', invalid='ignore'):
+            elasticity[name] = np.where(
+                output.value[:, None] != 0,
+                output.derivative * param_values / output.value[:, None],
+                np.nan,
+            )
+    return {
+        "parameters": parameters,
+        "values": values,
+        "base": base,
+        "gradient": gradient,
+        "elasticity": elasticity,
+    }
+
+
+def _as_dual(x, n, k):
+    if isinstance(x, Dual):
+        return x
+    return Dual(np.broadcast_to(x, (n,)), np.zeros((n, k)))
+
+
+def tornado_data(sensitivities, output, index=0, swing=0.1):
+    """
+    Linearized tornado bars for one base point: the change in `output` when each parameter
+    moves by -swing / +swing (relative). Sorted by the widest bar first.
+
+    Returns:
+        list[tuple]: (parameter, delta_at_low, delta_at_high).
+    """
+    gradient = sensitivities['gradient'][output][index]
+    bars = []
+    for j, name in enumerate(sensitivities['parameters']):
+        step = swing * sensitivities['values'][name][index]
+        delta = gradient[j] * step
+        if np.isfinite(delta):
+            bars.append((name, float(-delta), float(delta)))
+    bars.sort(key=lambda bar: abs(bar[2]), reverse=True)
+    return bars
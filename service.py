@@ -0,0 +1,304 @@
+# service.py (v1.0 - Local Simulation Service)
+# A dependency-free asyncio HTTP/1.1 JSON service over the simulator. Concurrent requests that
+# arrive within a short window are coalesced into one vectorized batch evaluation.
+#
+#   python service.py [--host 127.0.0.1] [--port 8765] [--window-ms 2] [--max-batch 4096]
+#
+#   POST /v1/core            {"dc_size_mw": 100, "use_clean_power": "Conventional", ...}
+#   POST /v1/what-if         same fields + "standard_fee", "premium_fee"
+#   POST /v1/recommendation  same fields as /v1/core
+#   GET  /metrics, GET /healthz
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from collections import Counter, deque
+
+import numpy as np
+
+from calculator import SCENARIO_COLUMNS, calculate_core_business_case_batch
+from config_loader import ConfigError, load_config
+from what_if_calculator import analyze_fixed_fee_batch
+
+DEFAULT_STANDARD_FEE = 20.0
+DEFAULT_PREMIUM_FEE = 100.0
+MAX_BODY_BYTES = 1 << 20  # larger request bodies are answered with 413 without being read
+
+
+class BadRequest(ValueError):
+    """Raised for malformed request bodies; answered with HTTP 400."""
+
+
+def parse_scenario(payload):
+    """Validates a JSON request body into a scenario dict (six inputs + fees)."""
+    if not isinstance(payload, dict):
+        raise BadRequest("request body must be a JSON object")
+    missing = [name for name in SCENARIO_COLUMNS if name not in payload]
+    if missing:
+        raise BadRequest(f"missing field(s): {', '.join(missing)}")
+    scenario = {}
+    try:
+        for name in ('dc_size_mw', 'high_perf_gpu_ratio', 'utilization_rate', 'market_price_per_m_tokens'):
+            scenario[name] = float(payload[name])
+        scenario['standard_fee'] = float(payload.get('standard_fee', DEFAULT_STANDARD_FEE))
+        scenario['premium_fee'] = float(payload.get('premium_fee', DEFAULT_PREMIUM_FEE))
+    except (TypeError, ValueError) as exc:
+        raise BadRequest(f"numeric field expected: {exc}") from None
+    power = payload['use_clean_power']
+    if not isinstance(power, bool) and power not in ('Renewable', 'Conventional'):
+        raise BadRequest("use_clean_power must be 'Renewable', 'Conventional' or a boolean")
+    scenario['use_clean_power'] = power if isinstance(power, bool) else power == 'Renewable'
+    if not isinstance(payload['apply_mirrormind'], bool):
+        raise BadRequest("apply_mirrormind must be a boolean")
+    scenario['apply_mirrormind'] = payload['apply_mirrormind']
+    return scenario
+
+
+class Metrics:
+    """Request latency and batch-size statistics kept in bounded windows."""
+
+    def __init__(self, window=10_000):
+        self.started = time.time()
+        self.requests = Counter()
+        self.errors = Counter()
+        self.latencies = {}
+        self.batch_sizes = deque(maxlen=window)
+        self.batches = 0
+        self._window = window
+
+    def record_request(self, endpoint, seconds, ok=True):
+        self.requests[endpoint] += 1
+        if not ok:
+            self.errors[endpoint] += 1
+        self.latencies.setdefault(endpoint, deque(maxlen=self._window)).append(seconds)
+
+    def record_batch(self, size):
+        self.batches += 1
+        self.batch_sizes.append(size)
+
+    def snapshot(self):
+        latency = {}
+        for endpoint, values in self.latencies.items():
+            values = np.fromiter(values, dtype=float)
+            latency[endpoint] = {
+                "p50_ms": float(np.percentile(values, 50) * 1e3),
+                "p99_ms": float(np.percentile(values, 99) * 1e3),
+            }
+        sizes = np.fromiter(self.batch_sizes, dtype=float)
+        return {
+            "uptime_s": time.time() - self.started,
+            "requests": dict(self.requests),
+            "errors": dict(self.errors),
+            "latency": latency,
+            "batches": self.batches,
+            "batch_size": {
+                "mean": float(sizes.mean()) if sizes.size else 0.0,
+                "p50": float(np.percentile(sizes, 50)) if sizes.size else 0.0,
+                "max": float(sizes.max()) if sizes.size else 0.0,
+            },
+        }
+
+
+class MicroBatcher:
+    """
+    Coalesces scenarios submitted within `window_ms` of the first pending one (or until
+    `max_batch` are pending) into a single batch-engine call, run off the event loop.
+    """
+
+    def __init__(self, config_path=None, window_ms=2.0, max_batch=4096, metrics=None):
+        self.config_path = config_path
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.metrics = metrics or Metrics()
+        self._pending = []
+        self._timer = None
+
+    async def submit(self, scenario):
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((scenario, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch):
+        scenarios = [scenario for scenario, _ in batch]
+        try:
+            rows = await asyncio.get_running_loop().run_in_executor(None, self._evaluate, scenarios)
+        except Exception as exc:  # surfaced to every waiting request
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        self.metrics.record_batch(len(batch))
+        for (_, future), row in zip(batch, rows):
+            if not future.done():
+                future.set_result(row)
+
+    def _evaluate(self, scenarios):
+        # load_config is a cached stat() call unless config.yml changed.
+        config = load_config(self.config_path)
+        columns = {name: np.array([s[name] for s in scenarios]) for name in (*SCENARIO_COLUMNS, 'standard_fee', 'premium_fee')}
+        core = calculate_core_business_case_batch(*(columns[name] for name in SCENARIO_COLUMNS), config=config)
+        what_if = analyze_fixed_fee_batch(core, columns['standard_fee'], columns['premium_fee'])
+        rows = []
+        for i in range(len(scenarios)):
+            result = core.row(i).to_dict()
+            segments = what_if['segments']
+            result['what_if_narratives'] = [
+                {
+                    **segment,
+                    **{key: float(segments[key][i, j]) for key in ('fixed_fee', 'final_profit_per_user', 'opportunity_cost')},
+                }
+                for j, segment in enumerate(result['segment_narratives'])
+            ]
+            result['pnl_what_if'] = {key: float(value[i]) for key, value in what_if['pnl_what_if'].items()}
+            rows.append(result)
+        return rows
+
+
+class SimulationService:
+    ENDPOINTS = ('/v1/core', '/v1/what-if', '/v1/recommendation')
+
+    def __init__(self, config_path=None, window_ms=2.0, max_batch=4096):
+        self.config_path = config_path
+        self.metrics = Metrics()
+        self.batcher = MicroBatcher(config_path, window_ms, max_batch, self.metrics)
+        load_config(config_path)  # warm the config cache and fail fast on a bad config
+
+    async def handle(self, method, path, body):
+        """Returns (status, JSON-serializable payload)."""
+        if method == 'GET' and path == '/healthz':
+            return 200, {"status": "ok"}
+        if method == 'GET' and path == '/metrics':
+            return 200, self.metrics.snapshot()
+        if path not in self.ENDPOINTS:
+            return 404, {"error": f"unknown endpoint {path}"}
+        if method != 'POST':
+            return 405, {"error": "use POST"}
+
+        try:
+            scenario = parse_scenario(json.loads(body or b'null'))
+        except (json.JSONDecodeError, UnicodeDecodeError, BadRequest) as exc:
+            return 400, {"error": str(exc)}
+        result = await self.batcher.submit(scenario)
+        if path == '/v1/core':
+            return 200, {key: result[key] for key in ('pnl_annual', 'segment_narratives', 'total_investment', 'assumptions', 'recommendation')}
+        if path == '/v1/what-if':
+            return 200, {"what_if_narratives": result['what_if_narratives'], "pnl_what_if": result['pnl_what_if']}
+        return 200, result['recommendation']
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "malformed request line"}, keep_alive=False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    content_length = int(headers.get('content-length', 0) or 0)
+                except ValueError:
+                    content_length = -1
+                if content_length < 0:
+                    await self._respond(writer, 400, {"error": "malformed content-length"}, keep_alive=False)
+                    break
+                if content_length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": f"request body exceeds {MAX_BODY_BYTES} bytes"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(content_length)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+
+                start = time.perf_counter()
+                try:
+                    status, payload = await self.handle(method, path.split('?', 1)[0], body)
+                except ConfigError as exc:
+                    status, payload = 500, {"error": f"config: {exc}"}
+                except Exception as exc:
+                    status, payload = 500, {"error": f"{type(exc).__name__}: {exc}"}
+                endpoint = path.split('?', 1)[0]
+                endpoint = endpoint if endpoint in (*self.ENDPOINTS, '/metrics', '/healthz') else 'other'
+                self.metrics.record_request(endpoint, time.perf_counter() - start, ok=status < 400)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        body = json.dumps(_finite(payload), allow_nan=False).encode()
+        reason = {
+            200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large',
+            500: 'Internal Server Error',
+        }[status]
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+
+
+def _finite(value):
+    """`value` with NaN and infinities replaced by None, which JSON can represent (as null)."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+async def serve(host='127.0.0.1', port=8765, config_path=None, window_ms=2.0, max_batch=4096, ready=None):
+    service = SimulationService(config_path, window_ms, max_batch)
+    server = await asyncio.start_server(service.serve_connection, host, port, limit=1 << 20)
+    if ready is not None:
+        ready(server.sockets[0].getsockname())
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local simulator HTTP service with request micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--config", default=None)
+    parser.add_argument("--window-ms", type=float, default=2.0, help="batching window after the first queued request")
+    parser.add_argument("--max-batch", type=int, default=4096)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(
+            args.host, args.port, args.config, args.window_ms, args.max_batch,
+            ready=lambda address: print(f"Serving on http://{address[0]}:{address[1]}", file=sys.stderr),
+        ))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+# Tests import the simulator modules from the repository root, as the app and CLIs do.
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from batch_result import SEGMENT_METRICS, BatchResult
+from calculator import calculate_core_business_case, calculate_core_business_case_batch
+
+SCENARIOS = [
+    (100, 'Renewable', True, 50, 60, 1.5),
+    (37, 'Conventional', False, 85, 95, 3.2),
+    (250, 'Renewable', False, 0, 45, 0.7),
+]
+
+
+@pytest.fixture
+def result():
+    return calculate_core_business_case_batch(*map(np.array, zip(*SCENARIOS)))
+
+
+@pytest.mark.parametrize('i', range(len(SCENARIOS)))
+def test_row_to_dict_matches_the_scalar_result(result, i):
+    expected = calculate_core_business_case(*SCENARIOS[i])
+    row = result.row(i).to_dict()
+    assert row.keys() == expected.keys()
+    assert row['pnl_annual'] == pytest.approx(expected['pnl_annual'], rel=1e-12)
+    assert row['total_investment'] == pytest.approx(expected['total_investment'], rel=1e-12)
+    assert row['recommendation'] == pytest.approx(expected['recommendation'], rel=1e-12)
+    # The batch layout also carries the GPU counts behind gpu_mix_string.
+    assert {key: row['assumptions'][key] for key in expected['assumptions']} == pytest.approx(expected['assumptions'], rel=1e-12)
+    assert len(row['segment_narratives']) == len(expected['segment_narratives'])
+    for segment, expected_segment in zip(row['segment_narratives'], expected['segment_narratives']):
+        assert segment.pop('tier_name_key') == expected_segment.pop('tier_name_key')
+        assert segment == pytest.approx(expected_segment, rel=1e-12, abs=1e-9)
+
+
+def test_row_views_read_the_columns_without_copying(result):
+    view = result.row(-1)  # negative indices count from the end, as for sequences
+    revenue = result.pnl_annual['revenue']
+    revenue[2] = 123.0
+    assert view['pnl_annual']['revenue'] == 123.0
+    result.segment_narratives['recommended_fee'][2, 1] = 7.0
+    assert view['segment_narratives'][1]['recommended_fee'] == 7.0
+    with pytest.raises(IndexError):
+        result.row(len(SCENARIOS))
+
+
+def test_columns_share_memory_with_the_sections(result):
+    columns = result.columns()
+    assert columns['pnl_revenue'] is result.pnl_annual['revenue']
+    assert columns['recommended_standard_fee'] is result.recommendation['standard_fee']
+    for j, tier_key in enumerate(result.tier_name_keys):
+        for metric in SEGMENT_METRICS:
+            column = columns[f"{tier_key}_{metric}"]
+            assert np.shares_memory(column, result.segment_narratives[metric])
+            assert np.array_equal(column, result.segment_narratives[metric][:, j])
+    assert result.nbytes == sum(column.nbytes for column in columns.values())
+
+
+def test_from_columns_round_trip(result):
+    rebuilt = BatchResult.from_columns(result.columns(), result.tier_name_keys)
+    assert rebuilt.row(1).to_dict() == result.row(1).to_dict()
+
+
+def test_to_pandas_and_arrow(result):
+    pytest.importorskip('pandas')
+    frame = result.to_pandas()
+    assert list(frame.columns) == list(result.columns())
+    assert np.array_equal(frame['pnl_operating_profit'].to_numpy(), result.pnl_annual['operating_profit'])
+    pa = pytest.importorskip('pyarrow')
+    table = result.to_arrow()
+    assert isinstance(table, pa.Table)
+    assert table.num_rows == len(SCENARIOS)
+    assert table.column_names == list(result.columns())
@@ -0,0 +1,26 @@
+import pytest
+
+from batch_runner import run_batch
+
+HEADER = "dc_size_mw,use_clean_power,apply_mirrormind,high_perf_gpu_ratio,utilization_rate,market_price_per_m_tokens\n"
+
+
+def _write(path, rows):
+    path.write_text(HEADER + "".join(f"{row}\n" for row in rows))
+    return str(path)
+
+
+def test_rerun_resumes_completed_chunks(tmp_path):
+    scenarios = _write(tmp_path / 'scenarios.csv', ["100,true,false,50,60,1.5", "200,false,true,30,80,2.5"])
+    first = run_batch(scenarios, str(tmp_path / 'out'), chunk_size=1, workers=1)
+    again = run_batch(scenarios, str(tmp_path / 'out'), chunk_size=1, workers=1)
+    assert (first['rows'], first['skipped']) == (2, 0)
+    assert (again['rows'], again['skipped']) == (0, 2)
+
+
+def test_same_size_edit_is_not_resumed(tmp_path):
+    scenarios = _write(tmp_path / 'scenarios.csv', ["100,true,false,50,60,1.5"])
+    run_batch(scenarios, str(tmp_path / 'out'), chunk_size=1, workers=1)
+    _write(tmp_path / 'scenarios.csv', ["100,true,false,50,60,2.5"])  # same number of bytes
+    with pytest.raises(SystemExit):
+        run_batch(scenarios, str(tmp_path / 'out'), chunk_size=1, workers=1)
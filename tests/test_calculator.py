@@ -0,0 +1,48 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from calculator import calculate_core_business_case, calculate_core_business_case_batch
+
+GRID = list(itertools.product(
+    (10, 100, 275),                   # dc_size_mw
+    ('Conventional', 'Renewable'),    # use_clean_power
+    (False, True),                    # apply_mirrormind
+    (0, 35, 100),                     # high_perf_gpu_ratio
+    (0, 40, 95),                      # utilization_rate
+    (0.5, 1.5, 4.0),                  # market_price_per_m_tokens
+))
+
+
+@pytest.fixture(scope='module')
+def batch():
+    return calculate_core_business_case_batch(*map(np.array, zip(*GRID)))
+
+
+@pytest.mark.parametrize('i', range(0, len(GRID), 7))
+def test_batch_row_matches_scalar(batch, i):
+    scalar = calculate_core_business_case(*GRID[i])
+    row = batch.row(i)
+    for key, value in scalar['pnl_annual'].items():
+        assert row['pnl_annual'][key] == pytest.approx(value, rel=1e-12, abs=1e-6), key
+    assert row['total_investment'] == pytest.approx(scalar['total_investment'], rel=1e-12)
+    for key in ('standard_fee', 'premium_fee'):
+        assert row['recommendation'][key] == pytest.approx(scalar['recommendation'][key], rel=1e-12, nan_ok=True), key
+    assert bool(row['recommendation']['is_achievable']) == bool(scalar['recommendation']['is_achievable'])
+    for segment, batch_segment in zip(scalar['segment_narratives'], row['segment_narratives']):
+        assert batch_segment['tier_name_key'] == segment['tier_name_key']
+        for key in ('num_users', 'revenue_per_user', 'cost_per_user', 'profit_per_user', 'recommended_fee'):
+            assert batch_segment[key] == pytest.approx(segment[key], rel=1e-12, abs=1e-9), key
+
+
+def test_batch_broadcasts_scalar_inputs():
+    single = calculate_core_business_case_batch(100, 'Renewable', True, 50, 60, 1.5)
+    scalar = calculate_core_business_case(100, 'Renewable', True, 50, 60, 1.5)
+    assert single['pnl_annual']['operating_profit'].shape == (1,)
+    assert single['pnl_annual']['operating_profit'][0] == pytest.approx(scalar['pnl_annual']['operating_profit'], rel=1e-12)
+
+
+def test_unknown_override_is_rejected():
+    with pytest.raises(ValueError):
+        calculate_core_business_case_batch(100, True, True, 50, 60, 1.5, overrides={'finance.discount_rate': [0.1]})
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+import yaml
+
+from cashflow import calculate_cash_flows, irr, it_age, it_refresh, npv
+from config_loader import DEFAULT_CONFIG_PATH, parse_config
+
+
+def _config_with_it_life(life):
+    with open(DEFAULT_CONFIG_PATH) as f:
+        raw = yaml.safe_load(f)
+    raw['investment']['amortization_years']['it_hardware'] = life
+    return parse_config(raw, DEFAULT_CONFIG_PATH)
+
+
+def test_it_refresh_years():
+    years = np.arange(1, 21)
+    assert years[it_refresh(years, 5)].tolist() == [5, 10, 15, 20]
+    assert years[it_refresh(years, 4.5)].tolist() == [5, 9, 14, 18]
+    assert it_age(20, 5) == 5
+    assert it_age(20, 4.5) == 2
+
+
+@pytest.mark.parametrize('life', [4, 4.5, 5.25])
+def test_hardware_is_refreshed_for_any_it_life(life):
+    config = _config_with_it_life(life)
+    flows = calculate_cash_flows(100, False, True, 50, 70, 1.5, config=config, horizon_years=20)
+    refreshes = np.count_nonzero(flows['capex'][0])
+    # One purchase per elapsed IT life, except at the very end of the horizon.
+    assert refreshes == int(np.floor(19 / life))
+
+
+CASH_FLOWS = np.array([
+    [-1000.0, 100, 200, 300, 400, 500],
+    [-500.0, 50, 50, 50, 50, 600],
+    [-2000.0, 900, 900, 900, 0, 0],
+])
+
+
+def test_npv_matches_numpy_financial():
+    npf = pytest.importorskip('numpy_financial')
+    for rate in (0.0, 0.05, 0.12):
+        expected = [npf.npv(rate, row) for row in CASH_FLOWS]
+        assert np.allclose(npv(rate, CASH_FLOWS), expected, rtol=1e-12)
+
+
+def test_irr_matches_numpy_financial():
+    npf = pytest.importorskip('numpy_financial')
+    expected = [npf.irr(row) for row in CASH_FLOWS]
+    assert np.allclose(irr(CASH_FLOWS), expected, atol=1e-8)
+
+
+def test_irr_is_nan_when_cash_never_comes_back():
+    assert np.isnan(irr(np.array([[-100.0, -10, 0, -5]]))[0])
+
+
+def test_scenario_irr_matches_numpy_financial():
+    npf = pytest.importorskip('numpy_financial')
+    flows = calculate_cash_flows([50, 100, 200], False, True, [0, 50, 100], 80, 2.5)
+    for row, value in zip(flows['net_cash_flow'], flows['irr']):
+        assert value == pytest.approx(npf.irr(row), abs=1e-8)
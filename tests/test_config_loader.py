@@ -0,0 +1,46 @@
+import os
+
+import yaml
+
+import config_loader
+from config_loader import DEFAULT_CONFIG_PATH, clear_config_cache, load_config
+
+ROOT = os.path.dirname(DEFAULT_CONFIG_PATH)
+TIERS = b"name,ratio,monthly_token_usage_m,paid\nfree,6,0.5,false\nstandard,3,5.0,true\npremium,1,25.0,true\n"
+
+
+def _write_config(tmp_path, tiers=TIERS):
+    with open(DEFAULT_CONFIG_PATH) as f:
+        raw = yaml.safe_load(f)
+    raw['model_and_market']['tiers_file'] = 'tiers.csv'
+    raw['finance']['demand_profile'] = os.path.join(ROOT, raw['finance']['demand_profile'])
+    (tmp_path / 'config.yml').write_text(yaml.safe_dump(raw, allow_unicode=True), encoding='utf-8')
+    (tmp_path / 'tiers.csv').write_bytes(tiers)
+    clear_config_cache()
+    return str(tmp_path / 'config.yml')
+
+
+def test_tiers_come_from_the_hashed_bytes(tmp_path, monkeypatch):
+    path = _write_config(tmp_path)
+    read_all = config_loader._read_all
+    # The bytes the loader hashes differ from what a second read of the file would see.
+    hashed = TIERS.replace(b"premium,1,", b"premium,2,")
+    monkeypatch.setattr(config_loader, '_read_all', lambda paths: [
+        hashed if os.path.basename(p) == 'tiers.csv' else content for p, content in zip(paths, read_all(paths))
+    ])
+    config = load_config(path)
+    assert dict((tier.name, tier.ratio) for tier in config.model_and_market.tiers) == {
+        'free': 6 / 11, 'standard': 3 / 11, 'premium': 2 / 11,
+    }
+    clear_config_cache()
+
+
+def test_editing_the_tiers_file_reloads(tmp_path):
+    path = _write_config(tmp_path)
+    before = load_config(path)
+    (tmp_path / 'tiers.csv').write_bytes(TIERS + b"team,1,40.0,true\n")
+    os.utime(tmp_path / 'tiers.csv', ns=(0, 0))
+    after = load_config(path)
+    assert after.config_hash != before.config_hash
+    assert [tier.name for tier in after.model_and_market.tiers][-1] == 'team'
+    clear_config_cache()
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import pytest
+import yaml
+
+from calculator import calculate_core_business_case, calculate_core_business_case_batch
+from config_loader import DEFAULT_CONFIG_PATH, load_config, parse_config
+from energy import HOURS_PER_YEAR, energy_model
+
+ROOT = os.path.dirname(DEFAULT_CONFIG_PATH)
+
+
+def _config(tmp_path, energy):
+    with open(DEFAULT_CONFIG_PATH) as f:
+        raw = yaml.safe_load(f)
+    raw['operating_expenses']['energy'] = energy
+    raw['finance']['demand_profile'] = os.path.join(ROOT, raw['finance']['demand_profile'])
+    return parse_config(raw, str(tmp_path / 'config.yml'))
+
+
+@pytest.fixture
+def flat_config(tmp_path):
+    np.save(tmp_path / 'load.npy', np.full(2 * HOURS_PER_YEAR, 3.0))  # flat; the level is normalized away
+    return _config(tmp_path, {'load_profile': 'load.npy'})
+
+
+def test_flat_profile_matches_the_flat_formula(flat_config):
+    model = energy_model(flat_config)
+    op_conf = flat_config.operating_expenses
+    dc = np.array([10.0, 100.0, 250.0, 80.0])
+    u = np.array([0.0, 0.35, 0.7, 1.0])
+    clean = np.array([False, True, False, True])
+    rate = np.where(clean, op_conf.power_cost_per_kwh.renewable, op_conf.power_cost_per_kwh.conventional)
+    flat = dc * u * op_conf.pue * HOURS_PER_YEAR * 1000 * rate
+    assert np.allclose(model.annual_cost(dc, u, clean), flat, rtol=1e-12)
+    assert model.annual_cost(100.0, 0.35, True) == pytest.approx(flat[1], rel=1e-12)
+
+
+def test_flat_profile_leaves_the_calculator_unchanged(flat_config):
+    inputs = (np.array([40.0, 150.0]), np.array([False, True]), np.array([True, False]),
+              np.array([30.0, 80.0]), np.array([55.0, 90.0]), np.array([1.5, 2.5]))
+    hourly = calculate_core_business_case_batch(*inputs, config=flat_config)['pnl_annual']
+    flat = calculate_core_business_case_batch(*inputs, config=load_config())['pnl_annual']
+    for name, column in flat.items():
+        assert np.allclose(hourly[name], column, rtol=1e-12), name
+
+
+def test_prefix_sums_match_the_hourly_breakdown(tmp_path):
+    series = os.path.join(ROOT, 'hourly_energy.csv')
+    config = _config(tmp_path, {
+        'hourly_prices': series, 'load_profile': series, 'ambient_temperature': series,
+        'pue_curve': {'fixed_overhead': 0.08, 'cooling_overhead': 0.3, 'ambient_coefficient': 0.03, 'reference_temp_c': 18},
+        'tariffs': {
+            'conventional': {'type': 'series'},
+            'renewable': {'type': 'ppa', 'rate': 0.16, 'coverage': 0.8,
+                          'residual': {'type': 'time_of_use', 'peak': 0.24, 'offpeak': 0.14, 'peak_hours': [9, 21]}},
+        },
+    })
+    model = energy_model(config)
+    rng = np.random.default_rng(1)
+    dc = rng.uniform(1, 300, 60)
+    u = np.concatenate([[0.0, 1.0, 0.9], rng.uniform(0, 1, 57)])  # includes hours clipped at capacity
+    clean = rng.random(60) < 0.5
+    brute = [model.hourly(dc[i], u[i], clean[i])['cost'].sum() / model.years for i in range(60)]
+    assert np.allclose(model.annual_cost(dc, u, clean), brute, rtol=1e-10)
+
+    scalar = calculate_core_business_case(120.0, 'Renewable', True, 50, 85, 1.5, config=config)
+    batch = calculate_core_business_case_batch(120.0, True, True, 50, 85, 1.5, config=config)
+    for name, value in scalar['pnl_annual'].items():
+        assert batch['pnl_annual'][name][0] == pytest.approx(value, rel=1e-12), name
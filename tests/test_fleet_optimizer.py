@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+import fleet_optimizer
+from fleet_optimizer import FleetOptimizer, lp_bound, solve_heuristic
+
+
+@pytest.fixture(scope='module')
+def optimizer():
+    return FleetOptimizer()
+
+
+def test_lp_bound_matches_the_heuristic_bound(optimizer):
+    budgets = np.linspace(optimizer.budget / 10, optimizer.budget, 10)
+    values = optimizer._objective_values('tokens')
+    _, expected = solve_heuristic(values, optimizer.costs, optimizer.powers, budgets, optimizer.power_limit_kw)
+    assert np.array_equal(lp_bound(values, optimizer.costs, optimizer.powers, budgets, optimizer.power_limit_kw), expected)
+
+
+def test_auto_with_milp_skips_the_heuristic(optimizer, monkeypatch):
+    heuristic = optimizer.optimize('tokens', method='heuristic')
+    counts = np.array([[heuristic['counts'].get(sku, 0) for sku in optimizer.skus]], dtype=float)
+    monkeypatch.setattr(fleet_optimizer, 'solve_milp', lambda *args: counts)
+    monkeypatch.setattr(fleet_optimizer, 'solve_heuristic', lambda *args: pytest.fail('heuristic ran'))
+    result = optimizer.optimize('tokens', method='auto')
+    assert result['method'] == 'milp'
+    assert result['optimality_gap'] == pytest.approx(heuristic['optimality_gap'])
+
+
+def test_auto_without_milp_uses_the_heuristic(optimizer, monkeypatch):
+    monkeypatch.setattr(fleet_optimizer, 'solve_milp', lambda *args: None)
+    assert optimizer.optimize('profit', method='auto')['method'] == 'heuristic'
+    with pytest.raises(ImportError):
+        optimizer.optimize('profit', method='milp')
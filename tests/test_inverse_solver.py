@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from calculator import calculate_core_business_case_batch
+from config_loader import load_config
+from inverse_solver import UNKNOWNS, _slack, bracketed_root, solve, solve_grid
+from what_if_calculator import analyze_fixed_fee_batch
+
+rng = np.random.default_rng(0)
+N = 200
+SCENARIOS = dict(
+    dc_size_mw=rng.uniform(10, 300, N),
+    use_clean_power=rng.random(N) < 0.5,
+    apply_mirrormind=rng.random(N) < 0.5,
+    high_perf_gpu_ratio=rng.uniform(0, 100, N),
+    utilization_rate=rng.uniform(20, 100, N),
+    market_price_per_m_tokens=rng.uniform(0.5, 4, N),
+)
+TARGETS = {'payback': 5.0, 'irr': 0.12, 'margin': 0.1}
+
+
+def _slack_at(unknown, target, result):
+    """The target slack of every scenario, re-evaluated at the solver's boundary."""
+    config = load_config()
+    x = result['boundary']
+    crossing = ~np.isnan(x)
+    scenario = dict(SCENARIOS)
+    overrides = {}
+    if unknown == 'price':
+        scenario['market_price_per_m_tokens'] = np.where(crossing, x, 1.0)
+    elif unknown == 'utilization':
+        scenario['utilization_rate'] = np.where(crossing, x, 1.0)
+    elif unknown == 'dc_capex':
+        overrides['investment.dc_capex_per_mw'] = np.where(crossing, x, 1.0)
+    results = calculate_core_business_case_batch(**scenario, config=config, overrides=overrides)
+    pnl = results['pnl_annual']
+    if unknown == 'tier_fee':
+        pnl = analyze_fixed_fee_batch(results, tier_fees={'tier_premium': np.where(crossing, x, 0.0)})['pnl_what_if']
+    elif unknown == 'tier_fees':
+        pnl = analyze_fixed_fee_batch(results, tier_fees=np.where(crossing[:, None], result['fees'], 0.0))['pnl_what_if']
+    slack = _slack(target, TARGETS[target], pnl, results['total_investment'], config.finance.horizon_years)
+    return slack[crossing], results['total_investment'][crossing]
+
+
+@pytest.mark.parametrize('target', list(TARGETS))
+@pytest.mark.parametrize('unknown', list(UNKNOWNS))
+def test_root_drives_the_slack_to_zero(unknown, target):
+    result = solve(unknown, target, TARGETS[target], **SCENARIOS, tier='premium')
+    slack, investment = _slack_at(unknown, target, result)
+    assert slack.size > 0
+    assert np.all(np.abs(slack) <= 1e-9 * investment)
+
+
+def test_regions_are_consistent_with_the_bracket_ends():
+    result = solve('utilization', 'payback', 3.0, **SCENARIOS)
+    region = result['region']
+    assert set(region) <= {'always', 'never', 'above', 'below'}
+    assert np.all(np.isnan(result['value'][region == 'never']))
+    above = region == 'above'
+    assert np.all(~result['feasible_at_low'][above] & result['feasible_at_high'][above])
+    assert np.allclose(result['value'][above], result['boundary'][above])
+
+
+def test_bracketed_root_on_known_roots():
+    targets = np.array([0.5, 2.0, 7.5])
+    root, _, _, iterations = bracketed_root(lambda x, rows: x ** 3 - targets[rows] ** 3, np.zeros(3), np.full(3, 10.0))
+    assert np.allclose(root, targets, rtol=1e-9)
+    assert iterations.max() < 100
+
+
+def test_grid_outputs_take_the_grid_shape():
+    result = solve_grid('price', 'irr', {'utilization_rate': [40, 70, 100], 'target_value': [0.08, 0.12]},
+                        dc_size_mw=100, use_clean_power=False, apply_mirrormind=True, high_perf_gpu_ratio=50)
+    assert result['value'].shape == (3, 2)
+    # A higher IRR target needs a higher price; higher utilization needs a lower one.
+    assert np.all(result['value'][:, 1] > result['value'][:, 0])
+    assert np.all(np.diff(result['value'][:, 0]) < 0)
@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+
+from jobs import JobCancelled, JobManager
+
+
+class Gate:
+    """Holds a job between steps until opened; counts how often the job function ran."""
+
+    def __init__(self):
+        self.opened = threading.Event()
+        self.runs = 0
+
+
+def count_up(steps, gate, progress=None, cancel_event=None):
+    gate.runs += 1
+    for step in range(steps):
+        while not gate.opened.wait(0.005):
+            if cancel_event.is_set():
+                return step
+        progress(step + 1, steps)
+    return steps
+
+
+@pytest.fixture
+def manager():
+    manager = JobManager(max_workers=2, keep_finished=2)
+    yield manager
+    manager.shutdown()
+
+
+def test_identical_submissions_share_one_job(manager):
+    gate = Gate()
+    first = manager.submit(count_up, 3, gate)
+    second = manager.submit(count_up, 3, gate)
+    assert second is first
+    assert manager.counts['deduplicated'] == 1
+    gate.opened.set()
+    assert first.result(timeout=5) == 3
+    assert first.progress == 1.0
+    assert first.snapshot()['done'] == 3
+    assert gate.runs == 1
+
+
+def test_finished_job_is_reused(manager):
+    gate = Gate()
+    gate.opened.set()
+    job = manager.submit(count_up, 2, gate)
+    job.wait(5)
+    assert manager.submit(count_up, 2, gate) is job
+    assert manager.counts['reused'] == 1
+    assert gate.runs == 1
+
+
+def test_cancelled_when_the_last_watcher_releases(manager):
+    gate = Gate()
+    job = manager.submit(count_up, 2, gate)
+    manager.submit(count_up, 2, gate)
+    manager.release(job)
+    assert not job.cancel_event.is_set()
+    manager.release(job)
+    assert job.cancel_event.is_set()
+    with pytest.raises(JobCancelled):
+        job.result(timeout=5)
+    assert job.state == 'cancelled'
+    assert manager.get(job.id) is None  # nobody watches it any more
+    # A new identical submission starts afresh rather than joining the cancelled job.
+    gate.opened.set()
+    again = manager.submit(count_up, 2, gate)
+    assert again is not job
+    assert again.result(timeout=5) == 2
+
+
+def test_supersede_cancels_the_previous_job(manager):
+    gate = Gate()
+    old = manager.submit(count_up, 2, gate)
+    new = manager.supersede(old, count_up, 3, gate)
+    assert new is not old
+    assert old.cancel_event.is_set()
+    # Superseding a job with the same call keeps it running.
+    same = manager.supersede(new, count_up, 3, gate)
+    assert same is new
+    assert not new.cancel_event.is_set()
+    gate.opened.set()
+    assert new.result(timeout=5) == 3
+    assert old.wait(5) and old.state == 'cancelled'
+
+
+def test_forgets_finished_jobs_beyond_keep_finished(manager):
+    gate = Gate()
+    gate.opened.set()
+    jobs = []
+    for steps in (1, 2, 3):  # one at a time, so they finish in submission order
+        jobs.append(manager.submit(count_up, steps, gate))
+        jobs[-1].wait(5)
+    assert manager.get(jobs[0].id) is None  # evicted: keep_finished=2
+    assert [manager.get(job.id) for job in jobs[1:]] == jobs[1:]
+    assert manager.stats()['finished_kept'] == 2
+
+
+def test_failed_job_reraises_its_error(manager):
+    def fail():
+        raise ValueError("bad input")
+    job = manager.submit(fail)
+    with pytest.raises(ValueError, match="bad input"):
+        job.result(timeout=5)
+    assert job.state == 'failed'
+    assert manager.counts['failed'] == 1
@@ -0,0 +1,65 @@
+import itertools
+import math
+
+import pytest
+
+from calculator import calculate_core_business_case
+from model_graph import INPUTS, ModelGraph, diff_scenarios
+
+GRID = list(itertools.product(
+    (10, 100, 275),                   # dc_size_mw
+    ('Conventional', 'Renewable'),    # use_clean_power
+    (False, True),                    # apply_mirrormind
+    (0, 35, 100),                     # high_perf_gpu_ratio
+    (0, 40, 95),                      # utilization_rate
+    (0.5, 1.5, 4.0),                  # market_price_per_m_tokens
+))
+
+
+def _scenario(values):
+    return dict(zip(INPUTS[1:], values))
+
+
+def _assert_same_results(actual, expected):
+    assert actual['total_investment'] == expected['total_investment']
+    assert actual['assumptions'] == expected['assumptions']
+    for key, value in expected['pnl_annual'].items():
+        assert actual['pnl_annual'][key] == pytest.approx(value, rel=1e-12, abs=1e-6), key
+    for key, value in expected['recommendation'].items():
+        if isinstance(value, float) and math.isnan(value):
+            assert math.isnan(actual['recommendation'][key]), key
+        else:
+            assert actual['recommendation'][key] == pytest.approx(value, rel=1e-12), key
+    assert len(actual['segment_narratives']) == len(expected['segment_narratives'])
+    for segment, expected_segment in zip(actual['segment_narratives'], expected['segment_narratives']):
+        assert segment.keys() == expected_segment.keys()
+        for key, value in expected_segment.items():
+            assert segment[key] == pytest.approx(value, rel=1e-12, abs=1e-9), key
+
+
+@pytest.mark.parametrize('values', GRID[::5])
+def test_results_match_calculator(values):
+    _assert_same_results(ModelGraph(**_scenario(values)).results(), calculate_core_business_case(*values))
+
+
+def test_updated_graph_matches_fresh_calculation():
+    graph = ModelGraph(**_scenario(GRID[0]))
+    for values in GRID[1::11]:
+        graph.set(**_scenario(values))
+        _assert_same_results(graph.results(), calculate_core_business_case(*values))
+
+
+def test_price_change_leaves_capex_untouched():
+    graph = ModelGraph(**_scenario(GRID[40]))
+    graph.results()
+    graph.update(market_price_per_m_tokens=9.0)
+    assert graph.evaluations['total_investment'] == 1
+    assert graph.evaluations['revenue'] == 2
+
+
+def test_diff_reports_changed_dependencies():
+    before = _scenario(GRID[40])
+    changes = {record['quantity']: record for record in diff_scenarios(before, {'dc_size_mw': before['dc_size_mw'] * 2})}
+    assert changes['dc_size_mw']['because'] == []
+    assert changes['dc_construction_cost']['because'] == ['dc_size_mw']
+    assert changes['total_investment']['change'] == pytest.approx(changes['total_investment']['before'])
@@ -0,0 +1,37 @@
+import numpy as np
+
+from monte_carlo import QuantileSketch, run_monte_carlo
+
+SCENARIO = (100, 'Conventional', False, 50, 60, 1.5)
+
+
+def test_results_do_not_depend_on_worker_count():
+    kwargs = dict(n_draws=40_000, chunk_size=10_000, seed=3)
+    in_process = run_monte_carlo(*SCENARIO, max_workers=1, **kwargs)
+    pooled = run_monte_carlo(*SCENARIO, max_workers=4, **kwargs)
+    assert in_process == pooled
+    assert in_process['n_draws'] == 40_000
+
+
+def test_progress_counts_draws_in_chunk_order():
+    # More chunks than the pool keeps in flight, and a short last chunk.
+    kwargs = dict(n_draws=23_500, chunk_size=2_000, seed=5)
+    progress = []
+    pooled = run_monte_carlo(*SCENARIO, max_workers=2, progress=lambda done, total: progress.append((done, total)), **kwargs)
+    assert progress == [(min(2_000 * i, 23_500), 23_500) for i in range(1, 13)]
+    assert pooled == run_monte_carlo(*SCENARIO, max_workers=1, **kwargs)
+
+
+def test_seed_changes_the_draws():
+    a = run_monte_carlo(*SCENARIO, n_draws=5_000, chunk_size=5_000, max_workers=1, seed=0)
+    b = run_monte_carlo(*SCENARIO, n_draws=5_000, chunk_size=5_000, max_workers=1, seed=1)
+    assert a['operating_profit']['mean'] != b['operating_profit']['mean']
+
+
+def test_quantile_sketch_tracks_exact_quantiles():
+    x = np.random.default_rng(1).normal(size=200_000)
+    sketch = QuantileSketch(seed=0)
+    for chunk in np.array_split(x, 20):
+        sketch.update(chunk)
+    qs = [0.05, 0.5, 0.95]
+    assert np.allclose(sketch.quantiles(qs), np.quantile(x, qs), atol=0.02)
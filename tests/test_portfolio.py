@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from cashflow import calculate_cash_flows
+from config_loader import load_config
+from portfolio import Portfolio, load_sites
+
+
+def _sites(n, commissioning_year):
+    return load_sites({
+        "dc_size_mw": [100.0] * n,
+        "high_perf_gpu_ratio": [50.0] * n,
+        "utilization_rate": [70.0] * n,
+        "use_clean_power": [False] * n,
+        "commissioning_year": commissioning_year,
+    })
+
+
+def test_staggered_fleet_never_pays_more_than_the_rd_program():
+    config = load_config()
+    program = config.research_and_development.total_model_development_cost
+    # 30 sites, 10 a year over three years: more site-years in R&D than the program covers.
+    portfolio = Portfolio(_sites(30, [2025 + i // 10 for i in range(30)]), config=config)
+    fleet = portfolio.evaluate()
+    assert fleet["rd_amortization"].sum() <= program * (1 + 1e-12)
+    assert (fleet["rd_amortization"] >= 0).all()
+    assert portfolio.allocate()["rd_amortization"].sum() <= program * (1 + 1e-12)
+
+
+def test_rd_cap_applies_per_variant():
+    config = load_config()
+    program = config.research_and_development.total_model_development_cost
+    portfolio = Portfolio(_sites(30, [2025 + i // 10 for i in range(30)]), config=config)
+    weights = np.zeros((2, 30))
+    weights[0] = 1.0
+    weights[1, :3] = 1.0
+    rd = portfolio.evaluate(weights)["rd_amortization"].sum(axis=1)
+    assert rd[0] <= program * (1 + 1e-12)
+    # A small fleet is below the cap and pays each site's full share.
+    assert np.isclose(rd[1], 3 * config.rd_amortization * config.investment.amortization_years.research_and_development)
+
+
+@pytest.mark.parametrize('site', [
+    dict(dc_size_mw=100.0, high_perf_gpu_ratio=50.0, utilization_rate=70.0, use_clean_power=False, apply_mirrormind=True),
+    dict(dc_size_mw=35.0, high_perf_gpu_ratio=100.0, utilization_rate=90.0, use_clean_power=True, apply_mirrormind=False),
+])
+def test_one_site_portfolio_matches_calculate_cash_flows(site):
+    portfolio = Portfolio(load_sites({name: [value] for name, value in site.items()}), market_price_per_m_tokens=2.0)
+    fleet = portfolio.evaluate()
+    flows = calculate_cash_flows(
+        site["dc_size_mw"], site["use_clean_power"], site["apply_mirrormind"], site["high_perf_gpu_ratio"],
+        site["utilization_rate"], 2.0,
+    )
+    assert np.array_equal(fleet["years"], flows["years"])
+    for name in ("revenue", "operating_profit", "operating_cash_flow", "capex", "net_cash_flow"):
+        assert np.allclose(fleet[name], flows[name], rtol=1e-10, atol=1e-3), name
+    assert fleet["npv"][0] == pytest.approx(flows["npv"][0], rel=1e-10)
+    assert fleet["irr"][0] == pytest.approx(flows["irr"][0], abs=1e-9, nan_ok=True)
+    assert fleet["payback_period"][0] == pytest.approx(flows["payback_period"][0], rel=1e-10)
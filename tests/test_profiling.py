@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+import profiling
+from calculator import calculate_core_business_case, calculate_core_business_case_batch
+from config_loader import load_config
+
+BATCH_STAGES = ('capex_gpu', 'capacity', 'pnl', 'per_user', 'pricing', 'final_pnl')
+
+
+@pytest.fixture(autouse=True)
+def _isolated():
+    was_enabled = profiling.is_enabled()
+    profiling.disable()
+    profiling.reset()
+    yield
+    profiling.reset()
+    (profiling.enable if was_enabled else profiling.disable)()
+
+
+def test_disabled_hooks_are_shared_noops():
+    timer = profiling.stages('core')
+    timer.lap('capacity')
+    with profiling.span('config.load') as span:
+        pass
+    assert timer is span  # one shared no-op object, no allocation per call
+    calculate_core_business_case(100, 'Conventional', False, 50, 60, 1.5)
+    assert profiling.summary() == []
+    assert profiling.chrome_trace()['traceEvents'] == []
+
+
+def test_batch_call_records_its_stages_and_size():
+    config = load_config()  # passed in, so config.load stays out of the recording
+    with profiling.recording():
+        calculate_core_business_case_batch(np.full(250, 100.0), True, False, 50, 60, 1.5, config=config)
+        calculate_core_business_case_batch(np.full(50, 100.0), True, False, 50, 60, 1.5, config=config)
+    assert not profiling.is_enabled()  # recording() restores the previous state
+
+    rows = {row['name']: row for row in profiling.summary()}
+    assert set(rows) == {f'batch.{stage}' for stage in BATCH_STAGES}
+    for row in rows.values():
+        assert (row['calls'], row['scenarios'], row['max_batch'], row['mean_batch']) == (2, 300, 250, 150)
+
+    events = profiling.chrome_trace()['traceEvents']
+    assert [event['name'] for event in events] == [f'batch.{stage}' for stage in BATCH_STAGES] * 2
+    assert [event['args']['scenarios'] for event in events] == [250] * 6 + [50] * 6
+    assert all(event['ph'] == 'X' and event['cat'] == 'batch' and event['dur'] >= 0 for event in events)
+
+
+def test_scalar_call_records_core_stages():
+    config = load_config()
+    with profiling.recording():
+        calculate_core_business_case(100, 'Conventional', False, 50, 60, 1.5, config=config)
+    names = [event['name'] for event in profiling.chrome_trace()['traceEvents']]
+    assert names == ['core.capex_gpu', 'core.capacity', 'core.pnl', 'core.pricing', 'core.per_user', 'core.final_pnl']
+
+
+def test_drain_and_merge_move_events_between_processes():
+    with profiling.recording():
+        with profiling.span('worker.chunk', scenarios=10):
+            pass
+    events = profiling.drain()
+    assert profiling.summary() == []
+    profiling.merge(events)
+    assert [(row['name'], row['calls'], row['scenarios']) for row in profiling.summary()] == [('worker.chunk', 1, 10)]
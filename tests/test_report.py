@@ -0,0 +1,91 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+from portfolio import load_sites
+from report import iter_reports, markdown_to_html, scenario_report, write_reports
+
+SITES = {
+    "site": ["seoul-1", "busan/2", "daejeon 3"],
+    "dc_size_mw": [100, 60, 240],
+    "use_clean_power": ["Conventional", "Renewable", "Renewable"],
+    "apply_mirrormind": [True, False, True],
+    "high_perf_gpu_ratio": [50, 30, 80],
+    "utilization_rate": [60, 55, 90],
+}
+
+
+@pytest.fixture(scope='module')
+def reports():
+    return list(iter_reports(load_sites(SITES), "en"))
+
+
+class _Stream:
+    """A write-only stream, like sys.stdout.buffer or an HTTP response body."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+def test_reports_do_not_depend_on_chunking(reports):
+    assert [site for site, _ in reports] == SITES["site"]
+    assert list(iter_reports(load_sites(SITES), "en", chunk_size=2)) == reports
+    assert reports[0][1].startswith("# seoul-1\n\n")
+
+
+def test_scenario_report_is_the_site_report_without_heading(reports):
+    assert scenario_report(100, "Conventional", True, 50, 60, None, lang="en") == reports[0][1].split("\n\n", 1)[1]
+
+
+def test_zip_round_trip(tmp_path, reports):
+    path = str(tmp_path / "reports.zip")
+    assert write_reports(iter(reports), path, "md", "en") == 3
+    with zipfile.ZipFile(path) as archive:
+        names = archive.namelist()
+        assert names == ["00001_seoul-1.md", "00002_busan_2.md", "00003_daejeon_3.md", "index.md"]
+        assert archive.read("00002_busan_2.md").decode() == reports[1][1]
+        index = archive.read("index.md").decode()
+    for (site, _), name in zip(reports, names):
+        assert f"- [{site}]({name})" in index
+
+
+def test_non_seekable_stream_gets_the_same_archive(tmp_path, reports):
+    stream = _Stream()
+    write_reports(iter(reports), stream, "html", "en")
+    write_reports(iter(reports), str(tmp_path / "seekable.zip"), "html", "en")
+    with zipfile.ZipFile(io.BytesIO(b"".join(stream.chunks))) as streamed, zipfile.ZipFile(tmp_path / "seekable.zip") as seekable:
+        assert streamed.namelist() == seekable.namelist()
+        for name in seekable.namelist():
+            assert streamed.read(name) == seekable.read(name)
+
+
+def test_directory_output_in_html(tmp_path, reports):
+    out = tmp_path / "html"
+    write_reports(iter(reports), str(out), "html", "en")
+    assert sorted(os.listdir(out)) == ["00001_seoul-1.html", "00002_busan_2.html", "00003_daejeon_3.html", "index.html"]
+    index = (out / "index.html").read_text(encoding="utf-8")
+    assert '<li><a href="00002_busan_2.html">busan/2</a></li>' in index
+    assert (out / "00001_seoul-1.html").read_text(encoding="utf-8").count("<h1>seoul-1</h1>") == 1
+
+
+def test_unknown_format_is_rejected(tmp_path, reports):
+    with pytest.raises(ValueError):
+        write_reports(iter(reports), str(tmp_path), "pdf")
+
+
+def test_markdown_to_html():
+    page = markdown_to_html("# Site <A>\n\nIntro with **bold** & more.\n   - first\n   - second\nAfter", "T&C", "en")
+    assert '<html lang="en">' in page
+    assert "<title>T&amp;C</title>" in page
+    assert "<h1>Site &lt;A&gt;</h1>" in page
+    assert "<p>Intro with <strong>bold</strong> &amp; more.</p>" in page
+    assert "<ul>\n<li>first</li>\n<li>second</li>\n</ul>\n<p>After</p>" in page
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from calculator import calculate_core_business_case
+from result_cache import LRUCache, SliderGrid, cache_info, cached_core_business_case, clear_caches
+
+
+@pytest.fixture(scope='module')
+def grid():
+    return SliderGrid()
+
+
+def _slider_points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        (
+            int(rng.choice(SliderGrid.DC_SIZES)), str(rng.choice(['Conventional', 'Renewable'])), bool(rng.integers(2)),
+            int(rng.choice(SliderGrid.GPU_RATIOS)), int(rng.choice(SliderGrid.UTILIZATION_RATES)),
+            round(float(rng.choice(np.arange(5, 51))) / 10, 1),  # the price slider: 0.5-5.0 in 0.1 steps
+        )
+        for _ in range(n)
+    ]
+
+
+@pytest.mark.parametrize('point', _slider_points(200))
+def test_grid_matches_the_calculator(grid, point):
+    expected = calculate_core_business_case(*point)
+    actual = grid.lookup(*point)
+    assert actual['total_investment'] == pytest.approx(expected['total_investment'], rel=1e-12)
+    assert actual['assumptions'] == expected['assumptions']
+    for key, value in expected['pnl_annual'].items():
+        assert actual['pnl_annual'][key] == pytest.approx(value, rel=1e-9, abs=1e-3), key
+    for key in ('standard_fee', 'premium_fee', 'is_achievable'):
+        assert actual['recommendation'][key] == pytest.approx(expected['recommendation'][key], rel=1e-9, nan_ok=True), key
+    for segment, expected_segment in zip(actual['segment_narratives'], expected['segment_narratives']):
+        for key, value in expected_segment.items():
+            assert segment[key] == pytest.approx(value, rel=1e-9, abs=1e-9), key
+
+
+def test_grid_declines_off_grid_inputs(grid):
+    assert grid.lookup(101.5, 'Conventional', False, 50, 60, 1.5) is None
+    assert grid.lookup(100, 'Conventional', False, 52, 60, 1.5) is None
+    assert grid.lookup(100, 'Conventional', False, 50, 30, 1.5) is None
+
+
+def test_lru_evicts_the_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.get_or_compute('a', lambda: 1)
+    cache.get_or_compute('b', lambda: 2)
+    assert cache.get_or_compute('a', lambda: pytest.fail('recomputed a')) == 1  # 'a' is now the newest
+    cache.get_or_compute('c', lambda: 3)  # evicts 'b'
+    assert len(cache) == 2
+    assert cache.get_or_compute('a', lambda: pytest.fail('recomputed a')) == 1
+    assert cache.get_or_compute('b', lambda: 20) == 20
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_lru_never_exceeds_maxsize():
+    cache = LRUCache(maxsize=3)
+    for i in range(10):
+        cache.get_or_compute(i, lambda i=i: i)
+        assert len(cache) <= 3
+    assert [cache.get_or_compute(i, lambda: None) for i in (7, 8, 9)] == [7, 8, 9]
+
+
+def test_cached_core_business_case_memoizes():
+    clear_caches()
+    inputs = (120, 'Renewable', True, 35, 75, 2.3)
+    first = cached_core_business_case(*inputs)
+    assert cached_core_business_case(*inputs) is first
+    assert cached_core_business_case(120.0, 'Renewable', True, 35.0, 75.0, 2.3000000000000003) is first
+    assert cache_info()['core'] == {'size': 1, 'hits': 2, 'misses': 1}
+    clear_caches()
+
+
+def test_cached_core_business_case_reads_the_grid(grid, monkeypatch):
+    clear_caches()
+    monkeypatch.setattr('result_cache.calculate_core_business_case', lambda *args, **kwargs: pytest.fail('computed'))
+    inputs = (120, 'Renewable', True, 35, 75, 2.3)
+    assert cached_core_business_case(*inputs, grid=grid) == grid.lookup(*inputs)
+    clear_caches()
@@ -0,0 +1,52 @@
+import os
+
+import numpy as np
+import pytest
+
+from calculator import calculate_core_business_case_batch
+from result_store import ResultStore, evict, generations
+
+SCENARIOS = (
+    np.array([20.0, 100.0, 100.0, 250.0, 60.0]),
+    np.array([False, True, False, True, False]),
+    np.array([True, True, False, False, True]),
+    np.array([0.0, 50.0, 100.0, 25.0, 75.0]),
+    np.array([40.0, 70.0, 95.0, 10.0, 55.0]),
+    np.array([1.5, 0.75, 3.2, 1.0, 2.25]),
+)
+
+
+def _assert_same(stored, fresh):
+    for section in ('pnl_annual', 'recommendation'):
+        for name, column in fresh[section].items():
+            assert np.allclose(stored[section][name], column, rtol=1e-9, atol=1e-6, equal_nan=True), (section, name)
+    assert np.allclose(stored['total_investment'], fresh['total_investment'], rtol=1e-12)
+    for name in ('num_users', 'revenue_per_user', 'cost_per_user', 'profit_per_user', 'recommended_fee'):
+        assert np.allclose(stored['segment_narratives'][name], fresh['segment_narratives'][name], rtol=1e-9, atol=1e-9), name
+
+
+def test_store_matches_a_fresh_batch(tmp_path):
+    store = ResultStore(root=tmp_path)
+    first = store.get_or_compute(*SCENARIOS)
+    fresh = calculate_core_business_case_batch(*SCENARIOS)
+    _assert_same(first, fresh)
+    # Served from the store, at other prices, by a second reader.
+    repriced = SCENARIOS[:5] + (SCENARIOS[5] * 1.7,)
+    stored = ResultStore(root=tmp_path).lookup(*repriced)
+    assert stored is not None
+    _assert_same(stored, calculate_core_business_case_batch(*repriced))
+    assert len(store) == 5
+
+
+def test_evict_skips_a_generation_being_filled(tmp_path):
+    fcntl = pytest.importorskip('fcntl')
+    for name in ('old-v0', 'older-v0'):
+        os.makedirs(tmp_path / name)
+        (tmp_path / name / 'seg.npy').write_bytes(b'x' * 1000)
+    os.utime(tmp_path / 'older-v0', (0, 0))
+    with open(tmp_path / 'older-v0' / '.lock', 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        removed = evict(tmp_path, max_bytes=0)
+    assert removed == ['old-v0']
+    assert [name for name, _, _ in generations(tmp_path)] == ['older-v0']
+    assert evict(tmp_path, max_bytes=0) == ['older-v0']
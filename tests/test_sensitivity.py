@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from calculator import OVERRIDABLE_PARAMS, calculate_core_business_case_batch
+from sensitivity import SCENARIO_PARAMS, calculate_sensitivities, tornado_data
+
+BASE = dict(dc_size_mw=123.47, use_clean_power=True, apply_mirrormind=True, high_perf_gpu_ratio=37.3,
+            utilization_rate=65.0, market_price_per_m_tokens=1.8)
+OUTPUTS = {
+    'operating_profit': lambda r: r['pnl_annual']['operating_profit'],
+    'annual_cash_flow': lambda r: r['pnl_annual']['annual_cash_flow'],
+    'standard_fee': lambda r: r['recommendation']['standard_fee'],
+}
+
+
+def _evaluate(name, value):
+    inputs = dict(BASE)
+    overrides = {}
+    if name in SCENARIO_PARAMS:
+        inputs[name] = value
+    else:
+        overrides[name] = np.array([value])
+    return calculate_core_business_case_batch(**inputs, overrides=overrides)
+
+
+@pytest.fixture(scope='module')
+def sensitivities():
+    # Without relax_floor the GPU counts keep their (locally zero-slope) floor division, as
+    # the finite differences below see it (the base point sits away from any step).
+    return calculate_sensitivities(*BASE.values(), relax_floor=False)
+
+
+@pytest.mark.parametrize('name', SCENARIO_PARAMS + OVERRIDABLE_PARAMS)
+def test_gradient_matches_central_differences(sensitivities, name):
+    j = sensitivities['parameters'].index(name)
+    base = sensitivities['values'][name][0]
+    h = 1e-6 * max(abs(base), 1.0)
+    up, down = _evaluate(name, base + h), _evaluate(name, base - h)
+    for output, read in OUTPUTS.items():
+        expected = (read(up)[0] - read(down)[0]) / (2 * h)
+        actual = sensitivities['gradient'][output][0, j]
+        scale = max(abs(sensitivities['base'][output][0]), 1.0) / max(abs(base), 1.0)
+        assert actual == pytest.approx(expected, rel=1e-5, abs=1e-6 * scale), (name, output)
+
+
+def test_base_values_match_the_batch_engine(sensitivities):
+    results = calculate_core_business_case_batch(**BASE)
+    for output, read in OUTPUTS.items():
+        assert sensitivities['base'][output][0] == pytest.approx(read(results)[0], rel=1e-12)
+
+
+def test_tornado_bars_are_sorted_and_symmetric(sensitivities):
+    bars = tornado_data(sensitivities, 'operating_profit')
+    widths = [abs(high) for _, _, high in bars]
+    assert widths == sorted(widths, reverse=True)
+    assert all(low == -high for _, low, high in bars)
@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+import pytest
+
+from service import MAX_BODY_BYTES, BadRequest, SimulationService, parse_scenario
+
+SCENARIO = {
+    'dc_size_mw': 100, 'use_clean_power': 'Renewable', 'apply_mirrormind': True,
+    'high_perf_gpu_ratio': 50, 'utilization_rate': 60, 'market_price_per_m_tokens': 1.5,
+}
+
+
+@pytest.mark.parametrize('power, expected', [('Renewable', True), ('Conventional', False), (True, True), (False, False)])
+def test_use_clean_power_accepts_labels_and_booleans(power, expected):
+    assert parse_scenario({**SCENARIO, 'use_clean_power': power})['use_clean_power'] is expected
+
+
+@pytest.mark.parametrize('power', ['renewable', 'Solar', 1, None])
+def test_use_clean_power_rejects_anything_else(power):
+    with pytest.raises(BadRequest):
+        parse_scenario({**SCENARIO, 'use_clean_power': power})
+
+
+@pytest.mark.parametrize('mirrormind', ['false', 'true', 0, 1, None])
+def test_apply_mirrormind_must_be_a_boolean(mirrormind):
+    with pytest.raises(BadRequest):
+        parse_scenario({**SCENARIO, 'apply_mirrormind': mirrormind})
+
+
+async def _exchange(raw):
+    service = SimulationService(window_ms=0.5)
+    server = await asyncio.start_server(service.serve_connection, '127.0.0.1', 0)
+    async with server:
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        writer.write(raw)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+    head, _, body = response.partition(b'\r\n\r\n')
+    return int(head.split(b' ', 2)[1]), json.loads(body)
+
+
+@pytest.mark.parametrize('length', [b'abc', b'-5'])
+def test_malformed_content_length_is_a_bad_request(length):
+    raw = b'POST /v1/core HTTP/1.1\r\nContent-Length: ' + length + b'\r\n\r\n{}'
+    status, payload = asyncio.run(_exchange(raw))
+    assert status == 400
+    assert 'content-length' in payload['error']
+
+
+def test_core_endpoint_round_trip():
+    body = json.dumps(SCENARIO).encode()
+    raw = b'POST /v1/core HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n' % len(body) + body
+    status, payload = asyncio.run(_exchange(raw))
+    assert status == 200
+    assert payload['total_investment'] > 0
+
+
+def test_body_that_is_not_utf8_is_a_bad_request():
+    body = b'{"dc_size_mw": "\xff"}'
+    raw = b'POST /v1/core HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n' % len(body) + body
+    status, _ = asyncio.run(_exchange(raw))
+    assert status == 400
+
+
+def test_oversized_body_is_rejected_unread():
+    raw = b'POST /v1/core HTTP/1.1\r\nContent-Length: %d\r\n\r\n{}' % (MAX_BODY_BYTES + 1)
+    status, payload = asyncio.run(_exchange(raw))
+    assert status == 413
+    assert str(MAX_BODY_BYTES) in payload['error']
+
+
+class _Writer:
+    def __init__(self):
+        self.data = b''
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+
+def test_non_finite_values_are_sent_as_null():
+    writer = _Writer()
+    payload = {'standard_fee': float('nan'), 'premium_fee': float('inf'), 'rows': [1.5, float('-inf')]}
+    asyncio.run(SimulationService._respond(writer, 200, payload, keep_alive=True))
+    assert json.loads(writer.data.partition(b'\r\n\r\n')[2]) == {'standard_fee': None, 'premium_fee': None, 'rows': [1.5, None]}
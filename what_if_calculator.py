@@ -1,15 +1,20 @@
 # what_if_calculator.py (v3.0 - UI/UX Improvement)
 # This module is dedicated to the 'What-If' analysis for the fixed-fee pricing scenario.
+import numpy as np
 
-def analyze_fixed_fee_scenario(core_results, standard_fee, premium_fee):
+def analyze_fixed_fee_scenario(core_results, standard_fee=0.0, premium_fee=0.0, tier_fees=None):
     """
     Calculates the profit, opportunity cost, and a full P&L for a fixed-fee scenario.
     This calculation is completely independent of the main usage-based model.
 
     Args:
-        core_results (dict): The full results dictionary from the core calculator.
+        core_results (dict): The full results dictionary from the core calculator (or a
+            batch_result.ScenarioView).
         standard_fee (float): The user-defined monthly fee for the Standard tier.
         premium_fee (float): The user-defined monthly fee for the Premium tier.
+        tier_fees (sequence | dict, optional): Monthly fee of every tier, either in
+            segment order or keyed by tier_name_key (missing keys pay 0). Replaces
+            standard_fee/premium_fee when given.
 
     Returns:
         tuple: A tuple containing:
@@ -18,22 +23,12 @@ def analyze_fixed_fee_scenario(core_results, standard_fee, premium_fee):
     """
     segment_narratives = core_results['segment_narratives']
     pnl_core = core_results['pnl_annual']
-    
+    fees = _fee_vector([segment['tier_name_key'] for segment in segment_narratives], standard_fee, premium_fee, tier_fees)
+
     what_if_narratives = []
-    total_users_standard = 0
-    total_users_premium = 0
-
-    for segment in segment_narratives:
-        updated_segment = segment.copy()
-
-        fixed_fee = 0
-        if segment['tier_name_key'] == 'tier_standard':
-            fixed_fee = standard_fee
-            total_users_standard = segment['num_users']
-        elif segment['tier_name_key'] == 'tier_premium':
-            fixed_fee = premium_fee
-            total_users_premium = segment['num_users']
-        
+    what_if_monthly_revenue = 0
+    for segment, fixed_fee in zip(segment_narratives, fees):
+        what_if_monthly_revenue += segment['num_users'] * fixed_fee
         cost_per_user = segment['cost_per_user']
         # [MODIFIED] The term is now clearer: this is the potential profit
         potential_profit_per_user = segment['profit_per_user'] 
@@ -43,11 +38,13 @@ def analyze_fixed_fee_scenario(core_results, standard_fee, premium_fee):
         # The difference is now calculated against the potential profit
         opportunity_cost = potential_profit_per_user - final_profit_per_user
         
-        updated_segment['fixed_fee'] = fixed_fee
-        updated_segment['final_profit_per_user'] = final_profit_per_user
-        updated_segment['opportunity_cost'] = opportunity_cost # This is now the difference in PROFIT
-        
-        what_if_narratives.append(updated_segment)
+        # Works for plain dicts and read-only batch views alike (no .copy() needed).
+        what_if_narratives.append({
+            **segment,
+            'fixed_fee': fixed_fee,
+            'final_profit_per_user': final_profit_per_user,
+            'opportunity_cost': opportunity_cost, # This is now the difference in PROFIT
+        })
         
     # --- Calculate the full annual P&L for this what-if scenario ---
     # Base costs that don't depend on revenue
@@ -56,7 +53,7 @@ def analyze_fixed_fee_scenario(core_results, standard_fee, premium_fee):
     rd_amortization = pnl_core['rd_amortization']
     
     # Revenue-dependent costs
-    what_if_revenue = (total_users_standard * standard_fee + total_users_premium * premium_fee) * 12
+    what_if_revenue = what_if_monthly_revenue * 12
     what_if_sg_and_a = what_if_revenue * (pnl_core['sg_and_a'] / pnl_core['revenue'] if pnl_core['revenue'] > 0 else 0)
     
     what_if_gross_profit = what_if_revenue - cost_of_revenue
@@ -73,3 +70,147 @@ def analyze_fixed_fee_scenario(core_results, standard_fee, premium_fee):
     }
         
     return what_if_narratives, pnl_what_if
+
+
+def _fee_vector(tier_keys, standard_fee, premium_fee, tier_fees):
+    """Fixed fee of each tier in `tier_keys` order (entries may be per-scenario arrays)."""
+    if tier_fees is None:
+        tier_fees = {'tier_standard': standard_fee, 'tier_premium': premium_fee}
+    elif isinstance(tier_fees, dict):
+        unknown = set(tier_fees).difference(tier_keys)
+        if unknown:
+            raise ValueError(f"Fees given for unknown tier(s): {sorted(unknown)}")
+    else:
+        tier_fees = list(tier_fees)
+        if len(tier_fees) != len(tier_keys):
+            raise ValueError(f"Expected {len(tier_keys)} tier fees, got {len(tier_fees)}")
+        return tier_fees
+    return [tier_fees.get(key, 0.0) for key in tier_keys]
+
+
+def analyze_fixed_fee_surface(core_results, standard_fees, premium_fees, target_payback_years=5):
+    """
+    Evaluates the fixed-fee scenario over a whole standard x premium fee grid at once.
+
+    The fee vectors are broadcast against each other, so no per-pair call or per-segment
+    dict copy is made. Because the what-if P&L is linear in both fees, the zero-profit and
+    target-payback contours are returned as exact lines (premium fee per standard fee).
+
+    Args:
+        core_results (dict): The full results dictionary from the core calculator.
+        standard_fees (array-like): Monthly Standard tier fees (grid rows).
+        premium_fees (array-like): Monthly Premium tier fees (grid columns).
+        target_payback_years (float): Payback target for the second contour.
+
+    Returns:
+        dict: 'operating_profit' (len(standard_fees) x len(premium_fees)); per-tier
+            'standard'/'premium' dicts with 'final_profit_per_user' and 'opportunity_cost'
+            vectors; and 'zero_profit_premium_fee' / 'target_payback_premium_fee' vectors
+            giving each contour's premium fee for every standard fee.
+    """
+    standard_fees = np.asarray(standard_fees, dtype=float)
+    premium_fees = np.asarray(premium_fees, dtype=float)
+    segments = {segment['tier_name_key']: segment for segment in core_results['segment_narratives']}
+    pnl_core = core_results['pnl_annual']
+
+    # --- Per-tier what-if metrics (each depends only on its own fee) ---
+    tiers = {}
+    users = {}
+    for tier, fees in (('standard', standard_fees), ('premium', premium_fees)):
+        segment = segments.get(f'tier_{tier}')
+        users[tier] = segment['num_users'] if segment else 0
+        cost_per_user = segment['cost_per_user'] if segment else 0
+        potential_profit_per_user = segment['profit_per_user'] if segment else 0
+        final_profit_per_user = fees - cost_per_user
+        tiers[tier] = {
+            'final_profit_per_user': final_profit_per_user,
+            'opportunity_cost': potential_profit_per_user - final_profit_per_user,
+        }
+
+    # --- Operating profit surface: revenue * (1 - SG&A share) - revenue-independent costs ---
+    sgna_share = pnl_core['sg_and_a'] / pnl_core['revenue'] if pnl_core['revenue'] > 0 else 0
+    margin = 12 * (1 - sgna_share)
+    fixed_costs = pnl_core['cost_of_revenue'] + pnl_core['d_and_a'] + pnl_core['rd_amortization']
+    monthly_revenue = users['standard'] * standard_fees[:, None] + users['premium'] * premium_fees[None, :]
+    operating_profit = monthly_revenue * margin - fixed_costs
+
+    # --- Contours: premium fee on each line for every standard fee ---
+    target_operating_profit = core_results['total_investment'] / target_payback_years - pnl_core['d_and_a']
+
+    def premium_fee_for(profit):
+        if users['premium'] <= 0 or margin <= 0:
+            return np.full(standard_fees.shape, np.nan)
+        return ((profit + fixed_costs) / margin - users['standard'] * standard_fees) / users['premium']
+
+    return {
+        'standard_fees': standard_fees,
+        'premium_fees': premium_fees,
+        'operating_profit': operating_profit,
+        'standard': tiers['standard'],
+        'premium': tiers['premium'],
+        'zero_profit_premium_fee': premium_fee_for(0.0),
+        'target_payback_premium_fee': premium_fee_for(target_operating_profit),
+    }
+
+
+def analyze_fixed_fee_batch(batch_results, standard_fees=0.0, premium_fees=0.0, tier_fees=None):
+    """
+    Column-wise fixed-fee analysis for results from `calculate_core_business_case_batch`.
+
+    Args:
+        batch_results (BatchResult): Batch results (scenario columns, scenarios x tiers matrices).
+        standard_fees (float | array): Standard tier monthly fee, per scenario or shared.
+        premium_fees (float | array): Premium tier monthly fee, per scenario or shared.
+        tier_fees (array | dict, optional): Monthly fee of every tier: a (tiers,) vector or
+            scenarios x tiers matrix in segment order, or a dict keyed by tier_name_key whose
+            values are per-scenario or shared. Replaces standard_fees/premium_fees when given.
+
+    Returns:
+        dict: 'segments' with scenarios x tiers 'fixed_fee', 'final_profit_per_user' and
+            'opportunity_cost' matrices, and 'pnl_what_if' with one column per P&L line.
+    """
+    segments = batch_results['segment_narratives']
+    pnl_core = batch_results['pnl_annual']
+    tier_keys = segments['tier_name_key']
+    n = segments['num_users'].shape[0]
+
+    shape = segments['num_users'].shape
+    if tier_fees is None or isinstance(tier_fees, dict):
+        columns = _fee_vector(tier_keys, standard_fees, premium_fees, tier_fees)
+        fixed_fee = np.empty(shape)
+        for j, fees in enumerate(columns):
+            fixed_fee[:, j] = np.broadcast_to(np.asarray(fees, dtype=float), (n,))
+    else:
+        fixed_fee = np.asarray(tier_fees, dtype=float)
+        if fixed_fee.shape[-1:] != shape[1:]:
+            raise ValueError(f"Expected {shape[1]} tier fees per scenario, got shape {fixed_fee.shape}")
+        fixed_fee = np.broadcast_to(fixed_fee, shape)
+
+    final_profit_per_user = fixed_fee - segments['cost_per_user']
+    opportunity_cost = segments['profit_per_user'] - final_profit_per_user
+
+    cost_of_revenue = pnl_core['cost_of_revenue']
+    d_and_a = pnl_core['d_and_a']
+    rd_amortization = pnl_core['rd_amortization']
+    what_if_revenue = (segments['num_users'] * fixed_fee).sum(axis=1) * 12
+    sgna_share = np.where(pnl_core['revenue'] > 0, pnl_core['sg_and_a'] / np.where(pnl_core['revenue'] > 0, pnl_core['revenue'], 1.0), 0.0)
+    what_if_sg_and_a = what_if_revenue * sgna_share
+    what_if_gross_profit = what_if_revenue - cost_of_revenue
+
+    return {
+        'segments': {
+            'tier_name_key': tier_keys,
+            'fixed_fee': fixed_fee,
+            'final_profit_per_user': final_profit_per_user,
+            'opportunity_cost': opportunity_cost,
+        },
+        'pnl_what_if': {
+            'revenue': what_if_revenue,
+            'cost_of_revenue': cost_of_revenue,
+            'gross_profit': what_if_gross_profit,
+            'sg_and_a': what_if_sg_and_a,
+            'd_and_a': d_and_a,
+            'rd_amortization': rd_amortization,
+            'operating_profit': what_if_gross_profit - what_if_sg_and_a - d_and_a - rd_amortization,
+        },
+    }